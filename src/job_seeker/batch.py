@@ -0,0 +1,138 @@
+"""
+Batch runs over a directory of profiles with bounded concurrency.
+
+Each profile gets its own output directory holding its database, report,
+application strategy and a summary.json. Worker threads keep their
+JobSeeker (crew, agents and tools) between profiles, and every search goes
+through one CachingBackend, so overlapping queries across profiles hit the
+API once.
+"""
+import glob
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
+from typing import Dict, List
+
+from .db import connect, use_db_path
+from .profiles import load_user_profile
+from .search_backends import CachingBackend, get_search_backend, set_search_backend
+
+SEARCH_CACHE_DB = "search_cache.db"
+
+
+def _profile_summary(profile_path: str, output_dir: str, status: str, seconds: float,
+                     error: str = None, usage: Dict = None) -> Dict:
+    """Summarize one profile's run from its output directory"""
+    summary = {
+        "profile": profile_path,
+        "output_dir": output_dir,
+        "status": status,
+        "seconds": round(seconds, 2),
+        "error": error,
+        "total_tokens": (usage or {}).get("total_tokens", 0),
+        "cost_usd": round((usage or {}).get("cost_usd", 0.0), 6),
+        "jobs_stored": 0,
+        "top_score": None,
+    }
+    db_path = os.path.join(output_dir, "job_opportunities.db")
+    if os.path.exists(db_path):
+        conn = connect(db_path)
+        try:
+            row = conn.execute("SELECT COUNT(*), MAX(match_score) FROM job_opportunities").fetchone()
+            summary["jobs_stored"], summary["top_score"] = row[0], row[1]
+        except Exception:
+            pass  # The run failed before storing anything
+        finally:
+            conn.close()
+    return summary
+
+
+class BatchRunner:
+    """Run many profiles through the crew, `concurrency` at a time"""
+
+    def __init__(self, output_dir: str = "batch_results", concurrency: int = 2, job_sites: List[str] = None,
+                 cache_ttl_seconds: float = 6 * 3600):
+        self.output_dir = output_dir
+        self.concurrency = max(1, concurrency)
+        self.job_sites = job_sites
+        self.cache_ttl_seconds = cache_ttl_seconds
+        self._local = threading.local()
+
+    def _job_seeker(self):
+        """Return the JobSeeker owned by the current worker thread"""
+        if not hasattr(self._local, "job_seeker"):
+            from job_seeker.crew import JobSeeker
+            self._local.job_seeker = JobSeeker()
+        return self._local.job_seeker
+
+    def _run_profile(self, profile_path: str) -> Dict:
+        name = os.path.splitext(os.path.basename(profile_path))[0]
+        output_dir = os.path.join(self.output_dir, name)
+        os.makedirs(output_dir, exist_ok=True)
+        started = time.perf_counter()
+        status, error, usage = "error", None, None
+        print(f"▶️  {name} started")
+        try:
+            profile = load_user_profile(profile_path)
+            if not profile:
+                raise ValueError(f"No usable profile at {profile_path}")
+            job_seeker = self._job_seeker()
+            # Reports go to the profile's directory through the crew inputs: crewai
+            # resets task.output_file from its template on every kickoff
+            with use_db_path(os.path.join(output_dir, "job_opportunities.db")):
+                job_seeker.run_job_search(profile, self.job_sites, output_dir=output_dir)
+            status = "success"
+            usage = job_seeker.usage_tracker.totals() if job_seeker.usage_tracker else None
+        except Exception as e:
+            error = f"{e}"
+        seconds = time.perf_counter() - started
+        summary = _profile_summary(profile_path, output_dir, status, seconds, error, usage)
+        with open(os.path.join(output_dir, "summary.json"), "w") as f:
+            json.dump(summary, f, indent=2)
+        icon = "✅" if status == "success" else "❌"
+        print(f"{icon} {name} finished in {seconds:.1f}s" + (f": {error}" if error else ""))
+        return summary
+
+    def run(self, profile_paths: List[str]) -> Dict:
+        """Run every profile; returns the aggregate summary (also written to batch_summary.json)"""
+        os.makedirs(self.output_dir, exist_ok=True)
+        previous_backend = get_search_backend()
+        cache = CachingBackend(previous_backend, os.path.join(self.output_dir, SEARCH_CACHE_DB),
+                               ttl_seconds=self.cache_ttl_seconds)
+        set_search_backend(cache)
+        started = time.perf_counter()
+        results = []
+        try:
+            with ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="batch") as executor:
+                futures = [executor.submit(self._run_profile, path) for path in profile_paths]
+                for future in as_completed(futures):
+                    results.append(future.result())
+        finally:
+            set_search_backend(previous_backend)
+            cache.close()
+
+        wall_seconds = time.perf_counter() - started
+        results.sort(key=lambda r: r["profile"])
+        summary = {
+            "finished_at": datetime.now().isoformat(),
+            "profiles": len(results),
+            "succeeded": sum(1 for r in results if r["status"] == "success"),
+            "concurrency": self.concurrency,
+            "wall_seconds": round(wall_seconds, 2),
+            "profile_seconds": round(sum(r["seconds"] for r in results), 2),
+            "total_tokens": sum(r["total_tokens"] for r in results),
+            "cost_usd": round(sum(r["cost_usd"] for r in results), 6),
+            "search_cache": {"hits": cache.hits, "misses": cache.misses},
+            "results": results,
+        }
+        with open(os.path.join(self.output_dir, "batch_summary.json"), "w") as f:
+            json.dump(summary, f, indent=2)
+        return summary
+
+
+def find_profiles(profile_dir: str) -> List[str]:
+    """Profile JSON files in `profile_dir`, sorted by name"""
+    return sorted(glob.glob(os.path.join(profile_dir, "*.json")))
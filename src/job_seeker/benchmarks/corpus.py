@@ -0,0 +1,147 @@
+"""
+Synthetic job posting corpus that imitates Serper search output.
+
+Everything is generated from a seeded random.Random, so a given (n, seed)
+always produces the same corpus and benchmark runs are comparable.
+"""
+import random
+from typing import Dict, Iterator, List
+
+ROLES = [
+    "Software Engineer", "AI Engineer", "Machine Learning Engineer", "Data Engineer",
+    "Backend Developer", "Frontend Developer", "Full Stack Developer", "DevOps Engineer",
+    "Site Reliability Engineer", "Data Scientist", "Platform Engineer", "Security Engineer",
+]
+SENIORITY = ["", "Junior ", "Senior ", "Staff ", "Lead ", "Principal "]
+COMPANIES = [
+    "Acme Corp", "Globex", "Initech", "Umbrella Labs", "Hooli", "Stark Industries",
+    "Wayne Tech", "Cyberdyne", "Soylent AI", "Tyrell Systems", "Vandelay Data", "Wonka Cloud",
+]
+LOCATIONS = [
+    "San Francisco, CA", "New York, NY", "Austin, TX", "Seattle, WA", "Boston, MA",
+    "Denver, CO", "Chicago, IL", "Remote", "Toronto, Canada", "London, England",
+]
+SKILLS = [
+    "Python", "JavaScript", "Java", "React", "Node.js", "AWS", "Docker", "Kubernetes",
+    "machine learning", "TensorFlow", "PyTorch", "SQL", "PostgreSQL", "MongoDB", "Git",
+    "Linux", "REST API", "GraphQL", "microservices", "CI/CD", "Terraform", "Azure", "GCP",
+    "Snowflake", "security", "agile",
+]
+JOB_TYPES = ["Full-time", "Part-time", "Contract", "Remote", "Permanent"]
+SITES = ["indeed.com", "linkedin.com/jobs", "glassdoor.com", "dice.com", "remote.co"]
+# Salary notations seen in real snippets, and how often; None means no salary is stated
+SALARY_FORMATS = [("range", 0.55), ("k_range", 0.2), ("k_single", 0.1), (None, 0.15)]
+POSTED = ["1 day ago", "3 days ago", "2 weeks ago", "5 hours ago", "2024-01-15", "Posted 01/20/2024"]
+
+
+def _salary_text(rng: random.Random) -> str:
+    """A salary in one of SALARY_FORMATS, or "" when the posting states none"""
+    notation = rng.choices([name for name, _ in SALARY_FORMATS], [weight for _, weight in SALARY_FORMATS])[0]
+    low = rng.randrange(60, 200)
+    high = low + rng.randrange(10, 80)
+    if notation == "range":
+        return f"${low * 1000:,}-${high * 1000:,}"
+    if notation == "k_range":
+        return f"${low}K-${high}K"
+    if notation == "k_single":
+        return f"Pay ${low}k"
+    return ""
+
+
+def generate_postings(n: int, seed: int = 42) -> Iterator[Dict]:
+    """Yield `n` raw search results (title, link, snippet), lazily"""
+    rng = random.Random(seed)
+    for i in range(n):
+        role = f"{rng.choice(SENIORITY)}{rng.choice(ROLES)}"
+        company = rng.choice(COMPANIES)
+        site = rng.choice(SITES)
+        skills = rng.sample(SKILLS, rng.randint(2, 7))
+        salary = _salary_text(rng)
+        title = f"{role} at {company}" if rng.random() < 0.7 else f"{company} - {role}"
+        location, job_type = rng.choice(LOCATIONS), rng.choice(JOB_TYPES)
+        snippet = (
+            f"{location}. {job_type}. {salary + '. ' if salary else ''}"
+            f"{rng.randint(1, 10)}+ years of experience with {', '.join(skills)}. "
+            f"{rng.choice(POSTED)}."
+        )
+        yield {
+            "title": title,
+            "link": f"https://{site}/job/{seed}-{i}",
+            "snippet": snippet,
+            "site": site,
+            # Ground truth for generate_jobs; not part of a Serper result
+            "location": location,
+            "job_type": job_type,
+            "salary": salary,
+        }
+
+
+def serper_text(postings: List[Dict]) -> str:
+    """Render postings the way SerperDevTool's text output separates results"""
+    return "\n---\n".join(
+        f"Title: {p['title']}\nLink: {p['link']}\nSnippet: {p['snippet']}"
+        for p in postings
+    )
+
+
+def serper_response(postings: List[Dict]) -> Dict:
+    """Render postings as a raw Serper API JSON response"""
+    return {
+        "searchParameters": {"q": "benchmark", "num": len(postings)},
+        "organic": [
+            {"title": p["title"], "link": p["link"], "snippet": p["snippet"], "position": i + 1}
+            for i, p in enumerate(postings)
+        ],
+    }
+
+
+def generate_serper_pages(n: int, page_size: int = 10, seed: int = 42) -> Iterator[Dict]:
+    """Yield Serper-like result pages covering `n` postings, in both text and JSON form"""
+    page = []
+    for posting in generate_postings(n, seed):
+        page.append(posting)
+        if len(page) == page_size:
+            yield {"site": page[0]["site"], "text": serper_text(page), "json": serper_response(page)}
+            page = []
+    if page:
+        yield {"site": page[0]["site"], "text": serper_text(page), "json": serper_response(page)}
+
+
+def generate_jobs(n: int, seed: int = 42) -> Iterator[Dict]:
+    """Yield `n` postings already in the job format produced by _parse_serper_results"""
+    rng = random.Random(seed + 1)
+    for posting in generate_postings(n, seed):
+        yield {
+            "title": posting["title"],
+            "company": posting["title"].split(" at ")[-1] if " at " in posting["title"] else posting["title"].split(" - ")[0],
+            "location": posting["location"],
+            "url": posting["link"],
+            "description": posting["snippet"],
+            "posted_date": rng.choice(POSTED),
+            "salary_range": posting["salary"] or "Salary not specified",
+            "site": posting["site"],
+            "job_type": posting["job_type"],
+        }
+
+
+def benchmark_profile() -> Dict:
+    """A fixed user profile so scores are comparable between runs"""
+    return {
+        "name": "Benchmark Candidate",
+        "current_role": "Software Engineer",
+        "years_experience": 6,
+        "location": "San Francisco, CA",
+        "preferred_locations": ["San Francisco, CA", "Remote", "New York, NY"],
+        "expected_salary": 150000,
+        "preferred_company_type": "labs",
+        "skills": ["Python", "JavaScript", "React", "Node.js", "AWS", "Docker", "Kubernetes", "SQL"],
+    }
+
+
+def benchmark_constraints() -> Dict:
+    """Hard constraints that rule out most of the corpus before scoring"""
+    return {
+        "locations": ["San Francisco", "Remote", "New York"],
+        "min_salary": 120000,
+        "job_types": ["Full-time", "Remote", "Permanent"],
+    }
@@ -0,0 +1,96 @@
+"""
+Import-time budget check for the CLI entry points.
+
+Runs `python -X importtime` in a fresh interpreter for each guarded module and
+fails when its cumulative import time exceeds the budget, or when it pulls in
+one of the heavy crew dependencies.
+
+Usage: python -m job_seeker.benchmarks.import_time [--repeat N] [--scale X] [--json]
+"""
+import argparse
+import json
+import re
+import subprocess
+import sys
+from typing import Dict, List
+
+# Cumulative import time budgets in milliseconds, measured cold in a fresh
+# interpreter. Use --scale on slow machines rather than raising these.
+IMPORT_BUDGETS_MS = {
+    "job_seeker.main": 150,
+    "job_seeker.profiles": 50,
+    "job_seeker.db": 50,
+    "job_seeker.metrics": 50,
+    "job_seeker.daemon": 100,
+}
+
+# Dependencies that must only be loaded by commands that actually run the crew
+HEAVY_MODULES = ["crewai", "crewai_tools", "litellm", "requests"]
+
+_IMPORTTIME_LINE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+
+def measure_import(module: str) -> Dict:
+    """Import `module` in a fresh interpreter and return its cumulative time and loaded modules"""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True, text=True
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(f"Importing {module} failed:\n{proc.stderr[-2000:]}")
+
+    cumulative_us = 0
+    loaded = []
+    for line in proc.stderr.splitlines():
+        match = _IMPORTTIME_LINE.match(line)
+        if not match:
+            continue
+        name = match.group(4)
+        loaded.append(name)
+        if name == module:
+            cumulative_us = int(match.group(2))
+    return {"module": module, "cumulative_ms": cumulative_us / 1000, "loaded": loaded}
+
+
+def check_budgets(repeat: int = 3, scale: float = 1.0) -> List[Dict]:
+    """Measure every guarded module, keeping the best of `repeat` runs to reduce noise"""
+    results = []
+    for module, budget in IMPORT_BUDGETS_MS.items():
+        runs = [measure_import(module) for _ in range(max(1, repeat))]
+        best = min(runs, key=lambda run: run["cumulative_ms"])
+        heavy = sorted({name for name in best["loaded"] if name.split(".")[0] in HEAVY_MODULES})
+        results.append({
+            "module": module,
+            "cumulative_ms": round(best["cumulative_ms"], 2),
+            "budget_ms": budget * scale,
+            "heavy_imports": heavy,
+            "ok": best["cumulative_ms"] <= budget * scale and not heavy,
+        })
+    return results
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="Check CLI import-time budgets")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per module; the fastest is kept")
+    parser.add_argument("--scale", type=float, default=1.0, help="Multiply every budget (for slow machines)")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args(argv)
+
+    results = check_budgets(repeat=args.repeat, scale=args.scale)
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print("⏱️  Import-time budgets")
+        print("=" * 30)
+        for result in results:
+            icon = "✅" if result["ok"] else "❌"
+            print(f"{icon} {result['module']}: {result['cumulative_ms']:.1f}ms (budget {result['budget_ms']:.0f}ms)")
+            if result["heavy_imports"]:
+                print(f"    ⚠️  loads heavy modules: {', '.join(result['heavy_imports'][:10])}")
+
+    return 0 if all(result["ok"] for result in results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,237 @@
+"""
+Offline benchmark suite for parsing, scoring, storage and reporting.
+
+Runs entirely on a synthetic corpus (see corpus.py) against a temporary
+database, with no network or LLM calls. Results are written as JSON and can
+be compared against a stored baseline.
+
+Usage: python -m job_seeker.benchmarks.suite [--sizes 1000,10000] [--repeat 3]
+           [--output results.json] [--baseline benchmark_baseline.json]
+           [--save-baseline] [--tolerance 0.2] [--no-memory]
+"""
+import argparse
+import gc
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+from typing import Callable, Dict, List
+
+from .corpus import benchmark_constraints, benchmark_profile, generate_jobs, generate_serper_pages
+
+DEFAULT_SIZES = [1000, 10000]
+DEFAULT_BASELINE_PATH = "benchmark_baseline.json"
+
+
+def _measure(func: Callable, setup: Callable = None, repeat: int = 3, memory: bool = True) -> Dict:
+    """
+    Time `func` (best of `repeat` runs) and measure its peak traced memory.
+
+    `setup` runs before every call, outside the timed region, and its return
+    value is passed to `func`.
+    """
+    best = float("inf")
+    for _ in range(max(1, repeat)):
+        arg = setup() if setup else None
+        gc.collect()
+        started = time.perf_counter()
+        func(arg)
+        best = min(best, time.perf_counter() - started)
+
+    peak_kb = None
+    if memory:
+        arg = setup() if setup else None
+        gc.collect()
+        tracemalloc.start()
+        func(arg)
+        peak_kb = tracemalloc.get_traced_memory()[1] / 1024
+        tracemalloc.stop()
+
+    return {"seconds": best, "peak_memory_kb": peak_kb}
+
+
+def run_suite(sizes: List[int], repeat: int = 3, memory: bool = True, seed: int = 42) -> Dict:
+    """Run every benchmark at every corpus size and return the results document"""
+    from job_seeker.tools import job_search_tools as tools
+
+    profile = benchmark_profile()
+    profile_json = json.dumps(profile)
+    constrained_json = json.dumps({**profile, "constraints": benchmark_constraints()})
+    results = []
+
+    with tempfile.TemporaryDirectory(prefix="job_seeker_bench_") as tmp:
+        previous_db = os.environ.get("JOB_SEEKER_DB")
+        try:
+            for size in sizes:
+                print(f"📦 Corpus of {size:,} postings")
+                pages = list(generate_serper_pages(size, seed=seed))
+                jobs = list(generate_jobs(size, seed=seed))
+                jobs_json = json.dumps(jobs)
+                db_path = os.path.join(tmp, f"bench_{size}.db")
+
+                def reset_db(_=None):
+                    if os.path.exists(db_path):
+                        os.remove(db_path)
+                    os.environ["JOB_SEEKER_DB"] = db_path
+
+                def parse(_):
+                    for page in pages:
+                        tools._parse_serper_results(page["text"], page["site"], "Software Engineer")
+
+                def parse_json(_):
+                    for page in pages:
+                        tools._parse_serper_results(page["json"], page["site"], "Software Engineer")
+
+                def score(_):
+                    compiled = tools.compile_profile(profile)
+                    for job in jobs:
+                        tools._calculate_match_score(job, compiled)
+
+                def evaluate(_):
+                    tools.job_evaluation_tool.func(jobs_json, profile_json, 0)
+
+                def evaluate_top(_):
+                    tools.job_evaluation_tool.func(jobs_json, profile_json, 10)
+
+                def evaluate_constrained(_):
+                    tools.job_evaluation_tool.func(jobs_json, constrained_json, 10)
+
+                def store(_):
+                    tools._store_jobs(jobs_json)
+
+                def prepare_store():
+                    reset_db()
+                    evaluated = json.loads(tools.job_evaluation_tool.func(jobs_json, profile_json, 0))
+                    tools._store_jobs(json.dumps(evaluated))
+                    return evaluated
+
+                def retrieve_all(_):
+                    tools._retrieve_jobs()
+
+                def retrieve_top(_):
+                    tools._retrieve_jobs(json.dumps({"min_score": 70, "limit": 100}))
+
+                def report(evaluated):
+                    top = [job for job in evaluated if job.get("match_score", 0) >= 70]
+                    tools._generate_markdown_report(top, profile)
+
+                def run_case(name, items, func, setup=None):
+                    measured = _measure(func, setup, repeat=repeat, memory=memory)
+                    seconds = measured["seconds"]
+                    result = {
+                        "name": name,
+                        "size": size,
+                        "items": items,
+                        "seconds": round(seconds, 6),
+                        "items_per_second": round(items / seconds, 2) if seconds else None,
+                        "peak_memory_kb": round(measured["peak_memory_kb"], 1) if measured["peak_memory_kb"] is not None else None,
+                    }
+                    results.append(result)
+                    memory_note = f", peak {result['peak_memory_kb']:,.0f} KiB" if memory else ""
+                    print(f"   {name:<26} {seconds * 1000:>10.1f}ms  {result['items_per_second'] or 0:>12,.0f}/s{memory_note}")
+
+                run_case("parse_serper_results", len(pages), parse)
+                run_case("parse_serper_json", len(pages), parse_json)
+                run_case("calculate_match_score", size, score)
+                run_case("job_evaluation_tool", size, evaluate)
+                run_case("job_evaluation_top10", size, evaluate_top)
+                run_case("job_evaluation_constrained", size, evaluate_constrained)
+                run_case("store_jobs", size, store, reset_db)
+
+                # Retrieval and reporting run against a database of evaluated jobs
+                evaluated = prepare_store()
+                run_case("retrieve_jobs_all", size, retrieve_all)
+                run_case("retrieve_jobs_top100", size, retrieve_top)
+                run_case("generate_markdown_report", size, report, lambda: evaluated)
+        finally:
+            if previous_db is None:
+                os.environ.pop("JOB_SEEKER_DB", None)
+            else:
+                os.environ["JOB_SEEKER_DB"] = previous_db
+
+    return {
+        "meta": {
+            "generated_at": datetime.now().isoformat(),
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "seed": seed,
+            "repeat": repeat,
+        },
+        "results": results,
+    }
+
+
+def compare_to_baseline(current: Dict, baseline: Dict, tolerance: float = 0.2) -> List[Dict]:
+    """
+    Compare throughput per (benchmark, size) with the baseline.
+
+    A benchmark regresses when its throughput drops by more than `tolerance`
+    (0.2 = 20% slower).
+    """
+    previous = {(r["name"], r["size"]): r for r in baseline.get("results", [])}
+    comparisons = []
+    for result in current["results"]:
+        base = previous.get((result["name"], result["size"]))
+        if not base or not base.get("items_per_second") or not result.get("items_per_second"):
+            continue
+        change = result["items_per_second"] / base["items_per_second"] - 1
+        comparisons.append({
+            "name": result["name"],
+            "size": result["size"],
+            "baseline_items_per_second": base["items_per_second"],
+            "items_per_second": result["items_per_second"],
+            "change": round(change, 4),
+            "regression": change < -tolerance,
+        })
+    return comparisons
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="Run the offline performance benchmarks")
+    parser.add_argument("--sizes", default=",".join(str(s) for s in DEFAULT_SIZES),
+                        help="Comma-separated corpus sizes (number of postings)")
+    parser.add_argument("--repeat", type=int, default=3, help="Timed runs per benchmark; the fastest is kept")
+    parser.add_argument("--seed", type=int, default=42, help="Corpus generator seed")
+    parser.add_argument("--output", default="benchmark_results.json", help="Where to write the results JSON")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE_PATH, help="Baseline JSON to compare against")
+    parser.add_argument("--save-baseline", action="store_true", help="Store these results as the new baseline")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Allowed throughput drop before failing")
+    parser.add_argument("--no-memory", action="store_true", help="Skip the tracemalloc memory pass")
+    args = parser.parse_args(argv)
+
+    sizes = [int(size) for size in args.sizes.split(",") if size.strip()]
+    print("🏁 Job Seeker Benchmark Suite")
+    print("=" * 30)
+    current = run_suite(sizes, repeat=args.repeat, memory=not args.no_memory, seed=args.seed)
+
+    exit_code = 0
+    if os.path.exists(args.baseline) and not args.save_baseline:
+        with open(args.baseline) as f:
+            comparisons = compare_to_baseline(current, json.load(f), args.tolerance)
+        current["comparison"] = {"baseline": args.baseline, "tolerance": args.tolerance, "results": comparisons}
+        print()
+        print(f"📈 Compared with {args.baseline} (tolerance {args.tolerance:.0%})")
+        for c in comparisons:
+            icon = "❌" if c["regression"] else "✅"
+            print(f"   {icon} {c['name']:<26} n={c['size']:<8} {c['change']:+.1%}")
+        if any(c["regression"] for c in comparisons):
+            exit_code = 1
+
+    with open(args.output, "w") as f:
+        json.dump(current, f, indent=2)
+    print(f"\n💾 Results written to {args.output}")
+
+    if args.save_baseline:
+        with open(args.baseline, "w") as f:
+            json.dump(current, f, indent=2)
+        print(f"📌 Baseline saved to {args.baseline}")
+
+    return exit_code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
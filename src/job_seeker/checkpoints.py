@@ -0,0 +1,155 @@
+"""
+Per-stage checkpoints for crew runs, so a failed run resumes where it stopped.
+
+Every run gets a run id; its inputs go to pipeline_runs and the output of each
+finished task to run_checkpoints, together with a content hash of everything
+the task's output depends on: its prompt template, its agent, the inputs the
+template references and the outputs of the tasks it takes context from.
+Resuming a run reuses a checkpoint only while that hash still matches, so
+editing a prompt or a profile field re-runs the affected stages and the
+stages downstream of them, and nothing else.
+"""
+import hashlib
+import json
+import re
+import uuid
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional
+
+from .db import connect
+
+_PLACEHOLDER = re.compile(r"\{(\w+)\}")
+# TaskOutput fields kept in a checkpoint (pydantic outputs aren't used by this crew)
+_OUTPUT_FIELDS = ("description", "name", "expected_output", "summary", "raw", "json_dict", "agent",
+                  "output_format")
+
+
+def _init_checkpoints(conn):
+    """Initialize the pipeline_runs and run_checkpoints tables"""
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS pipeline_runs (
+            run_id TEXT PRIMARY KEY,
+            inputs TEXT NOT NULL,
+            status TEXT NOT NULL,
+            created_at TEXT NOT NULL,
+            updated_at TEXT NOT NULL
+        )
+    ''')
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS run_checkpoints (
+            run_id TEXT NOT NULL,
+            task_name TEXT NOT NULL,
+            stage_hash TEXT NOT NULL,
+            output TEXT NOT NULL,
+            created_at TEXT NOT NULL,
+            PRIMARY KEY (run_id, task_name)
+        )
+    ''')
+
+
+def new_run_id() -> str:
+    return uuid.uuid4().hex[:12]
+
+
+def stage_hash(task_config: Dict, agent_role: str, inputs: Dict, upstream_outputs: Iterable[str]) -> str:
+    """Content hash of everything a task's output depends on"""
+    template = f"{task_config.get('description', '')}\n{task_config.get('expected_output', '')}"
+    used_inputs = {name: inputs.get(name) for name in sorted(set(_PLACEHOLDER.findall(template)))}
+    payload = json.dumps({
+        "template": template,
+        "agent": agent_role,
+        "inputs": used_inputs,
+        "upstream": [hashlib.sha256(output.encode()).hexdigest() for output in upstream_outputs],
+    }, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def start_run(run_id: str, inputs: Dict):
+    """Record a new or resumed run as running"""
+    now = datetime.now().isoformat()
+    conn = connect()
+    try:
+        _init_checkpoints(conn)
+        conn.execute('''
+            INSERT INTO pipeline_runs (run_id, inputs, status, created_at, updated_at)
+            VALUES (?, ?, 'running', ?, ?)
+            ON CONFLICT(run_id) DO UPDATE SET
+                inputs = excluded.inputs, status = 'running', updated_at = excluded.updated_at
+        ''', (run_id, json.dumps(inputs), now, now))
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def finish_run(run_id: str, status: str):
+    conn = connect()
+    try:
+        _init_checkpoints(conn)
+        conn.execute("UPDATE pipeline_runs SET status = ?, updated_at = ? WHERE run_id = ?",
+                     (status, datetime.now().isoformat(), run_id))
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def load_run(run_id: str) -> Optional[Dict]:
+    conn = connect()
+    try:
+        _init_checkpoints(conn)
+        row = conn.execute(
+            "SELECT run_id, inputs, status, created_at, updated_at FROM pipeline_runs WHERE run_id = ?",
+            (run_id,)
+        ).fetchone()
+    finally:
+        conn.close()
+    if row is None:
+        return None
+    return {"run_id": row[0], "inputs": json.loads(row[1]), "status": row[2],
+            "created_at": row[3], "updated_at": row[4]}
+
+
+def list_runs(limit: int = 10) -> List[Dict]:
+    """Most recent runs with the names of their checkpointed stages"""
+    conn = connect()
+    try:
+        _init_checkpoints(conn)
+        rows = conn.execute('''
+            SELECT r.run_id, r.status, r.created_at, r.updated_at, GROUP_CONCAT(c.task_name, ', ')
+            FROM pipeline_runs r LEFT JOIN run_checkpoints c ON c.run_id = r.run_id
+            GROUP BY r.run_id
+            ORDER BY r.updated_at DESC
+            LIMIT ?
+        ''', (limit,)).fetchall()
+    finally:
+        conn.close()
+    return [{"run_id": row[0], "status": row[1], "created_at": row[2], "updated_at": row[3],
+             "completed_stages": row[4] or ""} for row in rows]
+
+
+def save_checkpoint(run_id: str, task_name: str, hash_: str, output) -> None:
+    """Store a finished task's output (a crewai TaskOutput)"""
+    record = {field: getattr(output, field, None) for field in _OUTPUT_FIELDS}
+    record["output_format"] = getattr(record["output_format"], "value", record["output_format"])
+    conn = connect()
+    try:
+        _init_checkpoints(conn)
+        conn.execute('''
+            INSERT OR REPLACE INTO run_checkpoints (run_id, task_name, stage_hash, output, created_at)
+            VALUES (?, ?, ?, ?, ?)
+        ''', (run_id, task_name, hash_, json.dumps(record, default=str), datetime.now().isoformat()))
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def load_checkpoints(run_id: str) -> Dict[str, Dict]:
+    """{task_name: {"stage_hash", "output"}} for a run's checkpointed stages"""
+    conn = connect()
+    try:
+        _init_checkpoints(conn)
+        rows = conn.execute(
+            "SELECT task_name, stage_hash, output FROM run_checkpoints WHERE run_id = ?", (run_id,)
+        ).fetchall()
+    finally:
+        conn.close()
+    return {name: {"stage_hash": hash_, "output": json.loads(output)} for name, hash_, output in rows}
@@ -1,10 +1,15 @@
 from crewai import Agent, Crew, Process, Task
 from crewai.project import CrewBase, agent, crew, task
 from crewai.agents.agent_builder.base_agent import BaseAgent
+from crewai.tasks.task_output import TaskOutput
+from contextlib import contextmanager
 from typing import List
 import json
 import os
-from .tools.job_search_tools import job_search_tool, job_evaluation_tool, database_tool, report_generation_tool
+from . import checkpoints, metrics
+from .profiles import load_user_profile
+from .usage import UsageTracker
+from .tools.job_search_tools import job_search_tool, planned_job_search_tool, job_evaluation_tool, database_tool, report_generation_tool
 
 # If you want to run a snippet of code before or after the crew starts,
 # you can use the @before_kickoff and @after_kickoff decorators
@@ -17,9 +22,46 @@ class JobSeeker():
     agents: List[BaseAgent]
     tasks: List[Task]
 
-    def __init__(self):
+    def __init__(self, use_async: bool = False):
         super().__init__()
-        # Tools are now imported as functions
+        # Tools are now imported as functions; use_async swaps in the async
+        # variants (same names) for the I/O-bound search and database tools
+        self.use_async = use_async
+        self.usage_tracker = None
+        # Run id whose finished stages are checkpointed by the task callback
+        self.run_id = None
+        self._run_inputs = None
+
+    def _tool(self, name: str):
+        """Return the sync or async variant of a search/database tool"""
+        if self.use_async:
+            from .tools import async_job_search_tools
+            return getattr(async_job_search_tools, name)
+        return globals()[name]
+
+    def _on_task_complete(self, output):
+        """Task callback: attribute token usage to the task that just finished and checkpoint it"""
+        if self.usage_tracker is not None:
+            self.usage_tracker.on_task_complete(output)
+        if self.run_id is not None:
+            task = next((t for t in self.tasks if t.name == output.name), None)
+            stage_hash = self._stage_hash(task, self._run_inputs) if task else None
+            if stage_hash:
+                checkpoints.save_checkpoint(self.run_id, task.name, stage_hash, output)
+
+    def _dependencies(self, task: Task) -> List[Task]:
+        """Tasks whose outputs feed `task`: its context, or every earlier task when unspecified"""
+        if isinstance(task.context, list):
+            return task.context
+        return self.tasks[:self.tasks.index(task)]
+
+    def _stage_hash(self, task: Task, inputs: dict):
+        """Checkpoint hash of `task`, or None while any task it depends on has no output"""
+        upstream = self._dependencies(task)
+        if any(dependency.output is None for dependency in upstream):
+            return None
+        return checkpoints.stage_hash(self.tasks_config[task.name], task.agent.role, inputs,
+                                      [dependency.output.raw for dependency in upstream])
 
     # Learn more about YAML configuration files here:
     # Agents: https://docs.crewai.com/concepts/agents#yaml-configuration-recommended
@@ -31,7 +73,7 @@ class JobSeeker():
     def job_search_agent(self) -> Agent:
         return Agent(
             config=self.agents_config['job_search_agent'], # type: ignore[index]
-            tools=[job_search_tool],
+            tools=[self._tool('planned_job_search_tool'), self._tool('job_search_tool')],
             verbose=True
         )
 
@@ -47,7 +89,7 @@ class JobSeeker():
     def database_manager(self) -> Agent:
         return Agent(
             config=self.agents_config['database_manager'], # type: ignore[index]
-            tools=[database_tool],
+            tools=[self._tool('database_tool')],
             verbose=True
         )
 
@@ -95,7 +137,7 @@ class JobSeeker():
         return Task(
             config=self.tasks_config['report_generation_task'], # type: ignore[index]
             context=[self.job_evaluation_task()],
-            output_file='job_search_report.md'
+            output_file='{output_dir}/job_search_report.md'
         )
 
     @task
@@ -103,47 +145,37 @@ class JobSeeker():
         return Task(
             config=self.tasks_config['application_coordination_task'], # type: ignore[index]
             context=[self.report_generation_task()],
-            output_file='application_strategy.md'
+            output_file='{output_dir}/application_strategy.md'
         )
 
     @crew
-    def crew(self) -> Crew:
-        """Creates the JobSeeker crew"""
+    def crew(self, skip_tasks: frozenset = frozenset()) -> Crew:
+        """Creates the JobSeeker crew, leaving out already completed `skip_tasks`"""
         # To learn how to add knowledge sources to your crew, check out the documentation:
         # https://docs.crewai.com/concepts/knowledge#what-is-knowledge
 
         return Crew(
             agents=self.agents, # Automatically created by the @agent decorator
-            tasks=self.tasks, # Automatically created by the @task decorator
+            tasks=[t for t in self.tasks if t.name not in skip_tasks], # Automatically created by the @task decorator
             process=Process.sequential,
             verbose=True,
+            task_callback=self._on_task_complete,
             # process=Process.hierarchical, # In case you wanna use that instead https://docs.crewai.com/how-to/Hierarchical/
         )
 
     def load_user_profile(self, profile_path: str = None) -> dict:
         """Load user profile from JSON file"""
-        if profile_path is None:
-            profile_path = os.path.join(os.path.dirname(__file__), '..', '..', 'knowledge', 'resume_template.json')
-        
-        try:
-            with open(profile_path, 'r') as f:
-                return json.load(f)
-        except FileNotFoundError:
-            print(f"Profile file not found at {profile_path}")
-            print("Please update the resume_template.json file with your information")
-            return {}
-        except json.JSONDecodeError as e:
-            print(f"Error parsing profile file: {e}")
-            return {}
-
-    def run_job_search(self, user_profile: dict = None, job_sites: list = None):
-        """Run the complete job search process"""
+        return load_user_profile(profile_path)
+
+    def _search_inputs(self, user_profile: dict = None, job_sites: list = None, search_query: str = None,
+                       output_dir: str = None):
+        """Build the crew inputs for a search, or None without a usable profile"""
         if user_profile is None:
             user_profile = self.load_user_profile()
         
         if not user_profile:
             print("No user profile available. Please check your resume_template.json file.")
-            return
+            return None
         
         # Prepare inputs for the crew
         inputs = {
@@ -160,23 +192,132 @@ class JobSeeker():
                 "weworkremotely.com", # Remote work
                 "flexjobs.com"        # Flexible work
             ],
-            'search_query': f"{user_profile.get('current_role', 'Software Engineer')} {user_profile.get('skills', [])[0] if user_profile.get('skills') else ''}"
+            'search_query': search_query or user_profile.get('current_role', 'Software Engineer'),
+            # Directory for the report and application strategy (interpolated into the tasks' output_file)
+            'output_dir': output_dir or '.',
         }
         
         print(f"Starting job search for {user_profile.get('name', 'Job Seeker')}")
         print(f"Searching for: {inputs['search_query']}")
         print(f"Target sites: {', '.join(inputs['job_sites'])}")
-        
+        return inputs
+
+    def _restore_checkpoints(self, run_id: str, inputs: dict) -> frozenset:
+        """
+        Restore the outputs of a run's stages whose checkpoints are still valid.
+
+        Returns the names of the restored tasks; they are skipped and their
+        outputs serve as context for the stages that still have to run.
+        """
+        saved = checkpoints.load_checkpoints(run_id)
+        self.crew()  # Instantiate the tasks
+        for task in self.tasks:
+            task.output = None
+        restored = set()
+        for task in self.tasks:
+            checkpoint = saved.get(task.name)
+            if not checkpoint or checkpoint["stage_hash"] != self._stage_hash(task, inputs):
+                continue
+            task.output = TaskOutput(**checkpoint["output"])
+            restored.add(task.name)
+            # Resolve output_file for this run's output_dir, as kickoff would
+            task.interpolate_inputs_and_add_conversation_history(inputs)
+            if task.output_file and not os.path.exists(task.output_file):
+                task._save_file(task.output.raw)
+        return frozenset(restored)
+
+    def _checkpointed_crew(self, inputs: dict, run_id: str = None, resume: bool = False):
+        """Crew of the stages left to run for `run_id`, or None when every stage is already done"""
+        self.run_id = run_id or checkpoints.new_run_id()
+        self._run_inputs = inputs
+        done = self._restore_checkpoints(self.run_id, inputs) if resume else frozenset()
+        checkpoints.start_run(self.run_id, inputs)
+        crew = self.crew(skip_tasks=done)
+        for task in self.tasks:
+            if task.name in done:
+                print(f"Reusing checkpointed stage: {task.name}")
+        if not crew.tasks:
+            checkpoints.finish_run(self.run_id, "success")
+            print(f"All stages of run {self.run_id} are already complete")
+            return None
+        return crew
+
+    @contextmanager
+    def _tracked_run(self, crew: Crew):
+        """Track usage, metrics and checkpoints around one crew kickoff"""
+        self.usage_tracker = UsageTracker(crew.agents, run_id=self.run_id)
+        run_status = "error"
         try:
-            result = self.crew().kickoff(inputs=inputs)
+            with metrics.timer("run_seconds"):
+                yield
+            run_status = "success"
+            metrics.inc("runs_total", status="success")
             print("\n" + "="*50)
             print("JOB SEARCH COMPLETED SUCCESSFULLY!")
             print("="*50)
+            output_dir = self._run_inputs.get('output_dir', '.')
             print("Check the following files for results:")
-            print("- job_search_report.md (Comprehensive report)")
-            print("- application_strategy.md (Application guidance)")
+            print(f"- {os.path.join(output_dir, 'job_search_report.md')} (Comprehensive report)")
+            print(f"- {os.path.join(output_dir, 'application_strategy.md')} (Application guidance)")
             print("- job_opportunities.db (Database of opportunities)")
-            return result
         except Exception as e:
+            metrics.inc("runs_total", status="error")
             print(f"Error during job search: {e}")
+            print(f"Completed stages are checkpointed; retry the rest with: resume {self.run_id}")
             raise
+        finally:
+            checkpoints.finish_run(self.run_id, run_status)
+            if self.usage_tracker.save(status=run_status):
+                totals = self.usage_tracker.totals()
+                print(f"- run {self.usage_tracker.run_id}: {totals['total_tokens']:,} tokens, "
+                      f"${totals['cost_usd']:.4f} estimated (see 'usage_report')")
+            metrics_path = metrics.export()
+            if metrics_path:
+                print(f"- {metrics_path} (Run metrics)")
+
+    def run_job_search(self, user_profile: dict = None, job_sites: list = None, search_query: str = None,
+                       output_dir: str = None):
+        """Run the complete job search process, writing the reports to `output_dir` (default: cwd)"""
+        inputs = self._search_inputs(user_profile, job_sites, search_query, output_dir)
+        if inputs is None:
+            return
+        
+        crew = self._checkpointed_crew(inputs)
+        with self._tracked_run(crew):
+            result = crew.kickoff(inputs=inputs)
+        return result
+
+    async def run_job_search_async(self, user_profile: dict = None, job_sites: list = None,
+                                   search_query: str = None, output_dir: str = None):
+        """Run the complete job search process without blocking the event loop"""
+        inputs = self._search_inputs(user_profile, job_sites, search_query, output_dir)
+        if inputs is None:
+            return
+        
+        crew = self._checkpointed_crew(inputs)
+        with self._tracked_run(crew):
+            result = await crew.kickoff_async(inputs=inputs)
+        return result
+
+    def resume_job_search(self, run_id: str, user_profile: dict = None):
+        """
+        Resume a run, re-running only the stages without a valid checkpoint.
+
+        With `user_profile`, the run's profile is replaced and the stages that
+        depend on it are invalidated.
+        """
+        run = checkpoints.load_run(run_id)
+        if run is None:
+            print(f"No run {run_id} found")
+            return
+        # Runs recorded before output_dir was an input wrote their reports to the cwd
+        inputs = {'output_dir': '.', **run["inputs"]}
+        if user_profile is not None:
+            inputs = {**inputs, 'user_profile': json.dumps(user_profile)}
+
+        crew = self._checkpointed_crew(inputs, run_id, resume=True)
+        if crew is None:
+            return
+        with self._tracked_run(crew):
+            result = crew.kickoff(inputs=inputs)
+        return result
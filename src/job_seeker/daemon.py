@@ -0,0 +1,357 @@
+"""
+Long-running search daemon backed by a persistent SQLite work queue
+"""
+import hashlib
+import json
+import os
+import signal
+import socket
+import sqlite3
+import threading
+import time
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from .db import ensure_columns
+from .profiles import load_user_profile
+
+DEFAULT_QUEUE_PATH = "job_queue.db"
+# Each queued job writes its report and application strategy to <this>/job-<id>/
+DEFAULT_RESULTS_DIR = "daemon_results"
+# A running job whose daemon has not refreshed its heartbeat for this long is
+# considered abandoned and is returned to the queue
+DEFAULT_STALE_SECONDS = 120
+
+
+def get_queue_path() -> str:
+    """Return the work queue database path (overridable with JOB_SEEKER_QUEUE_DB)"""
+    return os.environ.get("JOB_SEEKER_QUEUE_DB", DEFAULT_QUEUE_PATH)
+
+
+def _dedup_key(profile_path: str, sites: Optional[List[str]], query: Optional[str]) -> str:
+    """Identify a search job by what it searches, not by when it was queued"""
+    payload = json.dumps([os.path.abspath(profile_path), sorted(sites or []), (query or "").strip().lower()])
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+def _owner_alive(owner: Optional[str]) -> bool:
+    """Whether the host:pid that claimed a job may still be running it"""
+    host, _, pid = (owner or "").rpartition(":")
+    if host != socket.gethostname() or not pid.isdigit() or os.name == "nt":
+        # Only processes on this host can be checked (and on Windows os.kill
+        # would terminate the process); the heartbeat decides for the others
+        return True
+    try:
+        os.kill(int(pid), 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass  # Exists, but belongs to another user
+    return True
+
+
+class SearchQueue:
+    """
+    Priority queue of search jobs persisted in SQLite.
+
+    A job is a (profile, sites, query) triple. Enqueuing the same triple again
+    does not create a second row: the pending job keeps the higher priority and
+    the earlier due time instead. A job enqueued while it is running is run
+    again once the current run finishes.
+
+    Claimed jobs record their owner (host:pid) and a heartbeat, so several
+    daemons can share one queue without taking over each other's running jobs.
+    """
+
+    def __init__(self, db_path: str = None):
+        self.db_path = db_path or get_queue_path()
+        self.owner = f"{socket.gethostname()}:{os.getpid()}"
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(self.db_path, timeout=30, check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.create_function("owner_alive", 1, _owner_alive)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self._init_queue()
+
+    def _init_queue(self):
+        """Initialize the queue table"""
+        with self._lock:
+            self.conn.execute('''
+                CREATE TABLE IF NOT EXISTS search_queue (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    dedup_key TEXT UNIQUE NOT NULL,
+                    profile_path TEXT NOT NULL,
+                    sites TEXT,
+                    query TEXT,
+                    priority INTEGER DEFAULT 0,
+                    interval_seconds INTEGER,
+                    status TEXT DEFAULT 'pending',
+                    next_run_at REAL NOT NULL,
+                    started_at TEXT,
+                    finished_at TEXT,
+                    duration_seconds REAL,
+                    run_count INTEGER DEFAULT 0,
+                    last_error TEXT,
+                    rerun_requested INTEGER DEFAULT 0,
+                    claimed_by TEXT,
+                    heartbeat_at REAL,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+            ''')
+            # Queues created before reruns and job owners were recorded
+            ensure_columns(self.conn, "search_queue", {
+                "rerun_requested": "INTEGER DEFAULT 0",
+                "claimed_by": "TEXT",
+                "heartbeat_at": "REAL",
+            })
+            self.conn.execute('''
+                CREATE INDEX IF NOT EXISTS idx_search_queue_due
+                ON search_queue (status, next_run_at, priority)
+            ''')
+            self.conn.commit()
+
+    def enqueue(self, profile_path: str, sites: List[str] = None, query: str = None,
+                priority: int = 0, interval_seconds: int = None, delay_seconds: float = 0) -> int:
+        """Add a search job, merging it with an identical job already queued"""
+        key = _dedup_key(profile_path, sites, query)
+        due = time.time() + delay_seconds
+        with self._lock:
+            self.conn.execute('''
+                INSERT INTO search_queue
+                (dedup_key, profile_path, sites, query, priority, interval_seconds, next_run_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(dedup_key) DO UPDATE SET
+                    priority = MAX(priority, excluded.priority),
+                    interval_seconds = COALESCE(excluded.interval_seconds, interval_seconds),
+                    next_run_at = CASE WHEN status = 'pending'
+                                       THEN MIN(next_run_at, excluded.next_run_at)
+                                       ELSE excluded.next_run_at END,
+                    -- A running job keeps running; finish() queues it again afterwards
+                    rerun_requested = CASE WHEN status = 'running' THEN 1 ELSE rerun_requested END,
+                    status = CASE WHEN status = 'running' THEN status ELSE 'pending' END
+            ''', (key, os.path.abspath(profile_path), json.dumps(sites) if sites else None,
+                  query, priority, interval_seconds, due))
+            self.conn.commit()
+            row = self.conn.execute("SELECT id FROM search_queue WHERE dedup_key = ?", (key,)).fetchone()
+        return row["id"]
+
+    def claim(self, limit: int) -> List[Dict]:
+        """Mark up to `limit` due jobs as running and return them, highest priority first"""
+        if limit <= 0:
+            return []
+        with self._lock:
+            rows = self.conn.execute('''
+                SELECT * FROM search_queue
+                WHERE status = 'pending' AND next_run_at <= ?
+                ORDER BY priority DESC, next_run_at ASC, id ASC
+                LIMIT ?
+            ''', (time.time(), limit)).fetchall()
+            started_at = datetime.now().isoformat()
+            claimed = []
+            for row in rows:
+                # Another daemon sharing the queue may have claimed it since the select
+                cursor = self.conn.execute('''
+                    UPDATE search_queue
+                    SET status = 'running', started_at = ?, claimed_by = ?, heartbeat_at = ?
+                    WHERE id = ? AND status = 'pending'
+                ''', (started_at, self.owner, time.time(), row["id"]))
+                if cursor.rowcount:
+                    claimed.append(dict(row))
+            self.conn.commit()
+        return claimed
+
+    def finish(self, job: Dict, duration: float, error: str = None):
+        """Record the outcome of a job and reschedule it if it is recurring or was enqueued again"""
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT interval_seconds, next_run_at, rerun_requested FROM search_queue WHERE id = ?",
+                (job["id"],)
+            ).fetchone()
+            if row is None:
+                return  # Cancelled while running
+            interval = row["interval_seconds"]
+            if interval:
+                status, next_run_at = "pending", time.time() + interval
+            else:
+                status, next_run_at = ("failed" if error else "done"), job["next_run_at"]
+            if row["rerun_requested"]:
+                # enqueue() stored the requested due time while the job was running
+                status = "pending"
+                next_run_at = min(next_run_at, row["next_run_at"]) if interval else row["next_run_at"]
+            self.conn.execute('''
+                UPDATE search_queue
+                SET status = ?, next_run_at = ?, finished_at = ?, duration_seconds = ?,
+                    run_count = run_count + 1, last_error = ?, rerun_requested = 0
+                WHERE id = ?
+            ''', (status, next_run_at, datetime.now().isoformat(), duration, error, job["id"]))
+            self.conn.commit()
+
+    def heartbeat(self) -> int:
+        """Mark the running jobs claimed through this queue as still alive; returns how many"""
+        with self._lock:
+            cursor = self.conn.execute(
+                "UPDATE search_queue SET heartbeat_at = ? WHERE status = 'running' AND claimed_by = ?",
+                (time.time(), self.owner)
+            )
+            self.conn.commit()
+        return cursor.rowcount
+
+    def recover(self, stale_after: float = DEFAULT_STALE_SECONDS) -> int:
+        """
+        Return jobs left 'running' by a daemon that died back to the queue.
+
+        A job is abandoned when its owner is a process on this host that no
+        longer exists, or when its heartbeat is older than `stale_after`
+        seconds; jobs of live daemons, here or on other hosts, are left alone.
+        """
+        with self._lock:
+            # One statement, so a heartbeat written meanwhile by the owner is respected
+            cursor = self.conn.execute('''
+                UPDATE search_queue SET status = 'pending', rerun_requested = 0
+                WHERE status = 'running' AND claimed_by IS NOT ?
+                  AND (COALESCE(heartbeat_at, 0) < ? OR NOT owner_alive(claimed_by))
+            ''', (self.owner, time.time() - stale_after))
+            self.conn.commit()
+        return cursor.rowcount
+
+    def cancel(self, job_id: int) -> bool:
+        """Remove a job from the queue"""
+        with self._lock:
+            cursor = self.conn.execute("DELETE FROM search_queue WHERE id = ?", (job_id,))
+            self.conn.commit()
+        return cursor.rowcount > 0
+
+    def jobs(self) -> List[Dict]:
+        """Return every job in the queue, most urgent first"""
+        with self._lock:
+            rows = self.conn.execute('''
+                SELECT * FROM search_queue
+                ORDER BY CASE status WHEN 'running' THEN 0 WHEN 'pending' THEN 1 ELSE 2 END,
+                         priority DESC, next_run_at ASC
+            ''').fetchall()
+        return [dict(row) for row in rows]
+
+    def close(self):
+        self.conn.close()
+
+
+class SearchDaemon:
+    """
+    Pull search jobs from a SearchQueue and run them with bounded concurrency.
+
+    Each worker thread keeps its own JobSeeker (and therefore its own crew,
+    agents and tools) alive between jobs, and parsed profiles are cached by
+    file modification time, so a job only pays for the search itself.
+    """
+
+    def __init__(self, queue: SearchQueue, concurrency: int = 2, poll_interval: float = 5.0,
+                 liveness_interval: float = 0, results_dir: str = DEFAULT_RESULTS_DIR):
+        self.queue = queue
+        self.results_dir = results_dir
+        self.concurrency = max(1, concurrency)
+        self.poll_interval = poll_interval
+        # Seconds between background liveness checks of stored postings (0 = off)
+        self.liveness_interval = liveness_interval
+        self._next_liveness = 0.0
+        self._liveness_thread = None
+        self._local = threading.local()
+        self._active = 0
+        self._active_lock = threading.Lock()
+        self._stop = threading.Event()
+
+    def _job_seeker(self):
+        """Return the JobSeeker owned by the current worker thread"""
+        if not hasattr(self._local, "job_seeker"):
+            from job_seeker.crew import JobSeeker
+            self._local.job_seeker = JobSeeker()
+        return self._local.job_seeker
+
+    def _run_job(self, job: Dict):
+        """Execute one queued search and report its status"""
+        started = time.perf_counter()
+        error = None
+        print(f"▶️  Job {job['id']} started: {job['query'] or 'profile default'} ({job['profile_path']})")
+        try:
+            # Parsed once per file version, and a private copy for this job
+            profile = load_user_profile(job["profile_path"])
+            if not profile:
+                raise ValueError(f"No usable profile at {job['profile_path']}")
+            sites = json.loads(job["sites"]) if job["sites"] else None
+            # Concurrent jobs would overwrite each other's reports in a shared directory
+            output_dir = os.path.join(self.results_dir, f"job-{job['id']}")
+            self._job_seeker().run_job_search(profile, sites, search_query=job["query"], output_dir=output_dir)
+        except Exception as e:
+            error = f"{e}"
+            traceback.print_exc()
+        finally:
+            duration = time.perf_counter() - started
+            self.queue.finish(job, duration, error)
+            with self._active_lock:
+                self._active -= 1
+            if error:
+                print(f"❌ Job {job['id']} failed after {duration:.1f}s: {error}")
+            else:
+                print(f"✅ Job {job['id']} finished in {duration:.1f}s")
+
+    def _run_liveness(self):
+        """Expire stored postings that are no longer online"""
+        from job_seeker.lifecycle import check_stored_jobs
+
+        try:
+            summary = check_stored_jobs()
+            print(f"🩺 Liveness check: {summary['checked']} postings checked, {summary['expired']} expired")
+        except Exception:
+            traceback.print_exc()
+
+    def _maybe_start_liveness(self):
+        if not self.liveness_interval or time.monotonic() < self._next_liveness:
+            return
+        if self._liveness_thread is not None and self._liveness_thread.is_alive():
+            return
+        self._next_liveness = time.monotonic() + self.liveness_interval
+        self._liveness_thread = threading.Thread(target=self._run_liveness, name="job-seeker-liveness", daemon=True)
+        self._liveness_thread.start()
+
+    def stop(self, *_):
+        """Stop claiming new jobs; running jobs are allowed to finish"""
+        if not self._stop.is_set():
+            print("🛑 Stopping daemon after running jobs finish...")
+        self._stop.set()
+
+    def _recover(self):
+        """Refresh the heartbeat of this daemon's jobs and requeue abandoned ones"""
+        self.queue.heartbeat()
+        # A few missed polls before another daemon's job counts as abandoned
+        recovered = self.queue.recover(max(DEFAULT_STALE_SECONDS, 3 * self.poll_interval))
+        if recovered:
+            print(f"♻️  Requeued {recovered} job(s) abandoned by a stopped daemon")
+
+    def serve_forever(self):
+        """Poll the queue until stopped"""
+        if threading.current_thread() is threading.main_thread():
+            signal.signal(signal.SIGINT, self.stop)
+            signal.signal(signal.SIGTERM, self.stop)
+
+        print(f"🛰️  Daemon serving {self.queue.db_path} with concurrency {self.concurrency}")
+        with ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="job-seeker") as executor:
+            while not self._stop.is_set():
+                self._recover()
+                with self._active_lock:
+                    free = self.concurrency - self._active
+                jobs = self.queue.claim(free)
+                for job in jobs:
+                    with self._active_lock:
+                        self._active += 1
+                    executor.submit(self._run_job, job)
+                self._maybe_start_liveness()
+                self._stop.wait(self.poll_interval)
+            # Running jobs are still ours while they finish
+            while True:
+                with self._active_lock:
+                    if not self._active:
+                        break
+                self.queue.heartbeat()
+                time.sleep(min(self.poll_interval, 1.0))
+        print("👋 Daemon stopped")
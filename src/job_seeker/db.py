@@ -0,0 +1,58 @@
+"""
+SQLite connection helpers shared by the tools, the daemon and the CLI commands
+"""
+import os
+import sqlite3
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, List, Optional
+
+DEFAULT_DB_PATH = "job_opportunities.db"
+
+
+# Per-context override, so concurrent runs in one process (batch mode) can
+# each use their own database; copied into asyncio tasks and to_thread calls
+_db_path_override: ContextVar[Optional[str]] = ContextVar("job_seeker_db_path", default=None)
+
+
+def get_db_path() -> str:
+    """Return the job opportunities database path (overridable with JOB_SEEKER_DB)"""
+    return _db_path_override.get() or os.environ.get("JOB_SEEKER_DB", DEFAULT_DB_PATH)
+
+
+@contextmanager
+def use_db_path(db_path: str):
+    """Use `db_path` as the database for the current thread or task"""
+    token = _db_path_override.set(db_path)
+    try:
+        yield
+    finally:
+        _db_path_override.reset(token)
+
+
+def connect(db_path: str = None, check_same_thread: bool = True) -> sqlite3.Connection:
+    """
+    Open a connection configured for concurrent use.
+
+    WAL mode lets readers keep working while a writer commits, and the busy
+    timeout makes concurrent writers wait for the lock instead of failing.
+    New databases use incremental auto-vacuum, so free pages can be returned
+    in small steps (see maintenance.py) instead of by a full VACUUM.
+    """
+    conn = sqlite3.connect(db_path or get_db_path(), timeout=30, check_same_thread=check_same_thread)
+    # Only takes effect before the first table is created (or at the next VACUUM)
+    conn.execute("PRAGMA auto_vacuum=INCREMENTAL")
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    return conn
+
+
+def ensure_columns(conn: sqlite3.Connection, table: str, columns: Dict[str, str]) -> List[str]:
+    """Add any of `columns` ({name: type}) missing from an existing table; returns the added names"""
+    existing = {row[1] for row in conn.execute(f"PRAGMA table_info({table})")}
+    added = []
+    for name, column_type in columns.items():
+        if name not in existing:
+            conn.execute(f"ALTER TABLE {table} ADD COLUMN {name} {column_type}")
+            added.append(name)
+    return added
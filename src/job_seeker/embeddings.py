@@ -0,0 +1,392 @@
+"""
+Semantic similarity between jobs and profiles with a local embedding index.
+
+Two CPU-only embedders are available, selected with JOB_SEEKER_EMBEDDINGS:
+- "hashing": hashed word, word-bigram and character n-gram vectors; no
+  extra dependencies, catches shared terms and word variants
+- "sentence-transformers" or "st:<model>": a small local sentence embedding
+  model (default all-MiniLM-L6-v2) that also matches paraphrases such as
+  "LLM agents" and "AI Agents"; needs the `embeddings` extra
+
+Job vectors are cached in the job_embeddings table keyed by URL, model and a
+hash of the embedded text, so only new or changed postings are embedded.
+Nearest-neighbour queries go through an in-memory random-hyperplane LSH index
+built from the cached vectors.
+"""
+import hashlib
+import math
+import os
+import re
+import zlib
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from . import metrics
+from .db import connect, get_db_path
+from .profiles import load_user_preferences
+
+DEFAULT_ST_MODEL = "all-MiniLM-L6-v2"
+# Share of the match score taken by semantic similarity (JOB_SEEKER_SEMANTIC_WEIGHT)
+DEFAULT_SEMANTIC_WEIGHT = 0.3
+
+
+class HashingEmbedder:
+    """Signed feature hashing of words, word bigrams and character 4-grams"""
+
+    def __init__(self, dim: int = 1024):
+        self.dim = dim
+        self.name = f"hashing-{dim}"
+        # Cosine range mapped onto 0-100 when scoring; hashed vectors of short
+        # texts rarely get above 0.5
+        self.similarity_range = (0.05, 0.5)
+
+    def _features(self, text: str) -> List[str]:
+        words = [word.rstrip("s") if len(word) > 3 else word
+                 for word in re.findall(r"[a-z0-9+#]+", text.lower())]
+        features = [f"w:{word}" for word in words]
+        features += [f"b:{a}_{b}" for a, b in zip(words, words[1:])]
+        for word in words:
+            padded = f"<{word}>"
+            features += [f"c:{padded[i:i + 4]}" for i in range(max(1, len(padded) - 3))]
+        return features
+
+    def embed(self, texts: List[str]) -> np.ndarray:
+        vectors = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            counts: Dict[int, float] = {}
+            for feature in self._features(text):
+                digest = zlib.crc32(feature.encode())
+                index = digest % self.dim
+                counts[index] = counts.get(index, 0.0) + (1.0 if digest & 0x80000000 else -1.0)
+            for index, value in counts.items():
+                # Sublinear term frequency, keeping the hash sign
+                vectors[row, index] = math.copysign(1 + math.log(abs(value)), value) if value else 0.0
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        return vectors / np.where(norms == 0, 1, norms)
+
+
+class SentenceTransformerEmbedder:
+    """A local sentence-transformers model, run on the CPU"""
+
+    def __init__(self, model_name: str = DEFAULT_ST_MODEL):
+        from sentence_transformers import SentenceTransformer
+
+        self.model = SentenceTransformer(model_name, device="cpu")
+        self.dim = self.model.get_sentence_embedding_dimension()
+        self.name = f"st:{model_name}"
+        self.similarity_range = (0.15, 0.65)
+
+    def embed(self, texts: List[str]) -> np.ndarray:
+        return np.asarray(self.model.encode(texts, batch_size=64, normalize_embeddings=True), dtype=np.float32)
+
+
+_embedders: Dict[str, object] = {}
+
+
+def get_embedder(spec: str = None):
+    """
+    Return the embedder for `spec` (default: JOB_SEEKER_EMBEDDINGS), or None when disabled.
+
+    Falls back to hashing when sentence-transformers is not installed.
+    """
+    spec = (spec if spec is not None else os.environ.get("JOB_SEEKER_EMBEDDINGS", "")).strip()
+    if not spec or spec.lower() in ("0", "off", "false", "no"):
+        return None
+    if spec not in _embedders:
+        if spec.lower() in ("hashing", "1", "true", "yes", "on"):
+            _embedders[spec] = HashingEmbedder()
+        else:
+            model_name = spec[3:] if spec.startswith("st:") else DEFAULT_ST_MODEL
+            try:
+                _embedders[spec] = SentenceTransformerEmbedder(model_name)
+            except ImportError:
+                print("sentence-transformers is not installed (pip install 'job_seeker[embeddings]'); "
+                      "using hashing embeddings")
+                _embedders[spec] = HashingEmbedder()
+    return _embedders[spec]
+
+
+def job_text(job: Dict) -> str:
+    """The text embedded for a job"""
+    description = job.get('full_description') or job.get('description', '')
+    return f"{job.get('title', '')}. {job.get('company', '')}. {description}"
+
+
+def profile_text(profile: Dict) -> str:
+    """The text embedded for a profile: roles, skills, interests and past responsibilities"""
+    parts = [profile.get('current_role', ''), ", ".join(profile.get('skills', []))]
+    interests = profile.get('interests')
+    if interests:
+        parts.append(", ".join(interests) if isinstance(interests, list) else str(interests))
+    else:
+        parts.append(load_user_preferences())
+    for experience in profile.get('experience', []):
+        parts.append(experience.get('title', ''))
+        parts.extend(experience.get('responsibilities', []))
+    return ". ".join(part for part in parts if part)
+
+
+def _init_embeddings(conn):
+    """Initialize the job_embeddings table"""
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS job_embeddings (
+            url TEXT NOT NULL,
+            model TEXT NOT NULL,
+            content_hash TEXT NOT NULL,
+            vector BLOB NOT NULL,
+            created_at TEXT,
+            PRIMARY KEY (url, model)
+        )
+    ''')
+
+
+def embed_jobs(jobs: List[Dict], embedder, conn=None) -> Dict[str, np.ndarray]:
+    """
+    Return {url: vector} for `jobs`, embedding only jobs whose text is new or changed.
+
+    Jobs without a URL are embedded but not cached.
+    """
+    own_conn = conn is None
+    conn = conn or connect()
+    _init_embeddings(conn)
+    try:
+        texts = {}
+        for job in jobs:
+            text = job_text(job)
+            texts[job.get('url') or text] = (text, hashlib.sha1(text.encode()).hexdigest(), bool(job.get('url')))
+
+        cached: Dict[str, Tuple[str, bytes]] = {}
+        urls = [key for key, (_, _, has_url) in texts.items() if has_url]
+        for start in range(0, len(urls), 500):
+            chunk = urls[start:start + 500]
+            marks = ", ".join("?" for _ in chunk)
+            for url, content_hash, blob in conn.execute(
+                f"SELECT url, content_hash, vector FROM job_embeddings WHERE model = ? AND url IN ({marks})",
+                [embedder.name, *chunk]
+            ):
+                cached[url] = (content_hash, blob)
+
+        vectors = {}
+        missing = []
+        for key, (text, content_hash, _) in texts.items():
+            if key in cached and cached[key][0] == content_hash:
+                vectors[key] = np.frombuffer(cached[key][1], dtype=np.float32)
+            else:
+                missing.append(key)
+
+        if missing:
+            with metrics.timer("embedding_seconds", model=embedder.name):
+                embedded = embedder.embed([texts[key][0] for key in missing])
+            now = datetime.now().isoformat()
+            rows = []
+            for key, vector in zip(missing, embedded):
+                vectors[key] = vector
+                if texts[key][2]:
+                    rows.append((key, embedder.name, texts[key][1], vector.astype(np.float32).tobytes(), now))
+            conn.executemany('''
+                INSERT INTO job_embeddings (url, model, content_hash, vector, created_at)
+                VALUES (?, ?, ?, ?, ?)
+                ON CONFLICT(url, model) DO UPDATE SET
+                    content_hash = excluded.content_hash,
+                    vector = excluded.vector,
+                    created_at = excluded.created_at
+            ''', rows)
+            conn.commit()
+        metrics.inc("embeddings_computed_total", len(missing), model=embedder.name)
+        metrics.inc("embeddings_cached_total", len(vectors) - len(missing), model=embedder.name)
+        return vectors
+    finally:
+        if own_conn:
+            conn.close()
+
+
+def _to_score(similarity: float, embedder) -> float:
+    low, high = embedder.similarity_range
+    return max(0.0, min(1.0, (similarity - low) / (high - low))) * 100
+
+
+def semantic_scores(jobs: List[Dict], profile: Dict, embedder=None) -> Optional[Dict[str, float]]:
+    """
+    Return {url: 0-100 similarity to the profile} for `jobs`, or None when embeddings are disabled
+    """
+    embedder = embedder or get_embedder()
+    if embedder is None or not jobs:
+        return None
+    vectors = embed_jobs(jobs, embedder)
+    profile_vector = embedder.embed([profile_text(profile)])[0]
+    return {key: _to_score(float(vector @ profile_vector), embedder) for key, vector in vectors.items()}
+
+
+def semantic_weight() -> float:
+    try:
+        return min(1.0, max(0.0, float(os.environ.get("JOB_SEEKER_SEMANTIC_WEIGHT", DEFAULT_SEMANTIC_WEIGHT))))
+    except ValueError:
+        return DEFAULT_SEMANTIC_WEIGHT
+
+
+class LSHIndex:
+    """
+    Approximate nearest-neighbour index over unit vectors using random hyperplanes.
+
+    Each of `tables` hash tables buckets vectors by the signs of `bits`
+    random projections; a query collects its buckets' members (and those one
+    bit away) and ranks them by exact cosine similarity.
+    """
+
+    def __init__(self, dim: int, bits: int = 12, tables: int = 8, seed: int = 7):
+        rng = np.random.default_rng(seed)
+        self.planes = rng.standard_normal((tables, dim, bits)).astype(np.float32)
+        self.weights = 1 << np.arange(bits)
+        self.buckets: List[Dict[int, List[int]]] = [{} for _ in range(tables)]
+        self.keys: List[str] = []
+        self.vectors = np.zeros((0, dim), dtype=np.float32)
+
+    def _signatures(self, vectors: np.ndarray) -> np.ndarray:
+        # (tables, n) bucket ids
+        return ((np.einsum("nd,tdb->tnb", vectors, self.planes) > 0) @ self.weights)
+
+    def add(self, keys: List[str], vectors: np.ndarray):
+        if not keys:
+            return
+        offset = len(self.keys)
+        self.keys.extend(keys)
+        self.vectors = np.vstack([self.vectors, vectors.astype(np.float32)])
+        for table, signatures in zip(self.buckets, self._signatures(vectors)):
+            for i, signature in enumerate(signatures.tolist()):
+                table.setdefault(signature, []).append(offset + i)
+
+    def query(self, vector: np.ndarray, k: int = 10, exclude: str = None) -> List[Tuple[str, float]]:
+        """Return up to `k` (key, cosine similarity) pairs, most similar first"""
+        if not self.keys:
+            return []
+        candidates = set()
+        bits = self.planes.shape[2]
+        for table, signature in zip(self.buckets, self._signatures(vector[None, :])[:, 0].tolist()):
+            candidates.update(table.get(signature, ()))
+            for bit in range(bits):
+                candidates.update(table.get(signature ^ (1 << bit), ()))
+        # Too few candidates for a full answer: fall back to an exact scan
+        if len(candidates) < k + 1:
+            candidates = range(len(self.keys))
+        candidates = np.fromiter(candidates, dtype=np.int64)
+        similarities = self.vectors[candidates] @ vector
+        order = np.argsort(-similarities)
+        results = []
+        for i in order:
+            key = self.keys[candidates[i]]
+            if key != exclude:
+                results.append((key, float(similarities[i])))
+            if len(results) == k:
+                break
+        return results
+
+
+# (db path, model) -> (index, highest job_embeddings rowid indexed, created_at of the newest row indexed)
+_indexes: Dict[Tuple[str, str], Tuple[LSHIndex, int, str]] = {}
+
+
+def get_index(embedder, conn=None) -> LSHIndex:
+    """The LSH index over cached job vectors, extended with rows added since it was built"""
+    own_conn = conn is None
+    conn = conn or connect()
+    _init_embeddings(conn)
+    try:
+        cache_key = (os.path.abspath(get_db_path()), embedder.name)
+        index, last_rowid, built_at = _indexes.get(cache_key, (None, 0, ""))
+        # Re-embedded jobs are updated in place and keep their rowid: rebuild
+        if index is not None and conn.execute(
+            "SELECT 1 FROM job_embeddings WHERE model = ? AND rowid <= ? AND created_at > ? LIMIT 1",
+            (embedder.name, last_rowid, built_at)
+        ).fetchone():
+            index = None
+        if index is None:
+            index, last_rowid, built_at = LSHIndex(embedder.dim), 0, ""
+        rows = conn.execute(
+            "SELECT rowid, url, vector, created_at FROM job_embeddings WHERE model = ? AND rowid > ? ORDER BY rowid",
+            (embedder.name, last_rowid)
+        ).fetchall()
+        if rows:
+            index.add([row[1] for row in rows], np.vstack([np.frombuffer(row[2], dtype=np.float32) for row in rows]))
+            last_rowid = rows[-1][0]
+            built_at = max(built_at, max(row[3] or "" for row in rows))
+        _indexes[cache_key] = (index, last_rowid, built_at)
+        return index
+    finally:
+        if own_conn:
+            conn.close()
+
+
+_EMBED_COLUMNS = ["url", "title", "company", "description", "full_description"]
+_RESULT_COLUMNS = ["url", "title", "company", "location", "description", "match_score"]
+
+
+def _embed_missing(conn, embedder, batch: int = 500) -> int:
+    """Embed stored jobs that have no vector for `embedder` yet, `batch` rows at a time"""
+    _init_embeddings(conn)
+    embedded = 0
+    while True:
+        # Each batch is cached before the next is selected, so the join moves on
+        rows = conn.execute(f'''
+            SELECT {", ".join("j." + column for column in _EMBED_COLUMNS)}
+            FROM job_opportunities j
+            LEFT JOIN job_embeddings e ON e.url = j.url AND e.model = ?
+            WHERE e.url IS NULL AND j.url IS NOT NULL AND j.url != ''
+            LIMIT ?
+        ''', (embedder.name, batch)).fetchall()
+        if not rows:
+            return embedded
+        embed_jobs([dict(zip(_EMBED_COLUMNS, row)) for row in rows], embedder, conn)
+        embedded += len(rows)
+
+
+def similar_jobs(query: str = None, profile: Dict = None, k: int = 10, embedder=None) -> List[Dict]:
+    """
+    Return the `k` stored jobs most similar to a stored job URL, free text, or the profile.
+
+    Stored jobs that were never embedded are embedded first; only the rows of
+    the index's candidates are then read back.
+    """
+    embedder = embedder or get_embedder() or get_embedder("hashing")
+    conn = connect()
+    try:
+        has_jobs = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'job_opportunities'"
+        ).fetchone()
+        if not has_jobs:
+            return []
+        _embed_missing(conn, embedder)
+        index = get_index(embedder, conn)
+
+        exclude = None
+        stored = conn.execute(
+            f"SELECT {', '.join(_EMBED_COLUMNS)} FROM job_opportunities WHERE url = ?", (query,)
+        ).fetchone() if query else None
+        if stored:
+            vector = embed_jobs([dict(zip(_EMBED_COLUMNS, stored))], embedder, conn)[query]
+            exclude = query
+        elif query:
+            vector = embedder.embed([query])[0]
+        else:
+            vector = embedder.embed([profile_text(profile or {})])[0]
+
+        candidates = index.query(vector, k=k * 2, exclude=exclude)
+        if not candidates:
+            return []
+        marks = ", ".join("?" for _ in candidates)
+        jobs = {row[0]: dict(zip(_RESULT_COLUMNS, row)) for row in conn.execute(
+            f"SELECT {', '.join(_RESULT_COLUMNS)} FROM job_opportunities WHERE url IN ({marks})",
+            [url for url, _ in candidates]
+        )}
+
+        results = []
+        # The index also holds vectors of jobs no longer stored; skip them
+        for url, similarity in candidates:
+            if url in jobs:
+                results.append({**jobs[url], "similarity": round(similarity, 4)})
+            if len(results) == k:
+                break
+        return results
+    finally:
+        conn.close()
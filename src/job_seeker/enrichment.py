@@ -0,0 +1,356 @@
+"""
+Job detail enrichment: fetch full job pages and extract their descriptions.
+
+Pages are fetched concurrently across domains but politely within a domain
+(one request at a time, `delay` seconds apart, robots.txt respected). Every
+response is cached in the job_pages table with its ETag/Last-Modified, so
+re-runs skip fresh pages and revalidate stale ones with a conditional GET.
+"""
+import hashlib
+import json
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Dict, List, Optional
+from urllib.parse import urlparse
+from urllib.robotparser import RobotFileParser
+
+from . import metrics
+from .db import connect
+
+USER_AGENT = "job_seeker/0.1 (+https://github.com/netors/job_seeker)"
+MAX_DESCRIPTION_CHARS = 20000
+
+# Elements that never hold the job description
+_NOISE_TAGS = ["script", "style", "noscript", "nav", "header", "footer", "aside", "form", "svg", "iframe"]
+# id/class fragments used by common job boards for the description container
+_DESCRIPTION_HINTS = ["jobdescription", "job-description", "job_description", "description__text",
+                      "jobsearch-jobdescriptiontext", "posting-description", "job-details", "description"]
+
+
+def _init_pages_table(conn):
+    """Initialize the job_pages cache table"""
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS job_pages (
+            url TEXT PRIMARY KEY,
+            status_code INTEGER,
+            etag TEXT,
+            last_modified TEXT,
+            content_hash TEXT,
+            full_description TEXT,
+            fetched_at REAL,
+            error TEXT
+        )
+    ''')
+
+
+def _normalize_text(text: str) -> str:
+    text = re.sub(r"[ \t\r\f\v]+", " ", text)
+    text = re.sub(r"\s*\n\s*", "\n", text)
+    return text.strip()[:MAX_DESCRIPTION_CHARS]
+
+
+def _element_text(element) -> str:
+    """text_content() with line breaks after block elements, so paragraphs do not run together"""
+    for block in element.iter("p", "div", "li", "br", "tr", "section", "h1", "h2", "h3", "h4", "h5", "h6"):
+        block.tail = "\n" + (block.tail or "")
+    return _normalize_text(element.text_content())
+
+
+def _html_to_text(fragment: str) -> str:
+    import lxml.html
+
+    if "<" not in fragment:
+        return _normalize_text(fragment)
+    return _element_text(lxml.html.fromstring(f"<div>{fragment}</div>"))
+
+
+def _json_ld_description(tree) -> Optional[str]:
+    """Return the description of a schema.org JobPosting embedded as JSON-LD"""
+    for script in tree.xpath('//script[@type="application/ld+json"]'):
+        try:
+            data = json.loads(script.text_content())
+        except (json.JSONDecodeError, ValueError):
+            continue
+        candidates = data if isinstance(data, list) else data.get("@graph", [data]) if isinstance(data, dict) else []
+        for item in candidates:
+            if isinstance(item, dict) and item.get("@type") == "JobPosting" and item.get("description"):
+                return _html_to_text(item["description"])
+    return None
+
+
+def extract_description(html: str) -> str:
+    """
+    Extract the job description text from a job page.
+
+    Preference order: schema.org JobPosting JSON-LD, a container whose id or
+    class looks like a description, <main>/<article>, then the whole body
+    with navigation and scripts stripped.
+    """
+    import lxml.html
+
+    if not html or not html.strip():
+        return ""
+    tree = lxml.html.fromstring(html)
+
+    description = _json_ld_description(tree)
+    if description:
+        return description
+
+    for element in tree.xpath("|".join(f"//{tag}" for tag in _NOISE_TAGS)):
+        element.drop_tree()
+
+    for hint in _DESCRIPTION_HINTS:
+        matches = tree.xpath(
+            "//*[contains(translate(@id, 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz'), $hint)"
+            " or contains(translate(@class, 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz'), $hint)]",
+            hint=hint,
+        )
+        texts = [_element_text(match) for match in matches]
+        texts = [text for text in texts if len(text) > 200]
+        if texts:
+            return max(texts, key=len)
+
+    for tag in ("main", "article"):
+        matches = tree.xpath(f"//{tag}")
+        if matches:
+            return _element_text(matches[0])
+
+    body = tree.find("body")
+    return _element_text(body if body is not None else tree)
+
+
+def interleave_domains(urls: List[str]) -> List[str]:
+    """Order urls round-robin by domain so workers are not all queued on one host's throttle"""
+    by_domain: Dict[str, List[str]] = {}
+    for url in urls:
+        by_domain.setdefault(urlparse(url).netloc, []).append(url)
+    ordered = []
+    while any(by_domain.values()):
+        for domain in list(by_domain):
+            if by_domain[domain]:
+                ordered.append(by_domain[domain].pop(0))
+    return ordered
+
+
+class DomainThrottle:
+    """Serialize requests per domain and space them `delay` seconds apart"""
+
+    def __init__(self, delay: float = 1.0):
+        self.delay = delay
+        self._locks: Dict[str, threading.Lock] = {}
+        self._last_request: Dict[str, float] = {}
+        self._guard = threading.Lock()
+
+    def acquire(self, domain: str) -> threading.Lock:
+        with self._guard:
+            lock = self._locks.setdefault(domain, threading.Lock())
+        lock.acquire()
+        wait = self._last_request.get(domain, 0) + self.delay - time.monotonic()
+        if wait > 0:
+            time.sleep(wait)
+        return lock
+
+    def release(self, domain: str, lock: threading.Lock):
+        self._last_request[domain] = time.monotonic()
+        lock.release()
+
+
+class PageFetcher:
+    """Concurrent, polite, cache-aware fetcher of job pages"""
+
+    def __init__(self, workers: int = 8, delay: float = 1.0, timeout: float = 15,
+                 max_age_days: float = 7, respect_robots: bool = True):
+        self.workers = max(1, workers)
+        self.timeout = timeout
+        self.max_age_seconds = max_age_days * 86400
+        self.respect_robots = respect_robots
+        self.throttle = DomainThrottle(delay)
+        self._local = threading.local()
+        self._robots: Dict[str, Optional[RobotFileParser]] = {}
+        self._robots_lock = threading.Lock()
+
+    def _session(self):
+        if not hasattr(self._local, "session"):
+            import requests
+
+            self._local.session = requests.Session()
+            self._local.session.headers["User-Agent"] = USER_AGENT
+        return self._local.session
+
+    def _allowed(self, url: str) -> bool:
+        if not self.respect_robots:
+            return True
+        parsed = urlparse(url)
+        origin = f"{parsed.scheme}://{parsed.netloc}"
+        with self._robots_lock:
+            known = origin in self._robots
+            parser = self._robots.get(origin)
+        if not known:
+            parser = RobotFileParser()
+            try:
+                response = self._session().get(f"{origin}/robots.txt", timeout=self.timeout)
+                parser.parse(response.text.splitlines() if response.status_code == 200 else [])
+            except Exception:
+                parser = None  # Unreachable robots.txt: treat as allowed
+            with self._robots_lock:
+                self._robots[origin] = parser
+        return parser is None or parser.can_fetch(USER_AGENT, url)
+
+    def fetch(self, url: str, cached: Optional[Dict] = None) -> Dict:
+        """Fetch one page, revalidating `cached` (a job_pages row) when present"""
+        record = {"url": url, "fetched_at": time.time(), "error": None}
+        domain = urlparse(url).netloc
+        if not self._allowed(url):
+            metrics.inc("enrich_pages_total", outcome="robots_disallowed")
+            return {**record, "status_code": None, "error": "Disallowed by robots.txt"}
+
+        headers = {}
+        if cached and cached.get("full_description"):
+            if cached.get("etag"):
+                headers["If-None-Match"] = cached["etag"]
+            if cached.get("last_modified"):
+                headers["If-Modified-Since"] = cached["last_modified"]
+
+        lock = self.throttle.acquire(domain)
+        try:
+            with metrics.timer("enrich_fetch_seconds", domain=domain):
+                response = self._session().get(url, headers=headers, timeout=self.timeout)
+        except Exception as e:
+            metrics.inc("enrich_pages_total", outcome="error")
+            return {**record, "status_code": None, "error": str(e)}
+        finally:
+            self.throttle.release(domain, lock)
+
+        record["status_code"] = response.status_code
+        if response.status_code == 304 and cached:
+            metrics.inc("enrich_pages_total", outcome="not_modified")
+            return {**cached, **record, "status_code": 304}
+        if response.status_code != 200:
+            metrics.inc("enrich_pages_total", outcome="http_error")
+            return {**record, "error": f"HTTP {response.status_code}"}
+
+        metrics.inc("enrich_pages_total", outcome="fetched")
+        return {
+            **record,
+            "etag": response.headers.get("ETag"),
+            "last_modified": response.headers.get("Last-Modified"),
+            "content_hash": hashlib.sha256(response.content).hexdigest(),
+            "full_description": extract_description(response.text),
+        }
+
+    def fetch_many(self, urls: List[str], cache: Dict[str, Dict]) -> List[Dict]:
+        """Fetch `urls` concurrently; `cache` maps url -> job_pages row"""
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="enrich") as executor:
+            return list(executor.map(lambda url: self.fetch(url, cache.get(url)), interleave_domains(urls)))
+
+    def is_fresh(self, cached: Optional[Dict]) -> bool:
+        return bool(cached and cached.get("fetched_at")
+                    and time.time() - cached["fetched_at"] < self.max_age_seconds
+                    and not cached.get("error"))
+
+
+def _load_cache(conn, urls: List[str]) -> Dict[str, Dict]:
+    cache = {}
+    for start in range(0, len(urls), 500):
+        chunk = urls[start:start + 500]
+        placeholders = ", ".join("?" for _ in chunk)
+        cursor = conn.execute(f"SELECT * FROM job_pages WHERE url IN ({placeholders})", chunk)
+        columns = [d[0] for d in cursor.description]
+        cache.update({row[0]: dict(zip(columns, row)) for row in cursor.fetchall()})
+    return cache
+
+
+def _save_pages(conn, pages: List[Dict]):
+    conn.executemany('''
+        INSERT INTO job_pages (url, status_code, etag, last_modified, content_hash, full_description, fetched_at, error)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        ON CONFLICT(url) DO UPDATE SET
+            status_code = excluded.status_code,
+            etag = COALESCE(excluded.etag, job_pages.etag),
+            last_modified = COALESCE(excluded.last_modified, job_pages.last_modified),
+            content_hash = COALESCE(excluded.content_hash, job_pages.content_hash),
+            full_description = COALESCE(excluded.full_description, job_pages.full_description),
+            fetched_at = excluded.fetched_at,
+            error = excluded.error
+    ''', [
+        (p["url"], p.get("status_code"), p.get("etag"), p.get("last_modified"), p.get("content_hash"),
+         p.get("full_description"), p["fetched_at"], p.get("error"))
+        for p in pages
+    ])
+    has_jobs_table = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'job_opportunities'"
+    ).fetchone()
+    if has_jobs_table:
+        conn.executemany(
+            "UPDATE job_opportunities SET full_description = ? WHERE url = ?",
+            [(p["full_description"], p["url"]) for p in pages if p.get("full_description")]
+        )
+
+
+def enrich_jobs(jobs: List[Dict], fetcher: PageFetcher = None) -> List[Dict]:
+    """
+    Attach `full_description` to each job dict, fetching only stale or unseen pages.
+
+    Returns the same list, with descriptions filled in where a page could be
+    fetched (or was already cached).
+    """
+    fetcher = fetcher or PageFetcher()
+    urls = list(dict.fromkeys(job["url"] for job in jobs if job.get("url", "").startswith(("http://", "https://"))))
+
+    conn = connect()
+    _init_pages_table(conn)
+    cache = _load_cache(conn, urls)
+    stale = [url for url in urls if not fetcher.is_fresh(cache.get(url))]
+    metrics.inc("enrich_pages_cached_total", len(urls) - len(stale))
+
+    pages = fetcher.fetch_many(stale, cache) if stale else []
+    _save_pages(conn, pages)
+    conn.commit()
+    conn.close()
+
+    descriptions = {url: row.get("full_description") for url, row in cache.items()}
+    descriptions.update({page["url"]: page.get("full_description") or descriptions.get(page["url"]) for page in pages})
+    for job in jobs:
+        if descriptions.get(job.get("url")):
+            job["full_description"] = descriptions[job["url"]]
+    return jobs
+
+
+def enrich_stored_jobs(limit: int = None, fetcher: PageFetcher = None) -> Dict:
+    """Enrich jobs already in job_opportunities; returns counts for reporting"""
+    # tools imports this module at load time, so import it here
+    from .tools.job_search_tools import _init_database
+
+    fetcher = fetcher or PageFetcher()
+    # A fresh database, or one from before the lifecycle columns
+    _init_database()
+    conn = connect()
+    _init_pages_table(conn)
+    query = '''
+        SELECT o.url, p.fetched_at, p.error FROM job_opportunities o
+        LEFT JOIN job_pages p ON p.url = o.url
+        WHERE o.url LIKE 'http%'
+        ORDER BY o.match_score DESC
+    '''
+    rows = conn.execute(query).fetchall()
+    conn.close()
+
+    stale = [
+        {"url": url} for url, fetched_at, error in rows
+        if not fetcher.is_fresh({"fetched_at": fetched_at, "error": error} if fetched_at else None)
+    ]
+    if limit:
+        stale = stale[:limit]
+
+    started = time.perf_counter()
+    enriched = enrich_jobs(stale, fetcher)
+    return {
+        "total": len(rows),
+        "fetched": len(stale),
+        "enriched": sum(1 for job in enriched if job.get("full_description")),
+        "seconds": time.perf_counter() - started,
+        "finished_at": datetime.now().isoformat(),
+    }
@@ -0,0 +1,165 @@
+"""
+Export the job history to columnar files for analysis outside SQLite.
+
+Rows from job_opportunities and the archive are read in id-ordered chunks and
+written as Hive-style date partitions (date=YYYY-MM-DD, by the day a posting
+was first seen), one file per chunk and day. Files are Parquet when pyarrow is
+installed (pip install 'job_seeker[export]') and gzip-compressed CSV
+otherwise. Salaries are parsed into numeric bounds and skills extracted from
+the descriptions at export time, so analytics.py only has to read columns.
+"""
+import csv
+import gzip
+import os
+import re
+import shutil
+import time
+from typing import Dict, Iterator, List
+
+from .db import connect
+from .profiles import salary_bounds
+
+DEFAULT_EXPORT_DIR = "job_exports"
+# Rows read from SQLite and written per file
+DEFAULT_CHUNK_ROWS = 50_000
+
+# Column name -> type; descriptions are left out to keep the files small
+EXPORT_COLUMNS = {
+    "id": "int64",
+    "title": "string",
+    "company": "string",
+    "location": "string",
+    "site": "string",
+    "job_type": "string",
+    "salary_min": "int64",
+    "salary_max": "int64",
+    "match_score": "float64",
+    "status": "string",
+    "archived": "bool",
+    "first_seen": "string",
+    "last_seen": "string",
+    "posted_date": "string",
+    "url": "string",
+    # Skill taxonomy ids mentioned in the description, "|"-separated
+    "skills": "string",
+}
+
+_PARTITION = re.compile(r"^date=(\d{4}-\d{2}-\d{2}|unknown)$")
+
+
+def parquet_available() -> bool:
+    try:
+        import pyarrow  # noqa: F401
+        import pyarrow.parquet  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def _source_rows(conn, table: str, archived: bool, chunk_rows: int) -> Iterator[List[Dict]]:
+    """Chunks of export rows from one table, keyset-paginated by id"""
+    from .tools.job_search_tools import _extract_skills
+
+    after = 0
+    while True:
+        rows = conn.execute(f'''
+            SELECT id, title, company, location, site, job_type, salary_range, match_score, status,
+                   COALESCE(first_seen, created_at), last_seen, posted_date, url,
+                   COALESCE(full_description, description, '')
+            FROM {table} WHERE id > ? ORDER BY id LIMIT ?
+        ''', (after, chunk_rows)).fetchall()
+        if not rows:
+            return
+        after = rows[-1][0]
+        chunk = []
+        for (job_id, title, company, location, site, job_type, salary_range, match_score, status,
+             first_seen, last_seen, posted_date, url, description) in rows:
+            salary_min, salary_max = salary_bounds(salary_range)
+            chunk.append({
+                "id": job_id, "title": title or "", "company": company or "", "location": location or "",
+                "site": site or "", "job_type": job_type or "", "salary_min": salary_min,
+                "salary_max": salary_max, "match_score": float(match_score or 0.0),
+                "status": status or "active", "archived": archived, "first_seen": first_seen or "",
+                "last_seen": last_seen or "", "posted_date": posted_date or "", "url": url or "",
+                "skills": "|".join(_extract_skills(description)),
+            })
+        yield chunk
+
+
+def _write_parquet(path: str, rows: List[Dict]):
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    types = {"string": pa.string(), "int64": pa.int64(), "float64": pa.float64(), "bool": pa.bool_()}
+    schema = pa.schema([(name, types[kind]) for name, kind in EXPORT_COLUMNS.items()])
+    columns = {name: [row[name] for row in rows] for name in EXPORT_COLUMNS}
+    pq.write_table(pa.Table.from_pydict(columns, schema=schema), path, compression="zstd")
+
+
+def _write_csv(path: str, rows: List[Dict]):
+    with gzip.open(path, "wt", newline="", compresslevel=6) as f:
+        writer = csv.DictWriter(f, fieldnames=list(EXPORT_COLUMNS))
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+def _table_exists(conn, table: str) -> bool:
+    return conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (table,)
+    ).fetchone() is not None
+
+
+def export_jobs(output_dir: str = DEFAULT_EXPORT_DIR, file_format: str = "auto",
+                chunk_rows: int = DEFAULT_CHUNK_ROWS, include_archive: bool = True) -> Dict:
+    """
+    Write the job history to date-partitioned columnar files under `output_dir`.
+
+    `file_format` is "parquet", "csv" or "auto" (Parquet when pyarrow is
+    installed). Partitions from a previous export are replaced. Returns counts
+    for reporting.
+    """
+    from .lifecycle import ARCHIVE_TABLE
+
+    if file_format == "auto":
+        file_format = "parquet" if parquet_available() else "csv"
+    if file_format == "parquet" and not parquet_available():
+        raise ValueError("Parquet export needs pyarrow: pip install 'job_seeker[export]'")
+    if file_format not in ("parquet", "csv"):
+        raise ValueError(f"Unknown export format: {file_format}")
+    write, extension = (_write_parquet, ".parquet") if file_format == "parquet" else (_write_csv, ".csv.gz")
+
+    # Replace the previous export's partitions, leaving anything else in the directory alone
+    os.makedirs(output_dir, exist_ok=True)
+    for name in os.listdir(output_dir):
+        if _PARTITION.match(name):
+            shutil.rmtree(os.path.join(output_dir, name))
+
+    started = time.perf_counter()
+    counts = {"rows": 0, "files": 0, "partitions": set(), "format": file_format}
+    sequence = 0
+    conn = connect()
+    try:
+        tables = [("job_opportunities", False)]
+        if include_archive:
+            tables.append((ARCHIVE_TABLE, True))
+        for table, archived in tables:
+            if not _table_exists(conn, table):
+                continue
+            for chunk in _source_rows(conn, table, archived, chunk_rows):
+                partitions: Dict[str, List[Dict]] = {}
+                for row in chunk:
+                    partitions.setdefault(row["first_seen"][:10] or "unknown", []).append(row)
+                for day, rows in sorted(partitions.items()):
+                    directory = os.path.join(output_dir, f"date={day}")
+                    os.makedirs(directory, exist_ok=True)
+                    write(os.path.join(directory, f"part-{sequence:05d}{extension}"), rows)
+                    sequence += 1
+                    counts["files"] += 1
+                    counts["partitions"].add(day)
+                counts["rows"] += len(chunk)
+    finally:
+        conn.close()
+
+    counts["partitions"] = len(counts["partitions"])
+    counts["seconds"] = time.perf_counter() - started
+    return counts
@@ -0,0 +1,251 @@
+"""
+Posting lifecycle: liveness checks, expiry and archival of stored jobs.
+
+Every stored job carries first_seen, last_seen (updated whenever a search
+finds it again) and a status. The liveness checker probes active postings
+with HEAD requests, falling back to a partial GET (scanned for "no longer
+available" notices) when HEAD is refused, and expires postings that are gone. Only a
+definitive answer (404/410 or an expired notice) expires a posting: timeouts,
+5xx and bot blocks (403, LinkedIn's 999) say nothing about the posting, so
+they only count towards check_failures and back off its next check. Results
+are cached through last_checked, so a posting is probed at most once per
+recheck window. Archiving moves expired and long-unseen postings out of
+job_opportunities so the hot table stays small.
+"""
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+from urllib.parse import urlparse
+
+from . import metrics
+from .db import connect, ensure_columns, get_db_path
+from .enrichment import USER_AGENT, DomainThrottle, interleave_domains
+
+# Responses that mean the posting is gone
+DEAD_STATUS_CODES = {404, 410}
+# HEAD refused or unsupported: retry with GET
+HEAD_FALLBACK_STATUS_CODES = {403, 405, 501}
+# Phrases job boards show on filled or withdrawn postings that still answer 200
+EXPIRED_MARKERS = (
+    "no longer accepting applications",
+    "job is no longer available",
+    "this job has expired",
+    "position has been filled",
+    "job posting has expired",
+)
+# Bytes of a GET response scanned for EXPIRED_MARKERS
+MARKER_SCAN_BYTES = 64 * 1024
+
+ARCHIVE_TABLE = "job_opportunities_archive"
+
+
+class LivenessChecker:
+    """Concurrent, polite HEAD/GET prober for job posting URLs"""
+
+    def __init__(self, workers: int = 16, delay: float = 0.5, timeout: float = 10,
+                 recheck_hours: float = 24, max_failures: int = 3, backoff_hours: float = 7 * 24):
+        self.workers = max(1, workers)
+        self.timeout = timeout
+        self.recheck_hours = recheck_hours
+        # Consecutive inconclusive checks (timeouts, 5xx, bot blocks) after which a
+        # posting is only rechecked every `backoff_hours`; it is never expired for them
+        self.max_failures = max_failures
+        self.backoff_hours = backoff_hours
+        self.throttle = DomainThrottle(delay)
+        self._local = threading.local()
+
+    def _session(self):
+        if not hasattr(self._local, "session"):
+            import requests
+
+            self._local.session = requests.Session()
+            self._local.session.headers["User-Agent"] = USER_AGENT
+        return self._local.session
+
+    def check(self, url: str) -> Dict:
+        """
+        Probe one URL.
+
+        Returns {"url", "alive", "status_code", "error"} where alive is True,
+        False (gone) or None (inconclusive).
+        """
+        domain = urlparse(url).netloc
+        lock = self.throttle.acquire(domain)
+        try:
+            session = self._session()
+            response = session.head(url, timeout=self.timeout, allow_redirects=True)
+            if response.status_code in HEAD_FALLBACK_STATUS_CODES:
+                response = session.get(url, timeout=self.timeout, allow_redirects=True, stream=True)
+                try:
+                    if response.status_code == 200:
+                        head = next(response.iter_content(MARKER_SCAN_BYTES), b"")
+                        text = head.decode(response.encoding or "utf-8", errors="ignore").lower()
+                        if any(marker in text for marker in EXPIRED_MARKERS):
+                            metrics.inc("liveness_checks_total", outcome="dead")
+                            return {"url": url, "alive": False, "status_code": 200, "error": None}
+                finally:
+                    response.close()
+        except Exception as e:
+            metrics.inc("liveness_checks_total", outcome="error")
+            return {"url": url, "alive": None, "status_code": None, "error": f"{type(e).__name__}: {e}"}
+        finally:
+            self.throttle.release(domain, lock)
+
+        if response.status_code in DEAD_STATUS_CODES:
+            alive = False
+        elif response.status_code < 400:
+            alive = True
+        else:
+            alive = None
+        metrics.inc("liveness_checks_total", outcome={True: "alive", False: "dead", None: "error"}[alive])
+        return {"url": url, "alive": alive, "status_code": response.status_code,
+                "error": None if alive is not None else f"HTTP {response.status_code}"}
+
+    def check_many(self, urls: List[str]) -> List[Dict]:
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="liveness") as executor:
+            return list(executor.map(self.check, interleave_domains(urls)))
+
+
+def check_stored_jobs(checker: LivenessChecker = None, limit: int = None) -> Dict:
+    """
+    Probe active stored postings not checked within the recheck window and expire dead ones.
+
+    Returns counts for reporting.
+    """
+    checker = checker or LivenessChecker()
+    now = datetime.now()
+    cutoff = (now - timedelta(hours=checker.recheck_hours)).isoformat()
+    backoff_cutoff = (now - timedelta(hours=checker.backoff_hours)).isoformat()
+
+    conn = connect()
+    try:
+        # No jobs stored yet, or a table from before lifecycle tracking
+        if "status" not in _table_columns(conn, "job_opportunities"):
+            return {"checked": 0, "alive": 0, "dead": 0, "inconclusive": 0, "expired": 0,
+                    "backed_off": 0, "seconds": 0.0}
+        query = '''
+            SELECT url FROM job_opportunities
+            WHERE status = 'active' AND url LIKE 'http%'
+              AND (last_checked IS NULL
+                   OR (last_checked < ? AND COALESCE(check_failures, 0) < ?)
+                   OR last_checked < ?)
+            ORDER BY last_checked IS NOT NULL, last_checked
+        '''
+        params = [cutoff, checker.max_failures, backoff_cutoff]
+        if limit:
+            query += " LIMIT ?"
+            params.append(limit)
+        urls = [row[0] for row in conn.execute(query, params)]
+    finally:
+        conn.close()
+
+    started = time.perf_counter()
+    results = checker.check_many(urls)
+    checked_at = datetime.now().isoformat()
+
+    conn = connect()
+    try:
+        alive = [(checked_at, r["url"]) for r in results if r["alive"]]
+        dead = [(checked_at, r["url"]) for r in results if r["alive"] is False]
+        inconclusive = [(checked_at, r["url"]) for r in results if r["alive"] is None]
+        conn.executemany(
+            "UPDATE job_opportunities SET last_checked = ?, check_failures = 0 WHERE url = ?", alive
+        )
+        conn.executemany(
+            "UPDATE job_opportunities SET last_checked = ?, status = 'expired' WHERE url = ?", dead
+        )
+        # Inconclusive: the posting stays active; repeated failures only back off its next check
+        conn.executemany(
+            "UPDATE job_opportunities SET last_checked = ?, check_failures = COALESCE(check_failures, 0) + 1 "
+            "WHERE url = ?", inconclusive
+        )
+        conn.commit()
+        backed_off = conn.execute(
+            "SELECT COUNT(*) FROM job_opportunities WHERE last_checked = ? AND check_failures >= ?",
+            (checked_at, checker.max_failures)
+        ).fetchone()[0] if inconclusive else 0
+    finally:
+        conn.close()
+
+    metrics.inc("jobs_expired_total", len(dead))
+    return {
+        "checked": len(results),
+        "alive": len(alive),
+        "dead": len(dead),
+        "inconclusive": len(inconclusive),
+        "expired": len(dead),
+        # Postings now rechecked only every backoff_hours
+        "backed_off": backed_off,
+        "seconds": time.perf_counter() - started,
+    }
+
+
+def _table_columns(conn, table: str) -> Dict[str, str]:
+    return {row[1]: row[2] or "TEXT" for row in conn.execute(f"PRAGMA table_info({table})")}
+
+
+def archive_jobs(stale_days: float = 60, compact: bool = True) -> Dict:
+    """
+    Move expired postings, and active ones not seen for `stale_days` that
+    were never applied to, into job_opportunities_archive.
+
+    With `compact`, the database is vacuumed afterwards to return the freed
+    pages to the filesystem; VACUUM needs exclusive access for its duration.
+    """
+    cutoff = (datetime.now() - timedelta(days=stale_days)).isoformat()
+    db_path = get_db_path()
+    size_before = os.path.getsize(db_path) if os.path.exists(db_path) else 0
+
+    conn = connect()
+    try:
+        columns = _table_columns(conn, "job_opportunities")
+        if not columns:
+            return {"archived": 0, "remaining": 0, "size_before": size_before, "size_after": size_before}
+        conn.execute(
+            f"CREATE TABLE IF NOT EXISTS {ARCHIVE_TABLE} AS SELECT * FROM job_opportunities WHERE 0"
+        )
+        # The hot table gains columns over time; keep the archive in step
+        ensure_columns(conn, ARCHIVE_TABLE, {**columns, "archived_at": "TEXT"})
+        names = ", ".join(columns)
+        where = '''
+            status = 'expired'
+            OR (COALESCE(last_seen, created_at) < ? AND NOT COALESCE(applied, 0))
+        '''
+        conn.execute("BEGIN IMMEDIATE")
+        conn.execute(
+            f"INSERT INTO {ARCHIVE_TABLE} ({names}, archived_at) "
+            f"SELECT {names}, ? FROM job_opportunities WHERE {where}",
+            (datetime.now().isoformat(), cutoff)
+        )
+        archived = conn.execute(f"DELETE FROM job_opportunities WHERE {where}", (cutoff,)).rowcount
+        conn.commit()
+        remaining = conn.execute("SELECT COUNT(*) FROM job_opportunities").fetchone()[0]
+
+        if compact and archived:
+            conn.execute("VACUUM")
+            # In WAL mode the rewritten pages land in the WAL until a checkpoint
+            conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+    finally:
+        conn.close()
+
+    metrics.inc("jobs_archived_total", archived)
+    return {
+        "archived": archived,
+        "remaining": remaining,
+        "size_before": size_before,
+        "size_after": os.path.getsize(db_path) if os.path.exists(db_path) else 0,
+    }
+
+
+def status_counts() -> Optional[Dict]:
+    """Counts of stored postings per status, or None without a jobs table"""
+    conn = connect()
+    try:
+        if not _table_columns(conn, "job_opportunities"):
+            return None
+        return dict(conn.execute("SELECT status, COUNT(*) FROM job_opportunities GROUP BY status").fetchall())
+    finally:
+        conn.close()
@@ -5,7 +5,7 @@ import json
 import os
 from datetime import datetime
 
-from job_seeker.crew import JobSeeker
+from job_seeker.profiles import DEFAULT_PROFILE_PATH
 
 warnings.filterwarnings("ignore", category=SyntaxWarning, module="pysbd")
 
@@ -13,11 +13,18 @@ warnings.filterwarnings("ignore", category=SyntaxWarning, module="pysbd")
 # crew locally, so refrain from adding unnecessary logic into this file.
 # Replace with inputs you want to test with, it will automatically
 # interpolate any tasks and agents information
+#
+# Keep module-level imports lightweight: commands that need the crew import
+# JobSeeker themselves, so help, view_results and update_profile start
+# without loading crewai. `python -m job_seeker.benchmarks.import_time`
+# guards this.
 
 def run():
     """
     Run the job search crew.
     """
+    from job_seeker.crew import JobSeeker
+
     print("🚀 Starting AI-Powered Job Search System")
     print("=" * 50)
     
@@ -83,6 +90,8 @@ def search_custom():
         print("Example: python main.py search_custom '{\"job_sites\": [\"indeed.com\"], \"search_query\": \"AI Engineer\"}'")
         return
     
+    from job_seeker.crew import JobSeeker
+
     try:
         custom_params = json.loads(sys.argv[1])
         job_seeker = JobSeeker()
@@ -101,7 +110,7 @@ def search_custom():
         print(f"🔍 Custom search: {custom_params.get('search_query', 'Default')}")
         print(f"🌐 Target sites: {', '.join(job_sites) if job_sites else 'Default'}")
         
-        result = job_seeker.run_job_search(user_profile, job_sites)
+        result = job_seeker.run_job_search(user_profile, job_sites, search_query=custom_params.get('search_query'))
         return result
         
     except json.JSONDecodeError:
@@ -117,7 +126,7 @@ def update_profile():
     print("📝 Profile Update Tool")
     print("=" * 30)
     
-    profile_path = os.path.join(os.path.dirname(__file__), '..', 'knowledge', 'resume_template.json')
+    profile_path = os.path.abspath(DEFAULT_PROFILE_PATH)
     
     if not os.path.exists(profile_path):
         print(f"❌ Profile file not found at {profile_path}")
@@ -174,6 +183,8 @@ def train():
     """
     Train the crew for a given number of iterations.
     """
+    from job_seeker.crew import JobSeeker
+
     print("🏋️ Training Job Search Crew")
     print("=" * 30)
     
@@ -188,7 +199,8 @@ def train():
     inputs = {
         'user_profile': json.dumps(user_profile),
         'job_sites': ["indeed.com", "linkedin.com/jobs", "glassdoor.com"],
-        'search_query': f"{user_profile.get('current_role', 'Software Engineer')}"
+        'search_query': f"{user_profile.get('current_role', 'Software Engineer')}",
+        'output_dir': '.',
     }
     
     try:
@@ -215,6 +227,8 @@ def replay():
         print("Usage: python main.py replay <task_id>")
         return
     
+    from job_seeker.crew import JobSeeker
+
     try:
         task_id = sys.argv[1]
         print(f"🔄 Replaying task: {task_id}")
@@ -226,10 +240,52 @@ def replay():
         raise Exception(f"An error occurred while replaying the crew: {e}")
 
 
+def resume():
+    """
+    Resume a failed or interrupted run, re-running only stages without a valid checkpoint.
+    Usage: python main.py resume [run_id] [profile_path]
+    """
+    from job_seeker import checkpoints
+
+    args = _command_args("resume")
+    if not args:
+        runs = checkpoints.list_runs()
+        if not runs:
+            print("No checkpointed runs found. Run a job search first.")
+            return
+        print("⏯️  Recent runs")
+        print("=" * 30)
+        for run in runs:
+            print(f"{run['run_id']}  {run['status']:<8} {run['updated_at'][:19]}  "
+                  f"done: {run['completed_stages'] or '-'}")
+        print("Usage: python main.py resume <run_id> [profile_path]")
+        return
+
+    from job_seeker.crew import JobSeeker
+    from job_seeker.profiles import load_user_profile
+
+    run_id = args[0]
+    user_profile = None
+    if len(args) > 1:
+        user_profile = load_user_profile(args[1])
+        if not user_profile:
+            print(f"❌ No usable profile at {args[1]}")
+            return
+
+    print(f"⏯️  Resuming run {run_id}")
+    try:
+        JobSeeker().resume_job_search(run_id, user_profile)
+    except Exception as e:
+        print(f"❌ Resume failed: {e}")
+        raise Exception(f"An error occurred while resuming the run: {e}")
+
+
 def test():
     """
     Test the crew execution and returns the results.
     """
+    from job_seeker.crew import JobSeeker
+
     print("🧪 Testing Job Search Crew")
     print("=" * 30)
     
@@ -244,7 +300,8 @@ def test():
     inputs = {
         'user_profile': json.dumps(user_profile),
         'job_sites': ["indeed.com", "linkedin.com/jobs"],
-        'search_query': f"{user_profile.get('current_role', 'Software Engineer')}"
+        'search_query': f"{user_profile.get('current_role', 'Software Engineer')}",
+        'output_dir': '.',
     }
     
     try:
@@ -262,6 +319,454 @@ def test():
         raise Exception(f"An error occurred while testing the crew: {e}")
 
 
+def _command_args(command: str) -> list:
+    """Return the arguments following `command`, whether invoked via main.py or a script entry point"""
+    if len(sys.argv) > 1 and sys.argv[1] == command:
+        return sys.argv[2:]
+    return sys.argv[1:]
+
+
+def serve():
+    """
+    Run the search daemon, processing queued searches until interrupted.
+    Usage: python main.py serve [concurrency] [poll_seconds] [liveness_hours]
+    """
+    from job_seeker.daemon import SearchDaemon, SearchQueue
+
+    args = _command_args("serve")
+    try:
+        concurrency = int(args[0]) if len(args) > 0 else 2
+        poll_interval = float(args[1]) if len(args) > 1 else 5.0
+        liveness_hours = float(args[2]) if len(args) > 2 else 0
+    except ValueError:
+        print("❌ Usage: python main.py serve [concurrency] [poll_seconds] [liveness_hours]")
+        return
+
+    print("🛰️  Starting Job Search Daemon")
+    print("=" * 30)
+    SearchDaemon(SearchQueue(), concurrency=concurrency, poll_interval=poll_interval,
+                 liveness_interval=liveness_hours * 3600).serve_forever()
+
+
+def enqueue():
+    """
+    Queue a search job for the daemon.
+    Usage: python main.py enqueue '{"profile": "knowledge/resume_template.json", "job_sites": ["indeed.com"], "search_query": "AI Engineer", "priority": 5, "interval_seconds": 86400}'
+    """
+    from job_seeker.daemon import SearchQueue
+
+    args = _command_args("enqueue")
+    try:
+        params = json.loads(args[0]) if args else {}
+    except json.JSONDecodeError:
+        print("❌ Invalid JSON format for job parameters")
+        return
+
+    profile_path = params.get('profile', DEFAULT_PROFILE_PATH)
+    if not os.path.exists(profile_path):
+        print(f"❌ Profile file not found at {profile_path}")
+        return
+
+    queue = SearchQueue()
+    job_id = queue.enqueue(
+        profile_path,
+        sites=params.get('job_sites'),
+        query=params.get('search_query'),
+        priority=int(params.get('priority', 0)),
+        interval_seconds=params.get('interval_seconds'),
+    )
+    queue.close()
+    print(f"📥 Queued job {job_id} ({params.get('search_query', 'profile default')})")
+
+
+def queue_status():
+    """
+    Show the status of every job in the daemon queue.
+    """
+    from job_seeker.daemon import SearchQueue
+
+    queue = SearchQueue()
+    jobs = queue.jobs()
+    queue.close()
+
+    print("📋 Search Queue")
+    print("=" * 30)
+    if not jobs:
+        print("Queue is empty")
+        return
+
+    icons = {'pending': '⏳', 'running': '▶️ ', 'done': '✅', 'failed': '❌'}
+    for job in jobs:
+        due = datetime.fromtimestamp(job['next_run_at']).strftime('%Y-%m-%d %H:%M:%S')
+        line = (f"{icons.get(job['status'], '•')} #{job['id']} [{job['status']}] "
+                f"p={job['priority']} runs={job['run_count']} "
+                f"query={job['query'] or 'profile default'} next={due}")
+        if job['duration_seconds'] is not None:
+            line += f" last={job['duration_seconds']:.1f}s"
+        print(line)
+        if job['last_error']:
+            print(f"    ⚠️  {job['last_error']}")
+
+
+def usage_report():
+    """
+    Summarize token usage, latency and estimated cost across recent runs.
+    Usage: python main.py usage_report [last_n_runs]
+    """
+    from job_seeker.usage import summarize_runs
+
+    args = _command_args("usage_report")
+    try:
+        last_runs = int(args[0]) if args else 10
+    except ValueError:
+        print("❌ Usage: python main.py usage_report [last_n_runs]")
+        return
+
+    summary = summarize_runs(last_runs)
+    print("💸 LLM Usage Report")
+    print("=" * 30)
+    if not summary['runs']:
+        print("No runs recorded yet. Run a job search first.")
+        return
+
+    print(f"Last {len(summary['runs'])} run(s):")
+    for run in summary['runs']:
+        print(f"  {run['started_at'][:19]}  {run['run_id']}  [{run['status']}]  "
+              f"{run['total_tokens']:>9,} tokens  {run['llm_requests']:>4} calls  "
+              f"{run['duration_seconds']:>7.1f}s  ${run['cost_usd']:.4f}")
+
+    print()
+    print("Per agent (averages per run):")
+    for agent in summary['agents']:
+        line = (f"  {agent['agent'][:45]:<45} {agent['model'] or 'unknown':<16} "
+                f"prompt {agent['avg_prompt_tokens']:>9,.0f}  completion {agent['avg_completion_tokens']:>7,.0f}  "
+                f"{agent['avg_duration_seconds']:>6.1f}s  total ${agent['total_cost_usd']:.4f}")
+        growth = agent.get('prompt_growth')
+        if growth is not None:
+            line += f"  prompt trend {growth:+.0%}"
+            if growth > 0.2:
+                line += " ⚠️"
+        print(line)
+
+
+def benchmark():
+    """
+    Run the offline benchmark suite (no network or LLM calls).
+    Usage: python main.py benchmark [--sizes 1000,10000] [--baseline benchmark_baseline.json] [--save-baseline]
+    """
+    from job_seeker.benchmarks.suite import main as run_benchmarks
+
+    exit_code = run_benchmarks(_command_args("benchmark"))
+    if exit_code:
+        print("❌ Performance regression against the baseline")
+        sys.exit(exit_code)
+
+
+def stand_in():
+    """
+    Run a local Serper stand-in server replaying recorded responses.
+    Usage: python main.py stand_in [--recordings serper_recordings] [--port 8765] [--latency 0.2] [--error-rate 0.05]
+    """
+    from job_seeker.search_backends import main as run_stand_in
+
+    run_stand_in(_command_args("stand_in"))
+
+
+def enrich():
+    """
+    Fetch full job pages for stored jobs whose cached page is missing or stale.
+    Usage: python main.py enrich [max_age_days] [workers] [limit]
+    """
+    from job_seeker.enrichment import PageFetcher, enrich_stored_jobs
+
+    args = _command_args("enrich")
+    try:
+        max_age_days = float(args[0]) if len(args) > 0 else 7
+        workers = int(args[1]) if len(args) > 1 else 8
+        limit = int(args[2]) if len(args) > 2 else None
+    except ValueError:
+        print("❌ Usage: python main.py enrich [max_age_days] [workers] [limit]")
+        return
+
+    print("🔎 Enriching stored jobs with full descriptions")
+    print("=" * 30)
+    summary = enrich_stored_jobs(limit=limit, fetcher=PageFetcher(workers=workers, max_age_days=max_age_days))
+    print(f"📄 {summary['total']} stored jobs, {summary['fetched']} stale or new pages fetched")
+    print(f"✅ {summary['enriched']} descriptions available after {summary['seconds']:.1f}s")
+
+
+def plan_search():
+    """
+    Show the ranked query plan the planned search would run for your profile.
+    Usage: python main.py plan_search [max_queries]
+    """
+    from job_seeker.profiles import load_user_profile
+    from job_seeker.query_planner import plan_queries
+    from job_seeker.tools.job_search_tools import DEFAULT_SEARCH_SITES
+
+    args = _command_args("plan_search")
+    try:
+        max_queries = int(args[0]) if args else 20
+    except ValueError:
+        print("❌ Usage: python main.py plan_search [max_queries]")
+        return
+
+    user_profile = load_user_profile()
+    if not user_profile:
+        print("❌ No user profile found. Please create one first.")
+        return
+
+    print("🧭 Search Plan")
+    print("=" * 30)
+    for i, entry in enumerate(plan_queries(user_profile, DEFAULT_SEARCH_SITES, max_queries), 1):
+        print(f"{i:>3}. {entry['expected_yield']:>5.2f}/call  {entry['site']:<20} "
+              f"{entry['query']}  [{entry['location'] or 'any location'}]")
+
+
+def stream():
+    """
+    Search, score and store jobs page by page without an LLM, committing as results arrive.
+    Usage: python main.py stream [total_results] [call_budget] [query]
+    """
+    from job_seeker.pipeline import stream_search
+    from job_seeker.profiles import load_user_profile
+
+    args = _command_args("stream")
+    try:
+        total_results = int(args[0]) if len(args) > 0 else 100
+        call_budget = int(args[1]) if len(args) > 1 else 30
+        query = " ".join(args[2:]) or None
+    except ValueError:
+        print("❌ Usage: python main.py stream [total_results] [call_budget] [query]")
+        return
+
+    user_profile = load_user_profile()
+    if not user_profile:
+        print("❌ No user profile found. Please create one first.")
+        return
+
+    print(f"🌊 Streaming search: {query or 'planned from your profile'}")
+    print("=" * 30)
+    summary = stream_search(user_profile, query=query, call_budget=call_budget, total_results=total_results)
+    print(f"✅ {summary['stored']} jobs stored from {summary['calls']} API calls in {summary['seconds']:.1f}s "
+          f"({summary['filtered']} dropped by constraints)")
+    if summary['first_commit_seconds'] is not None:
+        print(f"⏱️  First results stored after {summary['first_commit_seconds']:.1f}s")
+    if summary['best_score'] is not None:
+        print(f"🏆 Best match score: {summary['best_score']:.1f}")
+
+
+def similar_jobs():
+    """
+    Show the stored jobs most similar to a stored job URL, free text, or your profile.
+    Usage: python main.py similar_jobs [url_or_text] [k]
+    """
+    from job_seeker.embeddings import similar_jobs as find_similar_jobs
+    from job_seeker.profiles import load_user_profile
+
+    args = _command_args("similar_jobs")
+    query = args[0] if args else None
+    try:
+        k = int(args[1]) if len(args) > 1 else 10
+    except ValueError:
+        print("❌ Usage: python main.py similar_jobs [url_or_text] [k]")
+        return
+
+    print(f"🧲 Jobs most similar to {query or 'your profile'}")
+    print("=" * 30)
+    results = find_similar_jobs(query, profile=None if query else load_user_profile(), k=k)
+    if not results:
+        print("No stored jobs found. Run a job search first.")
+        return
+    for i, job in enumerate(results, 1):
+        print(f"{i:>3}. {job['similarity']:.3f}  {job['title']} - {job['company']} ({job['location']})")
+        print(f"      {job['url']}")
+
+
+def rescore():
+    """
+    Re-score every stored job against your current profile on all cores.
+    Usage: python main.py rescore [workers] [batch_size]
+    """
+    from job_seeker.profiles import load_user_profile
+    from job_seeker.rescore import rescore_stored_jobs
+
+    args = _command_args("rescore")
+    try:
+        workers = int(args[0]) if len(args) > 0 else None
+        batch_size = int(args[1]) if len(args) > 1 else 500
+    except ValueError:
+        print("❌ Usage: python main.py rescore [workers] [batch_size]")
+        return
+
+    user_profile = load_user_profile()
+    if not user_profile:
+        print("❌ No user profile found. Please create one first.")
+        return
+
+    print("♻️  Re-scoring stored jobs")
+    print("=" * 30)
+    summary = rescore_stored_jobs(user_profile, workers=workers, batch_size=batch_size)
+    if not summary['rows']:
+        print("No stored jobs found. Run a job search first.")
+        return
+    print(f"✅ {summary['rows']:,} jobs re-scored by {summary['workers']} workers "
+          f"in {summary['seconds']:.1f}s")
+
+
+def check_liveness():
+    """
+    Check whether active stored postings are still online and expire dead ones.
+    Usage: python main.py check_liveness [workers] [recheck_hours] [limit]
+    """
+    from job_seeker.lifecycle import LivenessChecker, check_stored_jobs, status_counts
+    from job_seeker.tools.job_search_tools import _init_database
+
+    args = _command_args("check_liveness")
+    try:
+        workers = int(args[0]) if len(args) > 0 else 16
+        recheck_hours = float(args[1]) if len(args) > 1 else 24
+        limit = int(args[2]) if len(args) > 2 else None
+    except ValueError:
+        print("❌ Usage: python main.py check_liveness [workers] [recheck_hours] [limit]")
+        return
+
+    print("🩺 Checking stored postings")
+    print("=" * 30)
+    _init_database()
+    summary = check_stored_jobs(LivenessChecker(workers=workers, recheck_hours=recheck_hours), limit=limit)
+    print(f"🔗 {summary['checked']} postings checked in {summary['seconds']:.1f}s: "
+          f"{summary['alive']} alive, {summary['dead']} gone, {summary['inconclusive']} inconclusive")
+    print(f"🗑️  {summary['expired']} postings expired")
+    if summary['backed_off']:
+        print(f"⏸️  {summary['backed_off']} postings keep failing inconclusively (blocked or down); "
+              f"rechecking them weekly")
+    print(f"📊 By status: {status_counts()}")
+
+
+def archive():
+    """
+    Move expired and long-unseen postings to the archive table and compact the database.
+    Usage: python main.py archive [stale_days]
+    """
+    from job_seeker.lifecycle import archive_jobs
+    from job_seeker.tools.job_search_tools import _init_database
+
+    args = _command_args("archive")
+    try:
+        stale_days = float(args[0]) if args else 60
+    except ValueError:
+        print("❌ Usage: python main.py archive [stale_days]")
+        return
+
+    print("📦 Archiving postings")
+    print("=" * 30)
+    _init_database()
+    summary = archive_jobs(stale_days=stale_days)
+    print(f"✅ {summary['archived']} postings archived, {summary['remaining']} active table rows remain")
+    print(f"💾 Database size {summary['size_before'] / 1024:,.0f} KiB -> {summary['size_after'] / 1024:,.0f} KiB")
+
+
+def batch():
+    """
+    Run the job search for every profile JSON in a directory, sharing one search cache.
+    Usage: python main.py batch <profiles_dir> [concurrency] [output_dir]
+    """
+    from job_seeker.batch import BatchRunner, find_profiles
+
+    args = _command_args("batch")
+    try:
+        profile_dir = args[0]
+        concurrency = int(args[1]) if len(args) > 1 else 2
+        output_dir = args[2] if len(args) > 2 else "batch_results"
+    except (IndexError, ValueError):
+        print("❌ Usage: python main.py batch <profiles_dir> [concurrency] [output_dir]")
+        return
+
+    profile_paths = find_profiles(profile_dir)
+    if not profile_paths:
+        print(f"❌ No profile JSON files found in {profile_dir}")
+        return
+
+    print(f"🗂️  Running {len(profile_paths)} profiles, {concurrency} at a time")
+    print("=" * 30)
+    summary = BatchRunner(output_dir=output_dir, concurrency=concurrency).run(profile_paths)
+
+    print()
+    print(f"{'profile':<24} {'status':<8} {'seconds':>8} {'jobs':>6} {'top':>6} {'tokens':>9}")
+    for result in summary['results']:
+        name = os.path.basename(result['output_dir'])
+        top = f"{result['top_score']:.0f}" if result['top_score'] is not None else "-"
+        print(f"{name:<24} {result['status']:<8} {result['seconds']:>8.1f} {result['jobs_stored']:>6} "
+              f"{top:>6} {result['total_tokens']:>9,}")
+    print()
+    print(f"✅ {summary['succeeded']}/{summary['profiles']} profiles succeeded")
+    print(f"⏱️  {summary['wall_seconds']:.1f}s wall time for {summary['profile_seconds']:.1f}s of profile runs")
+    print(f"🗄️  Search cache: {summary['search_cache']['hits']} hits, {summary['search_cache']['misses']} misses")
+    print(f"💸 {summary['total_tokens']:,} tokens, ${summary['cost_usd']:.4f}")
+    print(f"📁 Results in {output_dir}/")
+
+
+def maintain():
+    """
+    Reclaim free pages, refresh query statistics, check integrity and report table sizes.
+    Usage: python main.py maintain [--db job_opportunities.db] [--full-check] [--vacuum]
+    """
+    from job_seeker.maintenance import main as run_maintenance
+
+    print("🧹 Database maintenance")
+    print("=" * 30)
+    exit_code = run_maintenance(_command_args("maintain"))
+    if exit_code:
+        print("❌ Integrity problems found")
+        sys.exit(exit_code)
+
+
+def export():
+    """
+    Export the job history to date-partitioned Parquet (or gzip CSV) files.
+    Usage: python main.py export [output_dir] [auto|parquet|csv]
+    """
+    from job_seeker.export import DEFAULT_EXPORT_DIR, export_jobs
+
+    args = _command_args("export")
+    output_dir = args[0] if args else DEFAULT_EXPORT_DIR
+    file_format = args[1] if len(args) > 1 else "auto"
+
+    print(f"📤 Exporting job history to {output_dir}/")
+    print("=" * 30)
+    try:
+        summary = export_jobs(output_dir, file_format=file_format)
+    except ValueError as e:
+        print(f"❌ {e}")
+        return
+    print(f"✅ {summary['rows']:,} postings in {summary['files']} {summary['format']} files, "
+          f"{summary['partitions']} days, {summary['seconds']:.1f}s")
+
+
+def market_stats():
+    """
+    Salary ranges, posting volume and skill demand from an export.
+    Usage: python main.py market_stats [export_dir] [days]
+    """
+    from job_seeker.analytics import market_stats as compute_market_stats
+    from job_seeker.analytics import print_market_stats, since_days
+    from job_seeker.export import DEFAULT_EXPORT_DIR
+
+    args = _command_args("market_stats")
+    try:
+        export_dir = args[0] if args else DEFAULT_EXPORT_DIR
+        days = int(args[1]) if len(args) > 1 else None
+    except ValueError:
+        print("❌ Usage: python main.py market_stats [export_dir] [days]")
+        return
+    if not os.path.isdir(export_dir):
+        print(f"❌ No export found in {export_dir}. Run 'python main.py export' first.")
+        return
+
+    print_market_stats(compute_market_stats(export_dir, since=since_days(days) if days else None))
+
+
 def help():
     """
     Show help information.
@@ -276,7 +781,25 @@ def help():
     print("📊 view_results           - View previous search results")
     print("🏋️  train                 - Train the crew")
     print("🔄 replay <task_id>       - Replay a specific task")
+    print("⏯️  resume [run_id]        - Resume a failed run from its checkpointed stages")
     print("🧪 test                   - Test the crew")
+    print("🧭 plan_search [n]        - Show the ranked query plan for your profile")
+    print("🌊 stream [n] [calls] [q] - Search, score and store page by page, without the crew")
+    print("🧲 similar_jobs [q] [k]   - Stored jobs most similar to a job URL, text or your profile")
+    print("♻️  rescore [workers]      - Re-score all stored jobs against your profile in parallel")
+    print("🩺 check_liveness [workers] - Expire stored postings that are no longer online")
+    print("📦 archive [stale_days]   - Archive expired/unseen postings and compact the database")
+    print("🧹 maintain [options]     - Vacuum, analyze, integrity-check and size-report the databases")
+    print("📤 export [dir] [format]  - Export job history to date-partitioned Parquet/CSV files")
+    print("📈 market_stats [dir] [days] - Salary, volume and skill-demand statistics from an export")
+    print("🔎 enrich [days] [workers] - Fetch full job pages for stale/new stored jobs")
+    print("🏁 benchmark [options]    - Offline parsing/scoring/storage/report benchmarks")
+    print("🧪 stand_in [options]     - Local Serper stand-in replaying recorded searches")
+    print("🗂️  batch <dir> [n]        - Run every profile in a directory, n at a time")
+    print("🛰️  serve [workers]        - Run the search daemon over the job queue")
+    print("📥 enqueue '<json>'        - Queue a search job for the daemon")
+    print("📋 queue_status           - Show queued, running and finished jobs")
+    print("💸 usage_report [n]       - Token, latency and cost trends for the last n runs")
     print("❓ help                   - Show this help message")
     print()
     print("Examples:")
@@ -284,6 +807,8 @@ def help():
     print("  python main.py search_custom '{\"job_sites\": [\"indeed.com\"]}'")
     print("  python main.py train 5 training_results.json")
     print("  python main.py replay task_123")
+    print("  python main.py enqueue '{\"search_query\": \"AI Engineer\", \"interval_seconds\": 86400}'")
+    print("  python main.py serve 4")
 
 
 if __name__ == "__main__":
@@ -301,8 +826,44 @@ if __name__ == "__main__":
             train()
         elif command == "replay":
             replay()
+        elif command == "resume":
+            resume()
         elif command == "test":
             test()
+        elif command == "serve":
+            serve()
+        elif command == "enqueue":
+            enqueue()
+        elif command == "queue_status":
+            queue_status()
+        elif command == "usage_report":
+            usage_report()
+        elif command == "benchmark":
+            benchmark()
+        elif command == "stand_in":
+            stand_in()
+        elif command == "enrich":
+            enrich()
+        elif command == "plan_search":
+            plan_search()
+        elif command == "stream":
+            stream()
+        elif command == "similar_jobs":
+            similar_jobs()
+        elif command == "rescore":
+            rescore()
+        elif command == "check_liveness":
+            check_liveness()
+        elif command == "archive":
+            archive()
+        elif command == "batch":
+            batch()
+        elif command == "maintain":
+            maintain()
+        elif command == "export":
+            export()
+        elif command == "market_stats":
+            market_stats()
         elif command == "help":
             help()
         else:
@@ -0,0 +1,187 @@
+"""
+Routine SQLite maintenance: free-page reclaim, planner statistics, integrity
+checks, WAL checkpoints and a size report.
+
+Everything here is safe while the daemon, searches or other readers use the
+database: checks and the size report are read transactions, the checkpoint is
+PASSIVE (it never waits for or blocks other connections), and free pages are
+reclaimed with incremental vacuum in short write transactions rather than one
+long VACUUM. Only the opt-in full VACUUM rewrites the whole file; it is what
+converts databases created before incremental auto-vacuum.
+"""
+import argparse
+import os
+import time
+from typing import Dict, List
+
+from .db import connect, get_db_path
+
+# Free pages released per incremental_vacuum step (one short write transaction each)
+VACUUM_STEP_PAGES = 256
+# Rows sampled per index by ANALYZE; approximate statistics are enough for the query planner
+ANALYSIS_LIMIT = 1000
+
+_AUTO_VACUUM_MODES = {0: "none", 1: "full", 2: "incremental"}
+
+
+def _file_sizes(db_path: str) -> Dict[str, int]:
+    return {suffix or "db": os.path.getsize(db_path + suffix) if os.path.exists(db_path + suffix) else 0
+            for suffix in ("", "-wal")}
+
+
+def _pragma(conn, name: str):
+    return conn.execute(f"PRAGMA {name}").fetchone()[0]
+
+
+def _incremental_vacuum(conn, step_pages: int) -> int:
+    """Release free pages in steps; returns the number released"""
+    released = 0
+    while True:
+        free = _pragma(conn, "freelist_count")
+        if not free:
+            return released
+        # Every result row must be stepped through for the pages to be freed
+        conn.execute(f"PRAGMA incremental_vacuum({min(free, step_pages)})").fetchall()
+        freed = free - _pragma(conn, "freelist_count")
+        if freed <= 0:
+            return released
+        released += freed
+
+
+def table_report(conn) -> List[Dict]:
+    """Rows and on-disk bytes per table and index (bytes need the dbstat virtual table)"""
+    objects = conn.execute(
+        "SELECT name, type, tbl_name FROM sqlite_master WHERE type IN ('table', 'index') "
+        "ORDER BY tbl_name, type DESC, name"
+    ).fetchall()
+    try:
+        sizes = dict(conn.execute("SELECT name, SUM(pgsize) FROM dbstat GROUP BY name").fetchall())
+    except Exception:
+        sizes = None  # SQLite built without SQLITE_ENABLE_DBSTAT_VTAB
+
+    report = []
+    for name, kind, table in objects:
+        rows = None
+        if kind == "table" and not name.startswith("sqlite_"):
+            rows = conn.execute(f'SELECT COUNT(*) FROM "{name}"').fetchone()[0]
+        report.append({"name": name, "type": kind, "table": table, "rows": rows,
+                       "bytes": sizes.get(name, 0) if sizes is not None else None})
+    return report
+
+
+def maintain_database(db_path: str = None, full_check: bool = False, vacuum: bool = False,
+                      step_pages: int = VACUUM_STEP_PAGES) -> Dict:
+    """
+    Reclaim free pages, refresh planner statistics, check integrity and checkpoint the WAL.
+
+    `full_check` runs integrity_check instead of the faster quick_check
+    (which skips index-content cross checks). `vacuum` runs a full VACUUM,
+    which needs exclusive write access for its duration.
+    """
+    db_path = db_path or get_db_path()
+    report = {"db_path": db_path, "size_before": _file_sizes(db_path)}
+    started = time.perf_counter()
+
+    conn = connect(db_path)
+    try:
+        report["page_size"] = _pragma(conn, "page_size")
+        report["free_pages_before"] = _pragma(conn, "freelist_count")
+
+        if vacuum:
+            conn.execute("VACUUM")
+            report["released_pages"] = report["free_pages_before"]
+        elif _pragma(conn, "auto_vacuum") == 2:
+            report["released_pages"] = _incremental_vacuum(conn, step_pages)
+        else:
+            report["released_pages"] = 0
+        report["auto_vacuum"] = _AUTO_VACUUM_MODES.get(_pragma(conn, "auto_vacuum"), "unknown")
+
+        # Statistics for the query planner: a bounded ANALYZE, then let optimize do any follow-up
+        conn.execute(f"PRAGMA analysis_limit={ANALYSIS_LIMIT}")
+        conn.execute("ANALYZE")
+        conn.execute("PRAGMA optimize")
+        conn.commit()
+
+        check = "integrity_check" if full_check else "quick_check"
+        problems = [row[0] for row in conn.execute(f"PRAGMA {check}").fetchall()]
+        report["integrity"] = {"check": check, "ok": problems == ["ok"],
+                               "problems": [] if problems == ["ok"] else problems[:20]}
+
+        # PASSIVE copies what it can without waiting on readers or writers
+        busy, wal_frames, checkpointed = conn.execute("PRAGMA wal_checkpoint(PASSIVE)").fetchone()
+        report["checkpoint"] = {"busy": bool(busy), "wal_frames": wal_frames, "checkpointed": checkpointed}
+
+        report["free_pages_after"] = _pragma(conn, "freelist_count")
+        report["tables"] = table_report(conn)
+    finally:
+        conn.close()
+
+    report["size_after"] = _file_sizes(db_path)
+    report["seconds"] = time.perf_counter() - started
+    return report
+
+
+def _format_bytes(size) -> str:
+    if size is None:
+        return "-"
+    for unit in ("B", "KiB", "MiB", "GiB"):
+        if size < 1024 or unit == "GiB":
+            return f"{size:,.0f} {unit}" if unit == "B" else f"{size:,.1f} {unit}"
+        size /= 1024
+
+
+def print_report(report: Dict):
+    before, after = report["size_before"], report["size_after"]
+    print(f"🗄️  {report['db_path']}")
+    print(f"   file {_format_bytes(before['db'])} -> {_format_bytes(after['db'])}, "
+          f"WAL {_format_bytes(before['-wal'])} -> {_format_bytes(after['-wal'])}")
+    print(f"   {report['released_pages']:,} free pages released ({report['auto_vacuum']} auto-vacuum), "
+          f"{report['free_pages_after']:,} left")
+    if report["auto_vacuum"] != "incremental":
+        print("   ℹ️  This database predates incremental auto-vacuum; run once with --vacuum to convert it")
+    integrity = report["integrity"]
+    if integrity["ok"]:
+        print(f"   ✅ {integrity['check']}: ok")
+    else:
+        print(f"   ❌ {integrity['check']} found problems:")
+        for problem in integrity["problems"]:
+            print(f"      {problem}")
+    checkpoint = report["checkpoint"]
+    pending = checkpoint["checkpointed"] < checkpoint["wal_frames"]
+    print(f"   WAL checkpoint: {checkpoint['checkpointed']}/{checkpoint['wal_frames']} frames"
+          + (" (readers active, the rest goes with the next checkpoint)" if pending else ""))
+    print()
+    print(f"   {'table / index':<44} {'rows':>10} {'size':>12}")
+    for entry in report["tables"]:
+        name = entry["name"] if entry["type"] == "table" else f"  {entry['name']}"
+        rows = f"{entry['rows']:,}" if entry["rows"] is not None else ""
+        print(f"   {name:<44} {rows:>10} {_format_bytes(entry['bytes']):>12}")
+    print(f"   done in {report['seconds']:.2f}s")
+
+
+def main(argv: List[str] = None) -> int:
+    from .daemon import get_queue_path
+
+    parser = argparse.ArgumentParser(description="Maintain the job seeker SQLite databases")
+    parser.add_argument("--db", action="append",
+                        help="Database to maintain (repeatable; default: the jobs and queue databases)")
+    parser.add_argument("--full-check", action="store_true", help="Run integrity_check instead of quick_check")
+    parser.add_argument("--vacuum", action="store_true",
+                        help="Full VACUUM (blocks writers while it runs; converts to incremental auto-vacuum)")
+    args = parser.parse_args(argv)
+
+    paths = args.db or [path for path in (get_db_path(), get_queue_path()) if os.path.exists(path)]
+    if not paths:
+        print("No databases found. Run a job search first.")
+        return 0
+
+    ok = True
+    for path in paths:
+        report = maintain_database(path, full_check=args.full_check, vacuum=args.vacuum)
+        print_report(report)
+        ok = ok and report["integrity"]["ok"]
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,260 @@
+"""
+Lightweight run instrumentation: timers, counters and histograms.
+
+Instrumentation is off unless JOB_SEEKER_METRICS is set to an output path
+(``.json`` for JSON, anything else for the Prometheus text format). While
+disabled, ``timer()`` returns a shared no-op context manager and ``timed``
+functions call straight through, so the hot paths pay a single flag check.
+"""
+import inspect
+import json
+import os
+import threading
+import time
+from functools import wraps
+from typing import Dict, Tuple
+
+# Histogram bucket upper bounds, in seconds
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0, 30.0, 60.0, float("inf"))
+
+METRIC_PREFIX = "job_seeker_"
+
+_enabled = bool(os.environ.get("JOB_SEEKER_METRICS"))
+_export_path = os.environ.get("JOB_SEEKER_METRICS")
+
+
+def _key(name: str, labels: Dict) -> Tuple:
+    return (name, tuple(sorted(labels.items()))) if labels else (name, ())
+
+
+class _Histogram:
+    """Cumulative bucket counts plus sum/count/min/max"""
+
+    __slots__ = ("buckets", "counts", "count", "total", "min", "max")
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.count = 0
+        self.total = 0.0
+        self.min = float("inf")
+        self.max = 0.0
+
+    def observe(self, value: float):
+        self.count += 1
+        self.total += value
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+                break
+
+    def cumulative(self):
+        running = 0
+        for bound, count in zip(self.buckets, self.counts):
+            running += count
+            yield bound, running
+
+
+class MetricsRegistry:
+    """Thread-safe store of counters and histograms keyed by name and labels"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.counters: Dict[Tuple, float] = {}
+        self.histograms: Dict[Tuple, _Histogram] = {}
+
+    def inc(self, name: str, value: float = 1, **labels):
+        key = _key(name, labels)
+        with self._lock:
+            self.counters[key] = self.counters.get(key, 0) + value
+
+    def observe(self, name: str, value: float, **labels):
+        key = _key(name, labels)
+        with self._lock:
+            histogram = self.histograms.get(key)
+            if histogram is None:
+                histogram = self.histograms[key] = _Histogram()
+            histogram.observe(value)
+
+    def reset(self):
+        with self._lock:
+            self.counters.clear()
+            self.histograms.clear()
+
+    def snapshot(self) -> Dict:
+        """Return all metrics as plain data"""
+        with self._lock:
+            counters = [
+                {"name": name, "labels": dict(labels), "value": value}
+                for (name, labels), value in sorted(self.counters.items())
+            ]
+            histograms = [
+                {
+                    "name": name,
+                    "labels": dict(labels),
+                    "count": h.count,
+                    "sum": h.total,
+                    "min": h.min if h.count else 0.0,
+                    "max": h.max,
+                    "mean": h.total / h.count if h.count else 0.0,
+                }
+                for (name, labels), h in sorted(self.histograms.items())
+            ]
+        return {"generated_at": time.time(), "counters": counters, "histograms": histograms}
+
+    def to_prometheus(self) -> str:
+        """Render all metrics in the Prometheus text exposition format"""
+
+        def fmt_labels(labels, extra=None):
+            items = list(labels) + ([extra] if extra else [])
+            if not items:
+                return ""
+            escaped = ",".join(
+                f'{k}="' + str(v).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") + '"'
+                for k, v in items
+            )
+            return "{" + escaped + "}"
+
+        lines = []
+        with self._lock:
+            typed = set()
+            for (name, labels), value in sorted(self.counters.items()):
+                metric = METRIC_PREFIX + name
+                if metric not in typed:
+                    lines.append(f"# TYPE {metric} counter")
+                    typed.add(metric)
+                lines.append(f"{metric}{fmt_labels(labels)} {value}")
+            for (name, labels), h in sorted(self.histograms.items()):
+                metric = METRIC_PREFIX + name
+                if metric not in typed:
+                    lines.append(f"# TYPE {metric} histogram")
+                    typed.add(metric)
+                for bound, count in h.cumulative():
+                    le = "+Inf" if bound == float("inf") else repr(bound)
+                    lines.append(f"{metric}_bucket{fmt_labels(labels, ('le', le))} {count}")
+                lines.append(f"{metric}_sum{fmt_labels(labels)} {h.total}")
+                lines.append(f"{metric}_count{fmt_labels(labels)} {h.count}")
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+
+
+class _Timer:
+    """Context manager recording its elapsed time into a histogram"""
+
+    __slots__ = ("name", "labels", "started")
+
+    def __init__(self, name: str, labels: Dict):
+        self.name = name
+        self.labels = labels
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        registry.observe(self.name, time.perf_counter() - self.started, **self.labels)
+        return False
+
+
+class _NoopTimer:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NOOP_TIMER = _NoopTimer()
+
+
+def enable(export_path: str = None):
+    """Turn instrumentation on, optionally setting where export() writes"""
+    global _enabled, _export_path
+    _enabled = True
+    if export_path:
+        _export_path = export_path
+
+
+def disable():
+    global _enabled
+    _enabled = False
+
+
+def is_enabled() -> bool:
+    return _enabled
+
+
+def timer(name: str, **labels):
+    """Time a block: ``with metrics.timer("search_site_seconds", site=site): ...``"""
+    if not _enabled:
+        return _NOOP_TIMER
+    return _Timer(name, labels)
+
+
+def timed(name: str, **labels):
+    """Decorator timing every call of the wrapped function"""
+
+    def decorator(func):
+        if inspect.iscoroutinefunction(func):
+            @wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                if not _enabled:
+                    return await func(*args, **kwargs)
+                with _Timer(name, labels):
+                    return await func(*args, **kwargs)
+
+            return async_wrapper
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return func(*args, **kwargs)
+            with _Timer(name, labels):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def inc(name: str, value: float = 1, **labels):
+    """Increment a counter"""
+    if _enabled:
+        registry.inc(name, value, **labels)
+
+
+def observe(name: str, value: float, **labels):
+    """Record a value (sizes, scores, ...) into a histogram"""
+    if _enabled:
+        registry.observe(name, value, **labels)
+
+
+def export(path: str = None) -> str:
+    """
+    Write the collected metrics to `path` (default: JOB_SEEKER_METRICS).
+
+    Files ending in .json get a JSON snapshot; anything else gets the
+    Prometheus text format, suitable for the node_exporter textfile collector.
+    Returns the written path, or None when there is nothing to write to.
+    """
+    path = path or _export_path
+    if not _enabled or not path:
+        return None
+
+    if path.endswith(".json"):
+        content = json.dumps(registry.snapshot(), indent=2)
+    else:
+        content = registry.to_prometheus()
+
+    # Write atomically so a scraper never reads a half-written file
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w") as f:
+        f.write(content)
+    os.replace(tmp_path, path)
+    return path
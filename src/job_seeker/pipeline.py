@@ -0,0 +1,182 @@
+"""
+Streaming search pipeline: fetch -> parse -> dedup -> filter -> score -> upsert.
+
+The search tools collect every result before evaluation and storage see any
+of them. Here each page of results flows through all stages on its own: a
+search thread fetches, parses and deduplicates pages into a bounded queue
+(it blocks once `prefetch` pages are waiting, so a slow database holds the
+search back), and the consumer filters, scores and upserts them, committing
+every `batch_size` jobs. Memory stays flat however many queries, sites and
+pages a run covers, and stored jobs are queryable while the search runs.
+"""
+import contextvars
+import queue
+import threading
+import time
+from datetime import datetime
+from typing import Dict, Iterator, List
+
+from . import metrics
+from .db import connect
+from .profiles import compile_profile
+
+# Pages waiting between the search thread and the scoring/storage stages
+DEFAULT_PREFETCH = 4
+# Jobs per write transaction
+DEFAULT_BATCH_SIZE = 25
+
+_DONE = object()
+
+
+def _search_pages(search) -> Iterator[List[Dict]]:
+    """Fetch pages one request at a time, yielding the new (deduplicated) jobs of each"""
+    from .tools.job_search_tools import SERPER_PAGE_SIZE
+
+    backend = search.backend
+    while True:
+        requests = search.next_requests()
+        if not requests:
+            return
+        index, page, site_query = requests[0]
+        try:
+            with metrics.timer("search_request_seconds", site=search.stats[index]["site"]):
+                response = backend.search(site_query, num=SERPER_PAGE_SIZE, page=page)
+            jobs = search.absorb(index, page, response)
+        except Exception as e:
+            jobs = search.fail(index, page, e)
+        if jobs:
+            yield jobs
+        if backend.rate_limit_seconds:
+            time.sleep(backend.rate_limit_seconds)
+
+
+def _prefetch(items: Iterator, depth: int) -> Iterator:
+    """Run `items` in a thread, at most `depth` items ahead of the consumer"""
+    buffer = queue.Queue(maxsize=max(1, depth))
+    stop = threading.Event()
+
+    def put(item) -> bool:
+        # Blocks while the buffer is full (backpressure) unless the consumer has gone
+        while not stop.is_set():
+            try:
+                buffer.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def produce():
+        try:
+            for item in items:
+                if not put(item):
+                    return
+        except Exception as e:
+            put(e)
+        finally:
+            put(_DONE)
+
+    # The search stage sees the same context (e.g. the database override) as the caller
+    context = contextvars.copy_context()
+    thread = threading.Thread(target=context.run, args=(produce,), name="pipeline-search", daemon=True)
+    thread.start()
+    try:
+        while True:
+            item = buffer.get()
+            if item is _DONE:
+                return
+            if isinstance(item, Exception):
+                raise item
+            yield item
+    finally:
+        # The consumer stopped early (error or close): let the producer exit
+        stop.set()
+        thread.join(timeout=5)
+
+
+def _batches(pages: Iterator[List[Dict]], size: int) -> Iterator[List[Dict]]:
+    """Regroup pages of jobs into lists of `size` jobs (the last may be shorter)"""
+    batch = []
+    for jobs in pages:
+        for job in jobs:
+            batch.append(job)
+            if len(batch) >= size:
+                yield batch
+                batch = []
+    if batch:
+        yield batch
+
+
+def stream_search(profile: Dict, sites: List[str] = None, query: str = None, call_budget: int = 30,
+                  total_results: int = 100, max_results: int = 20, batch_size: int = DEFAULT_BATCH_SIZE,
+                  prefetch: int = DEFAULT_PREFETCH, progress: bool = True) -> Dict:
+    """
+    Search, score and store jobs page by page.
+
+    Without `query` the searches come from the query planner (as with
+    planned_job_search_tool) and their hit rates are recorded; with it, each
+    site is searched for `query`, up to `max_results` results per site.
+    Returns counts for reporting.
+    """
+    from .enrichment import enrich_jobs
+    from .query_planner import FIRST_PAGE_SHARE, plan_queries, record_query_stats
+    from .search_backends import get_search_backend
+    from .tools.job_search_tools import (
+        DEFAULT_SEARCH_SITES,
+        SERPER_PAGE_SIZE,
+        _AdaptiveSearch,
+        _enrichment_enabled,
+        _init_database,
+        _meets_constraints,
+        _score_jobs,
+        _upsert_jobs,
+    )
+
+    compiled = compile_profile(profile)
+    sites = sites or DEFAULT_SEARCH_SITES
+    if query:
+        targets = [{"site": site, "query": query} for site in sites]
+        max_per_target = max_results
+    else:
+        targets = plan_queries(compiled, sites, max_queries=max(1, int(call_budget * FIRST_PAGE_SHARE)))
+        max_per_target = SERPER_PAGE_SIZE * 3
+    search = _AdaptiveSearch(get_search_backend(), targets, max_per_target, total_results, compiled,
+                             call_budget=None if query else call_budget, keep_results=False)
+
+    _init_database()
+    enrich = _enrichment_enabled()
+    counts = {"found": 0, "filtered": 0, "stored": 0, "batches": 0, "best_score": None}
+    started = time.perf_counter()
+    first_commit = None
+
+    conn = connect()
+    try:
+        cursor = conn.cursor()
+        for batch in _batches(_prefetch(_search_pages(search), prefetch), batch_size):
+            counts["found"] += len(batch)
+            jobs = [job for job in batch if _meets_constraints(job, compiled.constraints)]
+            counts["filtered"] += len(batch) - len(jobs)
+            if enrich and jobs:
+                jobs = enrich_jobs(jobs)
+            jobs = list(_score_jobs(jobs, compiled))
+            with metrics.timer("pipeline_commit_seconds"):
+                counts["stored"] += _upsert_jobs(cursor, jobs, datetime.now().isoformat())
+                conn.commit()
+            counts["batches"] += 1
+            first_commit = first_commit or time.perf_counter() - started
+            best = max((job["match_score"] for job in jobs), default=None)
+            if best is not None:
+                counts["best_score"] = max(best, counts["best_score"] or best)
+            metrics.inc("jobs_evaluated_total", len(jobs))
+            if progress:
+                print(f"   batch {counts['batches']}: {counts['stored']} stored, "
+                      f"{search.result_count} found, {sum(s['calls'] for s in search.stats)} API calls")
+    finally:
+        conn.close()
+
+    metrics.inc("jobs_filtered_total", counts["filtered"])
+    if not query:
+        record_query_stats(search.stats)
+    counts["calls"] = sum(s["calls"] for s in search.stats)
+    counts["seconds"] = time.perf_counter() - started
+    counts["first_commit_seconds"] = first_commit
+    return counts
@@ -0,0 +1,195 @@
+"""
+User profile loading and compilation, kept free of crew dependencies so lightweight commands stay fast
+"""
+import copy
+import hashlib
+import json
+import os
+import re
+import threading
+from typing import Dict, List, Tuple
+
+DEFAULT_PROFILE_PATH = os.path.join(os.path.dirname(__file__), '..', '..', 'knowledge', 'resume_template.json')
+DEFAULT_PREFERENCES_PATH = os.path.join(os.path.dirname(__file__), '..', '..', 'knowledge', 'user_preference.txt')
+
+# Compiled profiles by fingerprint, and loaded profile files by (path, mtime, size)
+_COMPILED_CACHE_SIZE = 32
+_compiled: Dict[str, "CompiledProfile"] = {}
+_loaded: Dict[str, Tuple[Tuple[int, int], dict]] = {}
+_cache_lock = threading.Lock()
+
+_SALARY_NUMBER = re.compile(r"\$?\s*(\d{1,3}(?:,\d{3})+|\d+(?:\.\d+)?)\s*([kK])?")
+
+
+def load_user_profile(profile_path: str = None) -> dict:
+    """Load user profile from JSON file (parsed again only when the file changes)"""
+    if profile_path is None:
+        profile_path = DEFAULT_PROFILE_PATH
+
+    try:
+        stat = os.stat(profile_path)
+        key = (stat.st_mtime_ns, stat.st_size)
+        path = os.path.abspath(profile_path)
+        with _cache_lock:
+            cached = _loaded.get(path)
+        if cached is None or cached[0] != key:
+            with open(profile_path, 'r') as f:
+                cached = (key, json.load(f))
+            with _cache_lock:
+                _loaded[path] = cached
+        # Callers may modify the profile they get
+        return copy.deepcopy(cached[1])
+    except FileNotFoundError:
+        print(f"Profile file not found at {profile_path}")
+        print("Please update the resume_template.json file with your information")
+        return {}
+    except json.JSONDecodeError as e:
+        print(f"Error parsing profile file: {e}")
+        return {}
+
+
+def load_user_preferences(preferences_path: str = None) -> str:
+    """Load the free-text user preferences, or an empty string if there are none"""
+    try:
+        with open(preferences_path or DEFAULT_PREFERENCES_PATH, 'r') as f:
+            return f.read().strip()
+    except FileNotFoundError:
+        return ""
+
+
+# Alternative spellings of skills, mapped to the taxonomy ids that job descriptions are matched against
+SKILL_ALIASES = {
+    "js": "javascript",
+    "node": "node.js",
+    "nodejs": "node.js",
+    "reactjs": "react",
+    "react.js": "react",
+    "k8s": "kubernetes",
+    "ml": "machine learning",
+    "artificial intelligence": "ai",
+    "postgres": "postgresql",
+    "mongo": "mongodb",
+    "amazon web services": "aws",
+    "google cloud": "gcp",
+    "google cloud platform": "gcp",
+    "microsoft azure": "azure",
+    "ci cd": "ci/cd",
+    "cicd": "ci/cd",
+    "restful": "rest",
+    "golang": "go",
+}
+
+
+def skill_id(skill: str) -> str:
+    """Taxonomy id of a skill name: lowercased, whitespace-collapsed, aliases resolved"""
+    name = " ".join(str(skill).lower().split())
+    return SKILL_ALIASES.get(name, name)
+
+
+def profile_fingerprint(profile: dict) -> str:
+    """Content hash of a profile, independent of key order"""
+    return hashlib.sha256(json.dumps(profile, sort_keys=True, default=str).encode()).hexdigest()[:16]
+
+
+class CompiledProfile:
+    """
+    A profile normalized once for matching: skills as taxonomy ids, lowercase
+    location terms, numeric salary bounds and compiled hard constraints.
+
+    The raw profile stays available as `source`.
+    """
+
+    def __init__(self, profile: dict, fingerprint: str = None):
+        self.source = profile
+        self.fingerprint = fingerprint or profile_fingerprint(profile)
+        self.name = profile.get('name') or 'Job Seeker'
+        self.current_role = profile.get('current_role') or 'Software Engineer'
+        self.past_titles = [exp['title'] for exp in profile.get('experience', []) if exp.get('title')]
+        self.years_experience = profile.get('years_experience') or 0
+
+        # Skills in profile order, one per taxonomy id ("JS" and "JavaScript" are the same skill)
+        self.skills, ids = [], []
+        for skill in profile.get('skills', []):
+            sid = skill_id(skill)
+            if sid and sid not in ids:
+                ids.append(sid)
+                self.skills.append(str(skill).strip())
+        self.skill_ids = frozenset(ids)
+
+        # Locations to search in, and the lowercase terms a job location is matched with
+        self.locations = _dedupe(profile.get('preferred_locations')
+                                 or ([profile['location']] if profile.get('location') else []))
+        self.location_terms = tuple(loc.lower() for loc in profile.get('preferred_locations', []))
+
+        self.expected_salary = _as_int(profile.get('expected_salary'))
+        self.company_type = (profile.get('preferred_company_type') or '').lower()
+        self.constraints = _compile_constraints(profile.get('constraints') or {})
+        self.min_salary = self.constraints.get('min_salary', 0)
+
+
+def _dedupe(values: List[str]) -> List[str]:
+    seen, result = set(), []
+    for value in values:
+        key = " ".join(value.lower().split())
+        if key not in seen:
+            seen.add(key)
+            result.append(value)
+    return result
+
+
+def _as_int(value) -> int:
+    try:
+        return int(value or 0)
+    except (TypeError, ValueError):
+        return 0
+
+
+def salary_bounds(salary_range: str) -> Tuple[int, int]:
+    """(min, max) annual salary in a salary string, (0, 0) when there is none"""
+    values = []
+    for number, thousands in _SALARY_NUMBER.findall(salary_range or ""):
+        value = float(number.replace(",", "")) * (1000 if thousands else 1)
+        # Hourly rates and stray numbers ("3+ years") aren't annual salaries
+        if value >= 10_000:
+            values.append(int(value))
+    return (min(values), max(values)) if values else (0, 0)
+
+
+def _compile_constraints(raw: dict) -> dict:
+    """
+    Normalize hard constraints for cheap repeated checks.
+
+    Profile format (every key optional):
+        "constraints": {"locations": ["San Francisco", "Remote"],
+                        "min_salary": 120000,
+                        "job_types": ["Full-time", "Contract"]}
+    """
+    constraints = {}
+    if raw.get('locations'):
+        constraints['locations'] = [loc.lower() for loc in raw['locations']]
+    if raw.get('min_salary'):
+        constraints['min_salary'] = int(raw['min_salary'])
+    if raw.get('job_types'):
+        constraints['job_types'] = {job_type.lower() for job_type in raw['job_types']}
+    return constraints
+
+
+def compile_profile(profile) -> CompiledProfile:
+    """Compile a profile dict, reusing the compiled form of an identical profile; compiled profiles pass through"""
+    if isinstance(profile, CompiledProfile):
+        return profile
+    fingerprint = profile_fingerprint(profile or {})
+    with _cache_lock:
+        compiled = _compiled.get(fingerprint)
+    if compiled is None:
+        compiled = CompiledProfile(profile or {}, fingerprint)
+        with _cache_lock:
+            if len(_compiled) >= _COMPILED_CACHE_SIZE:
+                _compiled.pop(next(iter(_compiled)))
+            _compiled[fingerprint] = compiled
+    return compiled
+
+
+def load_compiled_profile(profile_path: str = None) -> CompiledProfile:
+    """Load and compile a profile file, recompiling only when the file changed"""
+    return compile_profile(load_user_profile(profile_path))
@@ -0,0 +1,181 @@
+"""
+Query fan-out planner: expand a profile into ranked (query, site, location) searches
+"""
+import re
+from datetime import datetime
+from typing import Dict, List, Tuple
+
+from .db import connect
+from .profiles import CompiledProfile, compile_profile
+
+# Relevant results per API call assumed for a search that has never run
+PRIOR_RELEVANT_PER_CALL = 3.0
+# Weight of the prior, in calls, when blending it with observed hit rates
+PRIOR_WEIGHT = 2.0
+# Later skills and locations in the profile are assumed to matter less
+SKILL_DECAY = 0.9
+LOCATION_DECAY = 0.9
+# Queries derived from past job titles rather than the current role
+PAST_TITLE_WEIGHT = 0.8
+# Diminishing returns for planning the same site or query again (overlapping results)
+SITE_REPEAT_DECAY = 0.8
+QUERY_REPEAT_DECAY = 0.9
+# Share of the API-call budget spent on first pages; the rest pages deeper
+FIRST_PAGE_SHARE = 2 / 3
+
+
+def _init_query_stats(conn):
+    """Initialize the query_stats table"""
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS query_stats (
+            query TEXT NOT NULL,
+            site TEXT NOT NULL,
+            location TEXT NOT NULL DEFAULT '',
+            calls INTEGER DEFAULT 0,
+            results INTEGER DEFAULT 0,
+            relevant INTEGER DEFAULT 0,
+            last_run_at TEXT,
+            PRIMARY KEY (query, site, location)
+        )
+    ''')
+
+
+def _normalize(text: str) -> str:
+    return re.sub(r"\s+", " ", (text or "").strip()).lower()
+
+
+def _query_text(phrase: str, terms: str = "") -> str:
+    """
+    The query text of a search: the exact phrase in quotes plus free terms.
+
+    Only the role is quoted; a skill is a separate term, since postings rarely
+    contain "<role> <skill>" verbatim. A bare phrase keeps its unquoted form
+    (the key query_stats has always used for role-only searches).
+    """
+    return f'"{phrase}" {terms}' if terms else phrase
+
+
+def _candidate_queries(profile: CompiledProfile) -> List[Tuple[Dict, float]]:
+    """Deduplicated ({query, phrase, terms}, weight) pairs from the roles and skills in the profile"""
+    roles = [(profile.current_role, 1.0)]
+    roles += [(title, PAST_TITLE_WEIGHT) for title in profile.past_titles]
+
+    queries: Dict[str, Tuple[Dict, float]] = {}
+
+    def add(phrase: str, terms: str, weight: float):
+        phrase, terms = phrase.strip(), terms.strip()
+        key = _normalize(_query_text(phrase, terms))
+        if phrase and (key not in queries or queries[key][1] < weight):
+            queries[key] = ({"query": _query_text(phrase, terms), "phrase": phrase, "terms": terms}, weight)
+
+    for role, role_weight in roles:
+        add(role, "", role_weight)
+        for i, skill in enumerate(profile.skills):
+            # "Python Developer" + "Python" would just repeat the role query
+            if _normalize(skill) in _normalize(role):
+                continue
+            add(role, skill, role_weight * SKILL_DECAY ** (i + 1))
+    return list(queries.values())
+
+
+def _candidate_locations(profile: CompiledProfile) -> List[Tuple[str, float]]:
+    locations = [(location, LOCATION_DECAY ** i) for i, location in enumerate(profile.locations)]
+    return locations or [("", 1.0)]
+
+
+def _load_stats(conn) -> Tuple[Dict, Dict, float]:
+    """Per-search stats, per-site relevant-per-call rates and the overall rate"""
+    _init_query_stats(conn)
+    rows = conn.execute("SELECT query, site, location, calls, results, relevant FROM query_stats").fetchall()
+    stats = {(row[0], row[1], row[2]): {"calls": row[3], "results": row[4], "relevant": row[5]} for row in rows}
+
+    site_totals: Dict[str, List[int]] = {}
+    for (_, site, _), row in stats.items():
+        totals = site_totals.setdefault(site, [0, 0])
+        totals[0] += row["calls"]
+        totals[1] += row["relevant"]
+    all_calls = sum(calls for calls, _ in site_totals.values())
+    overall = sum(relevant for _, relevant in site_totals.values()) / all_calls if all_calls else None
+    # Smoothed towards the overall rate so one lucky call doesn't dominate the plan
+    site_rates = {
+        site: (relevant + PRIOR_WEIGHT * overall) / (calls + PRIOR_WEIGHT)
+        for site, (calls, relevant) in site_totals.items() if calls
+    } if overall is not None else {}
+    return stats, site_rates, overall
+
+
+def plan_queries(profile, sites: List[str], max_queries: int = 20) -> List[Dict]:
+    """
+    Expand the profile into (query, site, location) searches ranked by expected yield.
+
+    Expected yield is relevant results per API call. Searches that ran before
+    blend their observed rate with a prior; new ones use the prior. The prior
+    is the site's historical rate (or a fixed guess before any history),
+    scaled down for later skills and locations in the profile. Selection is
+    greedy with diminishing returns for repeating a site or query, so the plan
+    spreads across both.
+    """
+    profile = compile_profile(profile)
+    conn = connect()
+    try:
+        stats, site_rates, overall = _load_stats(conn)
+    finally:
+        conn.close()
+
+    candidates = []
+    for search, query_weight in _candidate_queries(profile):
+        query = search["query"]
+        for location, location_weight in _candidate_locations(profile):
+            for site in sites:
+                # Once there is history, the overall observed rate replaces the fixed prior
+                base = overall if overall is not None else PRIOR_RELEVANT_PER_CALL
+                if overall and site in site_rates:
+                    base = site_rates[site]
+                prior = base * query_weight * location_weight
+                observed = stats.get((query, site, location))
+                if observed:
+                    expected = (observed["relevant"] + PRIOR_WEIGHT * prior) / (observed["calls"] + PRIOR_WEIGHT)
+                else:
+                    expected = prior
+                candidates.append({**search, "site": site, "location": location, "expected_yield": expected})
+
+    plan = []
+    site_counts: Dict[str, int] = {}
+    query_counts: Dict[str, int] = {}
+
+    def adjusted(candidate):
+        return (candidate["expected_yield"]
+                * SITE_REPEAT_DECAY ** site_counts.get(candidate["site"], 0)
+                * QUERY_REPEAT_DECAY ** query_counts.get(candidate["query"], 0))
+
+    while candidates and len(plan) < max_queries:
+        best = max(range(len(candidates)), key=lambda i: adjusted(candidates[i]))
+        choice = candidates.pop(best)
+        choice["expected_yield"] = round(adjusted(choice), 3)
+        plan.append(choice)
+        site_counts[choice["site"]] = site_counts.get(choice["site"], 0) + 1
+        query_counts[choice["query"]] = query_counts.get(choice["query"], 0) + 1
+    return plan
+
+
+def record_query_stats(results: List[Dict]):
+    """Add the outcome of executed searches ({query, site, location, calls, results, relevant}) to query_stats"""
+    if not results:
+        return
+    now = datetime.now().isoformat()
+    conn = connect()
+    _init_query_stats(conn)
+    conn.executemany('''
+        INSERT INTO query_stats (query, site, location, calls, results, relevant, last_run_at)
+        VALUES (?, ?, ?, ?, ?, ?, ?)
+        ON CONFLICT(query, site, location) DO UPDATE SET
+            calls = calls + excluded.calls,
+            results = results + excluded.results,
+            relevant = relevant + excluded.relevant,
+            last_run_at = excluded.last_run_at
+    ''', [
+        (r["query"], r["site"], r.get("location") or "", r["calls"], r["results"], r["relevant"], now)
+        for r in results if r["calls"]
+    ])
+    conn.commit()
+    conn.close()
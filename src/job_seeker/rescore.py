@@ -0,0 +1,115 @@
+"""
+Parallel re-scoring of stored jobs across a process pool.
+
+The job_opportunities table is split into id-range shards, several per
+worker so fast workers pick up the slack of slow ones. Every worker process
+opens its own SQLite connection, scores its shards in batches and writes the
+scores back one batch per transaction; WAL mode and the busy timeout let the
+workers' short write transactions interleave.
+"""
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Dict, List, Tuple
+
+from .db import connect, get_db_path
+
+_SCORE_COLUMNS = ["id", "title", "company", "location", "url", "description",
+                  "full_description", "salary_range", "job_type"]
+
+# Per-process state, set up once by _init_worker
+_worker = {}
+
+
+def _init_worker(db_path: str, profile_json: str, batch_size: int):
+    # Already imported when the worker was forked; spawned workers import it here
+    from .tools.job_search_tools import _score_jobs
+
+    _worker["conn"] = connect(db_path)
+    _worker["profile"] = json.loads(profile_json)
+    _worker["batch_size"] = batch_size
+    _worker["score_jobs"] = _score_jobs
+
+
+def _rescore_shard(first_id: int, last_id: int) -> int:
+    """Score rows with first_id <= id <= last_id; returns the number of rows scored"""
+    conn = _worker["conn"]
+    columns = ", ".join(_SCORE_COLUMNS)
+    scored = 0
+    after = first_id - 1
+    while True:
+        # Keyset pages, fully fetched before writing: an open read cursor
+        # would pin a snapshot and make the write fail once another worker
+        # has committed
+        rows = conn.execute(
+            f"SELECT {columns} FROM job_opportunities WHERE id > ? AND id <= ? ORDER BY id LIMIT ?",
+            (after, last_id, _worker["batch_size"])
+        ).fetchall()
+        if not rows:
+            break
+        after = rows[-1][0]
+        jobs = [dict(zip(_SCORE_COLUMNS, row)) for row in rows]
+        updates = [
+            (job["match_score"], job["evaluation_date"], job["id"])
+            for job in _worker["score_jobs"](jobs, _worker["profile"])
+        ]
+        conn.executemany(
+            "UPDATE job_opportunities SET match_score = ?, evaluation_date = ? WHERE id = ?", updates
+        )
+        conn.commit()
+        scored += len(updates)
+    return scored
+
+
+def _shards(conn, count: int) -> List[Tuple[int, int]]:
+    """Split the id range into about `count` shards of similar row counts"""
+    total = conn.execute("SELECT COUNT(*) FROM job_opportunities").fetchone()[0]
+    if not total:
+        return []
+    step = max(1, -(-total // count))
+    # Every step-th id marks a shard boundary, so gaps in the ids don't skew shard sizes
+    starts = [row[0] for row in conn.execute(
+        "SELECT id FROM (SELECT id, ROW_NUMBER() OVER (ORDER BY id) - 1 AS n FROM job_opportunities) "
+        "WHERE n % ? = 0 ORDER BY id", (step,)
+    )]
+    last = conn.execute("SELECT MAX(id) FROM job_opportunities").fetchone()[0]
+    return [(start, (starts[i + 1] - 1) if i + 1 < len(starts) else last) for i, start in enumerate(starts)]
+
+
+def rescore_stored_jobs(profile: Dict, workers: int = None, batch_size: int = 500,
+                        shards_per_worker: int = 4, progress: bool = True) -> Dict:
+    """
+    Re-score every stored job against `profile` in parallel.
+
+    Returns {"rows", "shards", "workers", "seconds"}.
+    """
+    workers = workers or os.cpu_count() or 1
+    db_path = os.path.abspath(get_db_path())
+    conn = connect(db_path)
+    try:
+        has_jobs = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'job_opportunities'"
+        ).fetchone()
+        shards = _shards(conn, workers * shards_per_worker) if has_jobs else []
+        total = conn.execute("SELECT COUNT(*) FROM job_opportunities").fetchone()[0] if has_jobs else 0
+    finally:
+        conn.close()
+
+    # Import the scoring code (and crewai) once, before forking, rather than in every worker
+    from .tools.job_search_tools import _score_jobs  # noqa: F401
+
+    started = time.perf_counter()
+    done = 0
+    if shards:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(db_path, json.dumps(profile), batch_size)) as pool:
+            futures = [pool.submit(_rescore_shard, first, last) for first, last in shards]
+            for finished, future in enumerate(as_completed(futures), 1):
+                done += future.result()
+                if progress:
+                    elapsed = time.perf_counter() - started
+                    print(f"   shard {finished}/{len(shards)}  {done:,}/{total:,} jobs  "
+                          f"{done / elapsed if elapsed else 0:,.0f} jobs/s")
+    return {"rows": done, "shards": len(shards), "workers": workers,
+            "seconds": time.perf_counter() - started}
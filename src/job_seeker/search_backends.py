@@ -0,0 +1,469 @@
+"""
+Pluggable search backends for job_search_tool.
+
+- SerperBackend calls the Serper API (or any server speaking its protocol)
+- RecordingBackend wraps another backend and saves every raw response to disk
+- CachingBackend wraps another backend with a SQLite response cache shared
+  by concurrent runs, for batches of profiles with overlapping queries
+- ReplayBackend serves saved responses offline, with configurable latency and
+  error rate, falling back to synthetic results for unrecorded queries
+- StandInServer exposes a ReplayBackend over HTTP as a local Serper stand-in
+
+The backend used by the tools is chosen with JOB_SEEKER_SEARCH_BACKEND:
+``serper`` (default), ``record``, ``replay`` or an ``http://`` URL of a
+stand-in server. Usage of the stand-in server:
+
+    python -m job_seeker.search_backends --recordings serper_recordings --port 8765 --latency 0.2 --error-rate 0.05
+"""
+import argparse
+import hashlib
+import json
+import os
+import random
+import threading
+import time
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List
+
+SERPER_URL = "https://google.serper.dev"
+DEFAULT_RECORDINGS_DIR = "serper_recordings"
+
+
+class SearchBackendError(Exception):
+    """Raised when a backend cannot produce results for a query"""
+
+
+def _request_key(query: str, num: int, page: int) -> str:
+    payload = json.dumps([query.strip().lower(), num, page])
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+class SearchBackend:
+    """Interface: return the raw Serper JSON response for a query"""
+
+    name = "base"
+    # Whether job_search_tool may substitute mock jobs when this backend fails.
+    # Offline backends disable it so failures stay visible under load tests.
+    allow_mock_fallback = False
+    # Pause between consecutive searches to respect the provider's rate limit
+    rate_limit_seconds = 0.0
+
+    def search(self, query: str, num: int = 10, page: int = 1) -> Dict:
+        raise NotImplementedError
+
+
+class SerperBackend(SearchBackend):
+    """Serper API client, reusing one HTTP session across searches"""
+
+    name = "serper"
+    allow_mock_fallback = True
+    rate_limit_seconds = 1.0
+
+    def __init__(self, base_url: str = SERPER_URL, api_key: str = None, timeout: float = 10):
+        import requests
+
+        self.base_url = base_url.rstrip("/")
+        self.api_key = api_key or os.environ.get("SERPER_API_KEY", "")
+        self.timeout = timeout
+        self.session = requests.Session()
+
+    def search(self, query: str, num: int = 10, page: int = 1) -> Dict:
+        payload = {"q": query, "num": num}
+        if page > 1:
+            payload["page"] = page
+        try:
+            response = self.session.post(
+                f"{self.base_url}/search",
+                headers={"X-API-KEY": self.api_key, "Content-Type": "application/json"},
+                json=payload,
+                timeout=self.timeout,
+            )
+            response.raise_for_status()
+            return response.json()
+        except Exception as e:
+            raise SearchBackendError(f"Search request failed: {e}") from e
+
+
+class RecordingBackend(SearchBackend):
+    """Delegate to another backend and save each raw response as a JSON file"""
+
+    name = "record"
+
+    def __init__(self, inner: SearchBackend, directory: str = DEFAULT_RECORDINGS_DIR):
+        self.inner = inner
+        self.directory = directory
+        self.allow_mock_fallback = inner.allow_mock_fallback
+        self.rate_limit_seconds = inner.rate_limit_seconds
+        os.makedirs(directory, exist_ok=True)
+
+    def search(self, query: str, num: int = 10, page: int = 1) -> Dict:
+        response = self.inner.search(query, num=num, page=page)
+        recording = {
+            "request": {"q": query, "num": num, "page": page},
+            "response": response,
+            "recorded_at": datetime.now().isoformat(),
+        }
+        path = os.path.join(self.directory, f"{_request_key(query, num, page)}.json")
+        with open(f"{path}.tmp", "w") as f:
+            json.dump(recording, f, indent=2)
+        os.replace(f"{path}.tmp", path)
+        return response
+
+
+class CachingBackend(SearchBackend):
+    """
+    Delegate to another backend, caching responses in SQLite for `ttl_seconds`.
+
+    Concurrent requests for the same query wait for the first one instead of
+    repeating it. The inner backend's rate limit is enforced here, across
+    threads and on cache misses only, so cache hits are free.
+    """
+
+    name = "cached"
+
+    def __init__(self, inner: SearchBackend, db_path: str, ttl_seconds: float = 6 * 3600):
+        from .db import connect
+
+        self.inner = inner
+        self.ttl_seconds = ttl_seconds
+        self.allow_mock_fallback = inner.allow_mock_fallback
+        self.rate_limit_seconds = 0.0
+        self.hits = 0
+        self.misses = 0
+        self._conn = connect(db_path, check_same_thread=False)
+        self._conn.execute('''
+            CREATE TABLE IF NOT EXISTS search_cache (
+                key TEXT PRIMARY KEY,
+                query TEXT,
+                num INTEGER,
+                page INTEGER,
+                response TEXT NOT NULL,
+                created_at REAL NOT NULL
+            )
+        ''')
+        self._conn.commit()
+        self._lock = threading.Lock()
+        # key -> [lock, number of requests using it]; removed once the last one is done
+        self._in_flight: Dict[str, list] = {}
+        self._next_request = 0.0
+
+    def _cached(self, key: str):
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT response, created_at FROM search_cache WHERE key = ?", (key,)
+            ).fetchone()
+        if row and time.time() - row[1] < self.ttl_seconds:
+            return json.loads(row[0])
+        return None
+
+    def search(self, query: str, num: int = 10, page: int = 1) -> Dict:
+        key = _request_key(query, num, page)
+        with self._lock:
+            entry = self._in_flight.setdefault(key, [threading.Lock(), 0])
+            entry[1] += 1
+        try:
+            with entry[0]:
+                return self._search(key, query, num, page)
+        finally:
+            with self._lock:
+                entry[1] -= 1
+                if not entry[1]:
+                    del self._in_flight[key]
+
+    def _search(self, key: str, query: str, num: int, page: int) -> Dict:
+        """Answer from the cache or the inner backend; the caller holds the key's lock"""
+        response = self._cached(key)
+        if response is not None:
+            with self._lock:
+                self.hits += 1
+            return response
+
+        with self._lock:
+            wait = self._next_request - time.monotonic()
+            self._next_request = max(self._next_request, time.monotonic()) + self.inner.rate_limit_seconds
+        if wait > 0:
+            time.sleep(wait)
+        response = self.inner.search(query, num=num, page=page)
+        with self._lock:
+            self.misses += 1
+            self._conn.execute(
+                "INSERT OR REPLACE INTO search_cache (key, query, num, page, response, created_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (key, query, num, page, json.dumps(response), time.time())
+            )
+            self._conn.commit()
+        return response
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+class ReplayBackend(SearchBackend):
+    """
+    Serve recorded responses without network access.
+
+    Queries without a recording get a deterministic synthetic response (or a
+    SearchBackendError when `strict`), so arbitrary query mixes can be
+    load-tested. `latency` seconds (+/- `jitter`) are slept per search and a
+    fraction `error_rate` of searches fail. With `link_base` set (a
+    StandInServer sets its own URL), synthetic result links point at that
+    server's /job pages instead of the job sites, so enrichment and liveness
+    checks run offline too.
+    """
+
+    name = "replay"
+
+    def __init__(self, directory: str = DEFAULT_RECORDINGS_DIR, latency: float = 0.0, jitter: float = 0.0,
+                 error_rate: float = 0.0, strict: bool = False, seed: int = None):
+        self.directory = directory
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.strict = strict
+        self.link_base = None
+        self._random = random.Random(seed)
+        self._random_lock = threading.Lock()
+        self.recordings = self._load(directory)
+
+    @staticmethod
+    def _load(directory: str) -> Dict[str, Dict]:
+        recordings = {}
+        if not os.path.isdir(directory):
+            return recordings
+        for filename in sorted(os.listdir(directory)):
+            if not filename.endswith(".json"):
+                continue
+            try:
+                with open(os.path.join(directory, filename)) as f:
+                    recording = json.load(f)
+                request = recording["request"]
+                key = _request_key(request["q"], request.get("num", 10), request.get("page", 1))
+                recordings[key] = recording["response"]
+            except (OSError, KeyError, json.JSONDecodeError) as e:
+                print(f"Skipping unreadable recording {filename}: {e}")
+        return recordings
+
+    def _synthetic_response(self, query: str, num: int, page: int) -> Dict:
+        from .benchmarks.corpus import generate_postings
+
+        seed = int(_request_key(query, num, page)[:8], 16)
+        organic = [
+            {"title": p["title"], "link": self._link(p["link"]), "snippet": p["snippet"],
+             "position": (page - 1) * num + i + 1}
+            for i, p in enumerate(generate_postings(num, seed=seed))
+        ]
+        return {"searchParameters": {"q": query, "num": num, "page": page}, "organic": organic}
+
+    def _link(self, link: str) -> str:
+        """https://<site>/job/... -> <link_base>/job/<site>/job/..., served by the stand-in"""
+        if not self.link_base:
+            return link
+        return f"{self.link_base}/job/{link.split('://', 1)[-1]}"
+
+    def search(self, query: str, num: int = 10, page: int = 1) -> Dict:
+        with self._random_lock:
+            delay = max(0.0, self.latency + self._random.uniform(-self.jitter, self.jitter))
+            fail = self._random.random() < self.error_rate
+        if delay:
+            time.sleep(delay)
+        if fail:
+            raise SearchBackendError("Injected replay error")
+
+        response = self.recordings.get(_request_key(query, num, page))
+        if response is None:
+            if self.strict:
+                raise SearchBackendError(f"No recording for query {query!r} (num={num}, page={page})")
+            response = self._synthetic_response(query, num, page)
+        return response
+
+
+def _synthetic_job_page(path: str) -> str:
+    """Deterministic HTML job page for a stand-in URL path"""
+    from .benchmarks.corpus import generate_postings
+
+    seed = int(hashlib.sha1(path.encode("utf-8")).hexdigest()[:8], 16)
+    posting = next(generate_postings(1, seed=seed))
+    paragraphs = "".join(
+        f"<p>{sentence}.</p>" for sentence in posting["snippet"].split(". ") if sentence
+    )
+    return (
+        f"<html><head><title>{posting['title']}</title></head><body>"
+        f"<nav>Home | Jobs | Sign in</nav><main><h1>{posting['title']}</h1>"
+        f"<div class=\"job-description\">{paragraphs}"
+        "<p>We are looking for an engineer who enjoys building reliable systems, "
+        "collaborating across teams and mentoring others. You will own services end to end, "
+        "from design through deployment and operation, and help shape our engineering culture.</p>"
+        f"</div></main><footer>© Stand-in Jobs</footer></body></html>"
+    )
+
+
+class StandInServer:
+    """
+    Local HTTP server answering Serper-style POST /search requests from a
+    ReplayBackend, and GET/HEAD /job/... with synthetic job pages (with ETags).
+
+    `dead_rate` is the fraction of job pages answered with 410 Gone, picked
+    deterministically by path, to exercise liveness checks.
+    """
+
+    def __init__(self, backend: ReplayBackend, host: str = "127.0.0.1", port: int = 8765,
+                 dead_rate: float = 0.0):
+        self.backend = backend
+        self.dead_rate = dead_rate
+        handler = self._make_handler(backend, dead_rate)
+        self.httpd = ThreadingHTTPServer((host, port), handler)
+        self.httpd.daemon_threads = True
+        self._thread = None
+        # Synthetic results link to this server's job pages
+        if backend.link_base is None:
+            backend.link_base = self.url
+
+    @property
+    def url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @staticmethod
+    def _make_handler(backend: ReplayBackend, dead_rate: float = 0.0):
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, format, *args):
+                pass
+
+            def _send_json(self, status: int, body: Dict):
+                data = json.dumps(body).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def _job_page(self, head: bool):
+                # Synthetic job detail pages, for enrichment and liveness checks
+                if not self.path.startswith("/job"):
+                    self._send_json(404, {"message": "Not found"})
+                    return
+                if int(hashlib.sha1(self.path.encode("utf-8")).hexdigest()[:8], 16) / 0xFFFFFFFF < dead_rate:
+                    self._send_json(410, {"message": "This job is no longer available"})
+                    return
+                body = _synthetic_job_page(self.path).encode("utf-8")
+                etag = '"' + hashlib.sha1(body).hexdigest()[:16] + '"'
+                if self.headers.get("If-None-Match") == etag:
+                    self.send_response(304)
+                    self.send_header("ETag", etag)
+                    self.end_headers()
+                    return
+                self.send_response(200)
+                self.send_header("Content-Type", "text/html; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.send_header("ETag", etag)
+                self.end_headers()
+                if not head:
+                    self.wfile.write(body)
+
+            def do_GET(self):
+                self._job_page(head=False)
+
+            def do_HEAD(self):
+                self._job_page(head=True)
+
+            def do_POST(self):
+                if self.path.rstrip("/") != "/search":
+                    self._send_json(404, {"message": "Not found"})
+                    return
+                try:
+                    length = int(self.headers.get("Content-Length", 0))
+                    payload = json.loads(self.rfile.read(length) or b"{}")
+                    response = backend.search(payload.get("q", ""), num=int(payload.get("num", 10)),
+                                              page=int(payload.get("page", 1)))
+                    self._send_json(200, response)
+                except SearchBackendError as e:
+                    self._send_json(500, {"message": str(e)})
+                except (ValueError, json.JSONDecodeError) as e:
+                    self._send_json(400, {"message": f"Bad request: {e}"})
+
+        return Handler
+
+    def start(self) -> "StandInServer":
+        """Serve in a background thread (for tests and benchmarks)"""
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def serve_forever(self):
+        self.httpd.serve_forever()
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+_backend = None
+_backend_lock = threading.Lock()
+
+
+def get_search_backend() -> SearchBackend:
+    """Return the process-wide backend selected by JOB_SEEKER_SEARCH_BACKEND"""
+    global _backend
+    with _backend_lock:
+        if _backend is None:
+            _backend = create_search_backend(os.environ.get("JOB_SEEKER_SEARCH_BACKEND", "serper"))
+        return _backend
+
+
+def set_search_backend(backend: SearchBackend):
+    """Install a backend for this process (None restores the environment default)"""
+    global _backend
+    with _backend_lock:
+        _backend = backend
+
+
+def create_search_backend(spec: str) -> SearchBackend:
+    """Build a backend from a JOB_SEEKER_SEARCH_BACKEND value"""
+    recordings = os.environ.get("JOB_SEEKER_RECORDINGS", DEFAULT_RECORDINGS_DIR)
+    spec = (spec or "serper").strip()
+    if spec == "serper":
+        return SerperBackend()
+    if spec == "record":
+        return RecordingBackend(SerperBackend(), recordings)
+    if spec == "replay":
+        return ReplayBackend(
+            recordings,
+            latency=float(os.environ.get("JOB_SEEKER_REPLAY_LATENCY", 0)),
+            error_rate=float(os.environ.get("JOB_SEEKER_REPLAY_ERROR_RATE", 0)),
+        )
+    if spec.startswith(("http://", "https://")):
+        backend = SerperBackend(base_url=spec)
+        backend.name = "stand-in"
+        backend.allow_mock_fallback = False
+        backend.rate_limit_seconds = 0.0
+        return backend
+    raise ValueError(f"Unknown search backend: {spec}")
+
+
+def main(argv: List[str] = None):
+    parser = argparse.ArgumentParser(description="Run a local Serper stand-in server")
+    parser.add_argument("--recordings", default=DEFAULT_RECORDINGS_DIR, help="Directory of recorded responses")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds added to every response")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Random +/- seconds around the latency")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests answered with HTTP 500")
+    parser.add_argument("--strict", action="store_true", help="Fail unrecorded queries instead of synthesizing results")
+    parser.add_argument("--dead-rate", type=float, default=0.0, help="Fraction of job pages answered with 410 Gone")
+    args = parser.parse_args(argv)
+
+    backend = ReplayBackend(args.recordings, latency=args.latency, jitter=args.jitter,
+                            error_rate=args.error_rate, strict=args.strict)
+    server = StandInServer(backend, args.host, args.port, dead_rate=args.dead_rate)
+    print(f"🧪 Serper stand-in serving {len(backend.recordings)} recording(s) at {server.url}")
+    print(f"   Use it with JOB_SEEKER_SEARCH_BACKEND={server.url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,171 @@
+"""
+Async variants of the job search, planned search and database tools.
+
+They keep the names and arguments of the tools in job_search_tools.py, so a
+crew can switch between the two sets without changing its prompts. Search
+requests run concurrently (bounded per call) with the backend's blocking
+client moved to worker threads and rate limiting done with asyncio.sleep;
+SQLite work runs in worker threads so it doesn't block the event loop.
+"""
+import asyncio
+import json
+import time
+from typing import Dict, List
+
+from crewai.tools import tool
+
+from .. import metrics
+from ..query_planner import FIRST_PAGE_SHARE, plan_queries, record_query_stats
+from ..search_backends import get_search_backend
+from .job_search_tools import (
+    DEFAULT_SEARCH_SITES,
+    SERPER_PAGE_SIZE,
+    _AdaptiveSearch,
+    _delete_job,
+    _retrieve_jobs,
+    _store_jobs,
+    _update_job,
+)
+
+# Search requests in flight at once within one tool call
+SEARCH_CONCURRENCY = 4
+
+
+class _RateLimiter:
+    """Space requests at least `interval` seconds apart, across coroutines"""
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self._next_slot = 0.0
+        self._lock = asyncio.Lock()
+
+    async def wait(self):
+        if not self.interval:
+            return
+        async with self._lock:
+            delay = self._next_slot - time.monotonic()
+            self._next_slot = max(self._next_slot, time.monotonic()) + self.interval
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+async def _adaptive_search_async(backend, targets: List[Dict], max_per_target: int, total_budget: int,
+                                 profile: Dict = None, call_budget: int = None,
+                                 concurrency: int = SEARCH_CONCURRENCY):
+    """
+    Run an adaptive-depth search (see _AdaptiveSearch) with up to
+    `concurrency` requests in flight.
+
+    Requests go out in rounds: the best next requests are claimed, fetched
+    together, and absorbed in claim order so results stay deterministic.
+    Returns the results and per-target stats ({calls, results, relevant}).
+    """
+    search = _AdaptiveSearch(backend, targets, max_per_target, total_budget, profile, call_budget)
+    limiter = _RateLimiter(backend.rate_limit_seconds)
+
+    async def fetch(index: int, page: int, site_query: str):
+        await limiter.wait()
+        with metrics.timer("search_request_seconds", site=search.stats[index]["site"]):
+            return await asyncio.to_thread(backend.search, site_query, SERPER_PAGE_SIZE, page)
+
+    while True:
+        requests = search.next_requests(concurrency)
+        if not requests:
+            break
+        responses = await asyncio.gather(*(fetch(*request) for request in requests), return_exceptions=True)
+        for (index, page, _), response in zip(requests, responses):
+            if isinstance(response, Exception):
+                search.fail(index, page, response)
+                continue
+            try:
+                search.absorb(index, page, response)
+            except Exception as e:
+                search.fail(index, page, e)
+
+    return search.results[:total_budget], search.stats
+
+
+@tool("job_search_tool")
+@metrics.timed("tool_seconds", tool="job_search_tool")
+async def job_search_tool(query: str, sites: List[str] = None, max_results: int = 20,
+                          total_results: int = 100, user_profile: str = None) -> str:
+    """
+    Search for job opportunities across multiple platforms using the Serper search API
+
+    Args:
+        query: Job search query (e.g., "AI Engineer", "Machine Learning")
+        sites: List of job sites to search (default: major job boards)
+        max_results: Maximum number of results to return per site
+        total_results: Maximum number of results for the whole search across all sites
+        user_profile: Optional JSON user profile; relevance is then judged by match score
+    """
+    profile = None
+    if user_profile:
+        try:
+            profile = json.loads(user_profile) if isinstance(user_profile, str) else user_profile
+        except json.JSONDecodeError:
+            profile = None
+
+    targets = [{"site": site, "query": query} for site in sites or DEFAULT_SEARCH_SITES]
+    results, _ = await _adaptive_search_async(get_search_backend(), targets, max_results, total_results, profile)
+
+    return json.dumps(results, indent=2)
+
+
+@tool("planned_job_search_tool")
+@metrics.timed("tool_seconds", tool="planned_job_search_tool")
+async def planned_job_search_tool(user_profile: str, sites: List[str] = None, call_budget: int = 30,
+                                  total_results: int = 100) -> str:
+    """
+    Search for jobs with a query plan built from the whole user profile
+
+    Expands the profile's roles, skills and preferred locations into targeted
+    (query, site, location) searches ranked by their historical hit rate, and
+    runs them within a fixed number of search API calls.
+
+    Args:
+        user_profile: JSON string containing the user's profile
+        sites: List of job sites to search (default: major job boards)
+        call_budget: Maximum number of search API calls
+        total_results: Maximum number of results for the whole search
+    """
+    try:
+        profile = json.loads(user_profile) if isinstance(user_profile, str) else user_profile
+    except json.JSONDecodeError as e:
+        return f"Error: invalid user_profile JSON: {e}"
+
+    plan = await asyncio.to_thread(plan_queries, profile, sites or DEFAULT_SEARCH_SITES,
+                                   max(1, int(call_budget * FIRST_PAGE_SHARE)))
+    for entry in plan:
+        print(f"Planned: {entry['query']} | {entry['site']} | {entry['location'] or 'any'} "
+              f"(expected {entry['expected_yield']:.2f}/call)")
+
+    results, stats = await _adaptive_search_async(get_search_backend(), plan, SERPER_PAGE_SIZE * 3,
+                                                   total_results, profile, call_budget=call_budget)
+    await asyncio.to_thread(record_query_stats, stats)
+
+    return json.dumps(results, indent=2)
+
+
+@tool("database_tool")
+@metrics.timed("tool_seconds", tool="database_tool")
+async def database_tool(action: str, data: str = None) -> str:
+    """
+    Perform database operations
+
+    Args:
+        action: 'store', 'retrieve', 'update', 'delete'
+        data: JSON string containing data for the operation
+    """
+    operations = {
+        'store': _store_jobs,
+        'retrieve': _retrieve_jobs,
+        'update': _update_job,
+        'delete': _delete_job,
+    }
+    if action not in operations:
+        return f"Unknown action: {action}"
+    try:
+        return await asyncio.to_thread(operations[action], data)
+    except Exception as e:
+        return f"Database error: {e}"
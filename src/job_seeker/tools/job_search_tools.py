@@ -1,101 +1,333 @@
 """
 Custom tools for job searching and evaluation
 """
+import heapq
 import json
+import os
 import sqlite3
-import requests
 from typing import List, Dict, Any
 from datetime import datetime
 from crewai.tools import tool
-from crewai_tools import SerperDevTool
 import re
-from urllib.parse import urljoin, urlparse
 import time
 
+from .. import metrics
+from ..db import connect, ensure_columns
+from ..embeddings import job_text, semantic_scores, semantic_weight
+from ..enrichment import _init_pages_table, enrich_jobs
+from ..profiles import CompiledProfile, compile_profile, salary_bounds
+from ..query_planner import FIRST_PAGE_SHARE, plan_queries, record_query_stats
+from ..search_backends import get_search_backend
+
+
+DEFAULT_SEARCH_SITES = [
+    "indeed.com",
+    "linkedin.com/jobs",
+    "glassdoor.com",
+    "monster.com",
+    "ziprecruiter.com",
+    "dice.com",
+    "angel.co",
+    "remote.co"
+]
+
+# Reports list at most REPORT_TOP_K jobs scoring at least REPORT_MIN_SCORE
+REPORT_MIN_SCORE = 70
+REPORT_TOP_K = 10
+# Jobs job_evaluation_tool returns by default: the report's top 10 plus headroom for
+# the storage and strategy stages; jobs below the cut are never serialized
+EVALUATION_TOP_K = 3 * REPORT_TOP_K
+
+# Serper returns at most this many organic results per page
+SERPER_PAGE_SIZE = 10
+# Keep paging a site while at least this fraction of a page is new and relevant
+MIN_PAGE_YIELD = 0.3
+# Match score (with a profile) or query relevance x100 (without) that counts as relevant
+RELEVANT_SCORE = 50
+# Stored when a snippet names no location; hard location constraints let these through
+UNKNOWN_LOCATION = "Location not specified"
+
 
 @tool("job_search_tool")
-def job_search_tool(query: str, sites: List[str] = None, max_results: int = 20) -> str:
+@metrics.timed("tool_seconds", tool="job_search_tool")
+def job_search_tool(query: str, sites: List[str] = None, max_results: int = 20,
+                    total_results: int = 100, user_profile: str = None) -> str:
     """
-    Search for job opportunities across multiple platforms using SerperDevTool
+    Search for job opportunities across multiple platforms using the Serper search API
     
     Args:
         query: Job search query (e.g., "AI Engineer", "Machine Learning")
         sites: List of job sites to search (default: major job boards)
         max_results: Maximum number of results to return per site
+        total_results: Maximum number of results for the whole search across all sites
+        user_profile: Optional JSON user profile; relevance is then judged by match score
     """
     if sites is None:
-        sites = [
-            "indeed.com",
-            "linkedin.com/jobs",
-            "glassdoor.com",
-            "monster.com",
-            "ziprecruiter.com",
-            "dice.com",
-            "angel.co",
-            "remote.co"
-        ]
+        sites = DEFAULT_SEARCH_SITES
+    
+    # Search backend (Serper, recording, replay or local stand-in; see search_backends.py)
+    backend = get_search_backend()
+    
+    profile = None
+    if user_profile:
+        try:
+            profile = json.loads(user_profile) if isinstance(user_profile, str) else user_profile
+        except json.JSONDecodeError:
+            profile = None
+    
+    targets = [{"site": site, "query": query} for site in sites]
+    results, _ = _adaptive_search(backend, targets, max_results, total_results, profile)
+    
+    return json.dumps(results, indent=2)
+
+
+@tool("planned_job_search_tool")
+@metrics.timed("tool_seconds", tool="planned_job_search_tool")
+def planned_job_search_tool(user_profile: str, sites: List[str] = None, call_budget: int = 30,
+                            total_results: int = 100) -> str:
+    """
+    Search for jobs with a query plan built from the whole user profile
+    
+    Expands the profile's roles, skills and preferred locations into targeted
+    (query, site, location) searches ranked by their historical hit rate, and
+    runs them within a fixed number of search API calls.
     
-    # Initialize SerperDevTool
-    serper_tool = SerperDevTool(n_results=max_results)
+    Args:
+        user_profile: JSON string containing the user's profile
+        sites: List of job sites to search (default: major job boards)
+        call_budget: Maximum number of search API calls
+        total_results: Maximum number of results for the whole search
+    """
+    try:
+        profile = json.loads(user_profile) if isinstance(user_profile, str) else user_profile
+    except json.JSONDecodeError as e:
+        return f"Error: invalid user_profile JSON: {e}"
+    
+    plan = plan_queries(profile, sites or DEFAULT_SEARCH_SITES,
+                        max_queries=max(1, int(call_budget * FIRST_PAGE_SHARE)))
+    for entry in plan:
+        print(f"Planned: {entry['query']} | {entry['site']} | {entry['location'] or 'any'} "
+              f"(expected {entry['expected_yield']:.2f}/call)")
     
-    results = []
+    results, stats = _adaptive_search(get_search_backend(), plan, SERPER_PAGE_SIZE * 3,
+                                      total_results, profile, call_budget=call_budget)
+    record_query_stats(stats)
     
-    for site in sites:
+    return json.dumps(results, indent=2)
+
+
+def _relevance(job: Dict, query: str, profile: CompiledProfile = None) -> float:
+    """Score how relevant a search result is, 0-100"""
+    if profile:
+        return _calculate_match_score(job, profile)
+    terms = [term for term in re.findall(r"[a-z0-9+#.]+", query.lower()) if len(term) > 1]
+    if not terms:
+        return 100.0
+    text = f"{job.get('title', '')} {job.get('description', '')}".lower()
+    return 100.0 * sum(1 for term in terms if term in text) / len(terms)
+
+
+class _AdaptiveSearch:
+    """
+    Bookkeeping for paging through search targets ({site, query, location}) with adaptive depth.
+
+    Every target gets its first page, in order. After that the target whose
+    last page had the best yield (share of new, non-duplicate, relevant
+    results) is paged next, and a target stops once its yield drops below
+    MIN_PAGE_YIELD, its results run out, or it reaches `max_per_target`. The
+    whole search stops at `total_budget` results or `call_budget` API calls.
+
+    The sync and async tools and the streaming pipeline drive the requests;
+    this class decides what to fetch next and absorbs the pages. Without
+    `keep_results` the absorbed jobs are only returned, not collected.
+    """
+
+    def __init__(self, backend, targets: List[Dict], max_per_target: int, total_budget: int,
+                 profile: Dict = None, call_budget: int = None, keep_results: bool = True):
+        self.backend = backend
+        self.max_per_target = max_per_target
+        self.total_budget = total_budget
+        self.profile = compile_profile(profile) if profile else None
+        self.call_budget = call_budget
+        self.keep_results = keep_results
+        self.results: List[Dict] = []
+        self.result_count = 0
+        self.stats = [{**target, "calls": 0, "results": 0, "relevant": 0} for target in targets]
+        self._seen_urls = set()
+        self._unstarted = list(range(len(self.stats)))
+        # index -> (yield of last page, next page number) for targets still worth paging
+        self._frontier: Dict[int, tuple] = {}
+
+    def _calls_left(self) -> float:
+        calls = sum(s["calls"] for s in self.stats)
+        return float("inf") if self.call_budget is None else self.call_budget - calls
+
+    def next_requests(self, limit: int = 1) -> List[tuple]:
+        """
+        Claim up to `limit` (index, page, site_query) requests: first pages
+        in target order, then the best-yielding frontier targets.
+        """
+        requests = []
+        while len(requests) < limit and self.result_count < self.total_budget and self._calls_left() > 0:
+            if self._unstarted:
+                index, page = self._unstarted.pop(0), 1
+            elif self._frontier:
+                index = max(self._frontier, key=lambda i: self._frontier[i][0])
+                page = self._frontier.pop(index)[1]
+            else:
+                break
+            target = self.stats[index]
+            target["calls"] += 1
+            # Planned targets quote only their phrase (the role); plain queries are quoted whole
+            phrase, terms = target.get("phrase") or target["query"], target.get("terms")
+            site_query = f'site:{target["site"]} "{phrase}"{" " + terms if terms else ""} jobs'
+            if target.get("location"):
+                site_query += f" {target['location']}"
+            requests.append((index, page, site_query))
+        return requests
+
+    def absorb(self, index: int, page: int, search_results) -> List[Dict]:
+        """Parse one page of results, deduplicate it and update the target's yield; returns the new jobs"""
+        target = self.stats[index]
+        site, query = target["site"], target["query"]
+        metrics.inc("search_pages_total", site=site)
+        
+        # Parse the search results
+        page_results = _parse_serper_results(search_results, site, query)
+        remaining = min(self.max_per_target - target["results"], self.total_budget - self.result_count)
+        
+        fresh = []
+        for job in page_results:
+            if job["url"] in self._seen_urls:
+                continue
+            self._seen_urls.add(job["url"])
+            fresh.append(job)
+        fresh = fresh[:max(0, remaining)]
+        relevant = sum(1 for job in fresh if _relevance(job, query, self.profile) >= RELEVANT_SCORE)
+        page_yield = relevant / SERPER_PAGE_SIZE
+        
+        self._collect(fresh)
+        target["results"] += len(fresh)
+        target["relevant"] += relevant
+        metrics.inc("search_results_total", len(fresh), site=site)
+        metrics.inc("search_duplicates_total", len(page_results) - len(fresh), site=site)
+        
+        exhausted = len(page_results) < SERPER_PAGE_SIZE
+        if not (exhausted or page_yield < MIN_PAGE_YIELD or target["results"] >= self.max_per_target):
+            self._frontier[index] = (page_yield, page + 1)
+        return fresh
+
+    def _collect(self, jobs: List[Dict]):
+        self.result_count += len(jobs)
+        if self.keep_results:
+            self.results.extend(jobs)
+
+    def fail(self, index: int, page: int, error: Exception) -> List[Dict]:
+        """Record a failed request; the target is not paged further. Returns any mock fallback jobs"""
+        target = self.stats[index]
+        site = target["site"]
+        print(f"Error searching {site} (page {page}): {error}")
+        metrics.inc("search_errors_total", site=site)
+        # Fallback to mock data if Serper fails; offline backends surface the error instead
+        if page == 1 and self.backend.allow_mock_fallback:
+            remaining = min(self.max_per_target - target["results"], self.total_budget - self.result_count)
+            mock = _search_site(target["query"], site, remaining)
+            self._collect(mock)
+            target["results"] += len(mock)
+            return mock
+        return []
+
+
+def _adaptive_search(backend, targets: List[Dict], max_per_target: int, total_budget: int,
+                     profile: Dict = None, call_budget: int = None):
+    """
+    Run an adaptive-depth search (see _AdaptiveSearch) one request at a time.
+
+    Returns the results and per-target stats ({calls, results, relevant}).
+    """
+    search = _AdaptiveSearch(backend, targets, max_per_target, total_budget, profile, call_budget)
+    while True:
+        requests = search.next_requests()
+        if not requests:
+            break
+        index, page, site_query = requests[0]
         try:
-            # Create site-specific search query
-            site_query = f'site:{site} "{query}" jobs'
-            
-            # Search using SerperDevTool
-            search_results = serper_tool.run(search_query=site_query)
-            
-            # Parse the search results
-            site_results = _parse_serper_results(search_results, site, query)
-            results.extend(site_results)
-            
-            # Rate limiting
-            time.sleep(1)
-            
+            # Search using the configured backend
+            with metrics.timer("search_request_seconds", site=search.stats[index]["site"]):
+                search_results = backend.search(site_query, num=SERPER_PAGE_SIZE, page=page)
+            search.absorb(index, page, search_results)
         except Exception as e:
-            print(f"Error searching {site}: {e}")
-            # Fallback to mock data if Serper fails
-            site_results = _search_site(query, site, max_results)
-            results.extend(site_results)
+            search.fail(index, page, e)
             continue
+        
+        # Rate limiting (offline backends need none)
+        if backend.rate_limit_seconds:
+            time.sleep(backend.rate_limit_seconds)
     
-    return json.dumps(results, indent=2)
+    return search.results[:total_budget], search.stats
 
 
-def _parse_serper_results(search_results: str, site: str, query: str) -> List[Dict]:
-    """Parse SerperDevTool search results into job format"""
+def _serper_sections(search_results) -> List[Dict]:
+    """Split a Serper response into title/link/snippet entries
+
+    Accepts the raw API JSON (a dict or JSON string with an "organic" list)
+    as well as the text format with "Title:/Link:/Snippet:" sections
+    separated by "---".
+    """
+    if isinstance(search_results, str) and search_results.lstrip().startswith("{"):
+        try:
+            search_results = json.loads(search_results)
+        except json.JSONDecodeError:
+            pass
+
+    if isinstance(search_results, dict):
+        return [
+            {
+                "title": (result.get("title") or "").strip(),
+                "link": (result.get("link") or "").strip(),
+                "snippet": (result.get("snippet") or "").strip(),
+            }
+            for result in search_results.get("organic", [])
+        ]
+
+    # Split by common separators to extract individual results
+    if "---" in search_results:
+        result_sections = search_results.split("---")
+    else:
+        result_sections = [search_results]
+
+    sections = []
+    for section in result_sections:
+        if not section.strip():
+            continue
+
+        # Extract title, link, and snippet from the section
+        title = ""
+        link = ""
+        snippet = ""
+        for line in section.strip().split('\n'):
+            line = line.strip()
+            if line.startswith("Title:"):
+                title = line.replace("Title:", "").strip()
+            elif line.startswith("Link:"):
+                link = line.replace("Link:", "").strip()
+            elif line.startswith("Snippet:"):
+                snippet = line.replace("Snippet:", "").strip()
+        sections.append({"title": title, "link": link, "snippet": snippet})
+    return sections
+
+
+@metrics.timed("parse_serper_seconds")
+def _parse_serper_results(search_results, site: str, query: str, limit: int = None) -> List[Dict]:
+    """Parse Serper search results (raw JSON or text) into job format"""
     try:
-        # SerperDevTool returns a string, we need to parse it
-        # The results are typically in a structured format
         jobs = []
         
-        # Split by common separators to extract individual results
-        if "---" in search_results:
-            result_sections = search_results.split("---")
-        else:
-            result_sections = [search_results]
-        
-        for i, section in enumerate(result_sections[:10]):  # Limit to 10 results per site
-            if not section.strip():
-                continue
-                
-            # Extract title, link, and snippet from the section
-            lines = section.strip().split('\n')
-            title = ""
-            link = ""
-            snippet = ""
-            
-            for line in lines:
-                line = line.strip()
-                if line.startswith("Title:"):
-                    title = line.replace("Title:", "").strip()
-                elif line.startswith("Link:"):
-                    link = line.replace("Link:", "").strip()
-                elif line.startswith("Snippet:"):
-                    snippet = line.replace("Snippet:", "").strip()
+        sections = _serper_sections(search_results)
+        for section in sections[:limit] if limit else sections:
+            title = section["title"]
+            link = section["link"]
+            snippet = section["snippet"]
             
             # Skip if we don't have essential information
             if not title or not link:
@@ -149,7 +381,7 @@ def _extract_location_from_snippet(snippet: str) -> str:
         if match:
             return match.group(1).strip()
     
-    return "Location not specified"
+    return UNKNOWN_LOCATION
 
 
 def _extract_date_from_snippet(snippet: str) -> str:
@@ -225,50 +457,126 @@ def _search_site(query: str, site: str, max_results: int) -> List[Dict]:
 
 
 @tool("job_evaluation_tool")
-def job_evaluation_tool(job_data: str, user_profile: str) -> str:
+@metrics.timed("tool_seconds", tool="job_evaluation_tool")
+def job_evaluation_tool(job_data: str, user_profile: str, top_k: int = EVALUATION_TOP_K) -> str:
     """
     Evaluate job opportunities against user profile
     
     Args:
         job_data: JSON string containing job information
         user_profile: JSON string containing user skills and experience
+        top_k: Only return the k highest-scoring jobs (default: 30; 0 returns all)
     """
     try:
         jobs = json.loads(job_data) if isinstance(job_data, str) else job_data
         profile = json.loads(user_profile) if isinstance(user_profile, str) else user_profile
         
-        evaluated_jobs = []
+        profile = compile_profile(profile)
+        
+        # Hard constraints from the profile drop jobs before any expensive work
+        constraints = profile.constraints
+        if constraints:
+            candidates = [job for job in jobs if _meets_constraints(job, constraints)]
+            metrics.inc("jobs_filtered_total", len(jobs) - len(candidates))
+            jobs = candidates
         
-        for job in jobs:
-            score = _calculate_match_score(job, profile)
-            job['match_score'] = score
-            job['evaluation_date'] = datetime.now().isoformat()
-            evaluated_jobs.append(job)
+        # Optional enrichment stage: score on full job pages instead of snippets
+        if _enrichment_enabled():
+            jobs = enrich_jobs(jobs)
         
-        # Sort by match score (highest first)
-        evaluated_jobs.sort(key=lambda x: x['match_score'], reverse=True)
+        metrics.inc("jobs_evaluated_total", len(jobs))
+        scored = _score_jobs(jobs, profile)
+        if top_k:
+            # Streaming top-k: a k-sized heap instead of sorting every job
+            evaluated_jobs = heapq.nlargest(top_k, scored, key=lambda x: x['match_score'])
+        else:
+            # Sort by match score (highest first)
+            evaluated_jobs = sorted(scored, key=lambda x: x['match_score'], reverse=True)
         
+        # Full page text is only for scoring: it stays in the job_pages cache
+        # (and reaches storage from there) instead of going back to the LLM
+        evaluated_jobs = [{k: v for k, v in job.items() if k != 'full_description'}
+                          for job in evaluated_jobs]
         return json.dumps(evaluated_jobs, indent=2)
         
     except Exception as e:
         return f"Error evaluating jobs: {e}"
 
 
-def _calculate_match_score(job: Dict, profile: Dict) -> float:
-    """Calculate match score between job and user profile"""
+def _enrichment_enabled() -> bool:
+    return os.environ.get("JOB_SEEKER_ENRICH", "").lower() in ("1", "true", "yes")
+
+
+def _score_jobs(jobs: List[Dict], profile):
+    """
+    Yield each job with match_score and evaluation_date set, lazily.
+
+    Adds the semantic component when JOB_SEEKER_EMBEDDINGS is enabled.
+    """
+    profile = compile_profile(profile)
+    semantic = semantic_scores(jobs, profile.source)
+    weight = semantic_weight()
+    evaluation_date = datetime.now().isoformat()
+    
+    for job in jobs:
+        score = _calculate_match_score(job, profile)
+        if semantic is not None:
+            similarity = semantic.get(job.get('url') or job_text(job), 0.0)
+            job['semantic_score'] = round(similarity, 1)
+            score = (1 - weight) * score + weight * similarity
+        job['match_score'] = score
+        job['evaluation_date'] = evaluation_date
+        yield job
+
+
+def _meets_constraints(job: Dict, constraints: Dict) -> bool:
+    """
+    Check a job against compiled hard constraints (CompiledProfile.constraints).
+
+    Missing job data never disqualifies: a job without a known location,
+    salary or job type passes those checks.
+    """
+    if 'locations' in constraints:
+        location = job.get('location') or ''
+        where = f"{location} {job.get('job_type', '')}".lower()
+        if location not in ('', UNKNOWN_LOCATION) and not any(loc in where for loc in constraints['locations']):
+            return False
+    if 'min_salary' in constraints:
+        # (0, 0) when no annual salary could be read (none stated, or only hourly/stray numbers)
+        _, salary_max = salary_bounds(job.get('salary_range'))
+        # The top of the range is what the job can pay at most
+        if salary_max and salary_max < constraints['min_salary']:
+            return False
+    if 'job_types' in constraints:
+        job_type = (job.get('job_type') or '').lower()
+        if job_type and job_type != 'n/a' and job_type not in constraints['job_types']:
+            return False
+    return True
+
+
+@metrics.timed("match_score_seconds")
+def _calculate_match_score(job: Dict, profile: CompiledProfile) -> float:
+    """
+    Calculate match score between job and user profile.
+
+    Takes a CompiledProfile: callers compile the profile once (compile_profile)
+    rather than paying for fingerprinting a dict on every job scored.
+    """
     score = 0.0
     max_score = 100.0
     
+    # Prefer the full page text from enrichment over the search snippet
+    description = job.get('full_description') or job.get('description', '')
+
     # Skills matching (40% of total score)
-    job_skills = _extract_skills(job.get('description', ''))
-    user_skills = profile.get('skills', [])
-    skill_matches = len(set(job_skills) & set(user_skills))
+    job_skills = _extract_skills(description)
+    skill_matches = sum(1 for skill in job_skills if skill in profile.skill_ids)
     skill_score = (skill_matches / max(len(job_skills), 1)) * 40
     score += skill_score
     
     # Experience level matching (25% of total score)
-    required_exp = _extract_experience_requirement(job.get('description', ''))
-    user_exp = profile.get('years_experience', 0)
+    required_exp = _extract_experience_requirement(description)
+    user_exp = profile.years_experience
     if required_exp <= user_exp:
         exp_score = 25
     else:
@@ -277,15 +585,14 @@ def _calculate_match_score(job: Dict, profile: Dict) -> float:
     
     # Location preference (15% of total score)
     job_location = job.get('location', '').lower()
-    preferred_locations = [loc.lower() for loc in profile.get('preferred_locations', [])]
-    if any(loc in job_location for loc in preferred_locations):
+    if any(loc in job_location for loc in profile.location_terms):
         score += 15
     elif 'remote' in job_location or 'anywhere' in job_location:
         score += 10
     
     # Salary expectations (10% of total score)
     job_salary = _extract_salary(job.get('salary_range', ''))
-    expected_salary = profile.get('expected_salary', 0)
+    expected_salary = profile.expected_salary
     if job_salary and expected_salary:
         if job_salary >= expected_salary:
             score += 10
@@ -293,8 +600,7 @@ def _calculate_match_score(job: Dict, profile: Dict) -> float:
             score += max(0, 10 - (expected_salary - job_salary) / expected_salary * 10)
     
     # Company size/type preference (10% of total score)
-    company_type = profile.get('preferred_company_type', '')
-    if company_type and company_type.lower() in job.get('company', '').lower():
+    if profile.company_type and profile.company_type in job.get('company', '').lower():
         score += 10
     
     return min(score, max_score)
@@ -353,6 +659,7 @@ def _extract_salary(salary_range: str) -> int:
 
 
 @tool("database_tool")
+@metrics.timed("tool_seconds", tool="database_tool")
 def database_tool(action: str, data: str = None) -> str:
     """
     Perform database operations
@@ -378,7 +685,7 @@ def database_tool(action: str, data: str = None) -> str:
 
 def _init_database():
     """Initialize the database with required tables"""
-    conn = sqlite3.connect("job_opportunities.db")
+    conn = connect()
     cursor = conn.cursor()
     
     cursor.execute('''
@@ -397,31 +704,83 @@ def _init_database():
             evaluation_date TEXT,
             applied BOOLEAN DEFAULT FALSE,
             application_date TEXT,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            full_description TEXT,
+            first_seen TEXT,
+            last_seen TEXT,
+            status TEXT DEFAULT 'active',
+            last_checked TEXT,
+            check_failures INTEGER DEFAULT 0
         )
     ''')
+    # Columns added after the first release
+    added = ensure_columns(conn, "job_opportunities", {
+        "full_description": "TEXT",
+        "first_seen": "TEXT",
+        "last_seen": "TEXT",
+        "status": "TEXT DEFAULT 'active'",
+        "last_checked": "TEXT",
+        "check_failures": "INTEGER DEFAULT 0",
+    })
+    if "first_seen" in added:
+        cursor.execute("UPDATE job_opportunities SET first_seen = created_at, last_seen = created_at")
+    cursor.execute(
+        "CREATE INDEX IF NOT EXISTS idx_job_opportunities_status_score ON job_opportunities (status, match_score)"
+    )
+    # Upserts fall back to cached page text for jobs stored without it
+    _init_pages_table(conn)
     
     conn.commit()
     conn.close()
 
 
+@metrics.timed("db_operation_seconds", operation="store")
 def _store_jobs(jobs_json: str) -> str:
     """Store job opportunities in the database"""
     _init_database()  # Ensure database exists
     
     jobs = json.loads(jobs_json) if isinstance(jobs_json, str) else jobs_json
     
-    conn = sqlite3.connect("job_opportunities.db")
-    cursor = conn.cursor()
+    conn = connect()
+    stored_count = _upsert_jobs(conn.cursor(), jobs, datetime.now().isoformat())
+    conn.commit()
+    conn.close()
     
+    return f"Stored {stored_count} job opportunities in database"
+
+
+def _upsert_jobs(cursor, jobs: List[Dict], seen_at: str) -> int:
+    """Insert or refresh jobs by url without committing; returns the number stored"""
     stored_count = 0
     for job in jobs:
         try:
+            # Upsert on url so re-found jobs keep their id, application status,
+            # first_seen and any enriched full description; jobs that arrive
+            # without one take it from the job_pages cache. Being found again
+            # also makes an expired posting active again
             cursor.execute('''
-                INSERT OR REPLACE INTO job_opportunities 
+                INSERT INTO job_opportunities 
                 (title, company, location, url, description, salary_range, 
-                 posted_date, site, job_type, match_score, evaluation_date)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                 posted_date, site, job_type, match_score, evaluation_date, full_description,
+                 first_seen, last_seen, status)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?,
+                        COALESCE(?, (SELECT full_description FROM job_pages WHERE url = ?)),
+                        ?, ?, 'active')
+                ON CONFLICT(url) DO UPDATE SET
+                    title = excluded.title,
+                    company = excluded.company,
+                    location = excluded.location,
+                    description = excluded.description,
+                    salary_range = excluded.salary_range,
+                    posted_date = excluded.posted_date,
+                    site = excluded.site,
+                    job_type = excluded.job_type,
+                    match_score = excluded.match_score,
+                    evaluation_date = excluded.evaluation_date,
+                    full_description = COALESCE(excluded.full_description, job_opportunities.full_description),
+                    last_seen = excluded.last_seen,
+                    status = 'active',
+                    check_failures = 0
             ''', (
                 job.get('title', ''),
                 job.get('company', ''),
@@ -433,33 +792,40 @@ def _store_jobs(jobs_json: str) -> str:
                 job.get('site', ''),
                 job.get('job_type', ''),
                 job.get('match_score', 0.0),
-                job.get('evaluation_date', '')
+                job.get('evaluation_date', ''),
+                job.get('full_description'),
+                job.get('url', ''),
+                seen_at,
+                seen_at
             ))
             stored_count += 1
         except sqlite3.IntegrityError:
             # Job already exists, skip
             continue
     
-    conn.commit()
-    conn.close()
-    
-    return f"Stored {stored_count} job opportunities in database"
+    return stored_count
 
 
+@metrics.timed("db_operation_seconds", operation="retrieve")
 def _retrieve_jobs(filters_json: str = None) -> str:
     """Retrieve job opportunities from the database"""
     _init_database()  # Ensure database exists
     
-    conn = sqlite3.connect("job_opportunities.db")
+    conn = connect()
     cursor = conn.cursor()
     
     query = "SELECT * FROM job_opportunities ORDER BY match_score DESC"
     params = []
+    conditions = []
+    filters = json.loads(filters_json) if filters_json else {}
     
-    if filters_json:
-        filters = json.loads(filters_json)
-        conditions = []
-        
+    # Expired postings are left out unless asked for ("status": "expired" or "all")
+    status = filters.get('status', 'active')
+    if status != 'all':
+        conditions.append("status = ?")
+        params.append(status)
+    
+    if filters:
         if 'min_score' in filters:
             conditions.append("match_score >= ?")
             params.append(filters['min_score'])
@@ -480,6 +846,7 @@ def _retrieve_jobs(filters_json: str = None) -> str:
     return json.dumps(jobs, indent=2)
 
 
+@metrics.timed("db_operation_seconds", operation="update")
 def _update_job(update_data: str) -> str:
     """Update a job record"""
     data = json.loads(update_data)
@@ -489,7 +856,7 @@ def _update_job(update_data: str) -> str:
     if not job_id:
         return "Job ID is required for updates"
     
-    conn = sqlite3.connect("job_opportunities.db")
+    conn = connect()
     cursor = conn.cursor()
     
     set_clauses = []
@@ -513,9 +880,10 @@ def _update_job(update_data: str) -> str:
     return f"Updated job {job_id} successfully"
 
 
+@metrics.timed("db_operation_seconds", operation="delete")
 def _delete_job(job_id: str) -> str:
     """Delete a job record"""
-    conn = sqlite3.connect("job_opportunities.db")
+    conn = connect()
     cursor = conn.cursor()
     
     cursor.execute("DELETE FROM job_opportunities WHERE id = ?", (job_id,))
@@ -527,6 +895,7 @@ def _delete_job(job_id: str) -> str:
 
 
 @tool("report_generation_tool")
+@metrics.timed("tool_seconds", tool="report_generation_tool")
 def report_generation_tool(jobs_data: str, user_profile: str) -> str:
     """
     Generate a comprehensive job search report
@@ -537,31 +906,39 @@ def report_generation_tool(jobs_data: str, user_profile: str) -> str:
     """
     try:
         jobs = json.loads(jobs_data) if isinstance(jobs_data, str) else jobs_data
-        profile = json.loads(user_profile) if isinstance(user_profile, str) else user_profile
+        profile = compile_profile(json.loads(user_profile) if isinstance(user_profile, str) else user_profile)
         
-        # Filter top opportunities (score >= 70)
-        top_jobs = [job for job in jobs if job.get('match_score', 0) >= 70]
+        # Top opportunities (score >= 70) that meet the profile's hard constraints
+        constraints = profile.constraints
+        qualifying = [
+            job for job in jobs
+            if job.get('match_score', 0) >= REPORT_MIN_SCORE and _meets_constraints(job, constraints)
+        ]
+        top_jobs = heapq.nlargest(REPORT_TOP_K, qualifying, key=lambda x: x.get('match_score', 0))
         
-        report = _generate_markdown_report(top_jobs, profile)
+        with metrics.timer("report_generation_seconds"):
+            report = _generate_markdown_report(top_jobs, profile, total=len(qualifying))
         return report
         
     except Exception as e:
         return f"Error generating report: {e}"
 
 
-def _generate_markdown_report(jobs: List[Dict], profile: Dict) -> str:
-    """Generate markdown report for top job opportunities"""
-    report = f"""# Job Search Report for {profile.get('name', 'Job Seeker')}
+def _generate_markdown_report(jobs: List[Dict], profile, total: int = None) -> str:
+    """Generate markdown report for top job opportunities (`total`: number found, default len(jobs))"""
+    compiled = compile_profile(profile)
+    profile = compiled.source
+    report = f"""# Job Search Report for {compiled.name}
 
 ## Executive Summary
-Found {len(jobs)} highly relevant job opportunities matching your profile.
+Found {len(jobs) if total is None else total} highly relevant job opportunities matching your profile.
 Generated on: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
 
 ## Your Profile Summary
 - **Name**: {profile.get('name', 'N/A')}
 - **Current Role**: {profile.get('current_role', 'N/A')}
 - **Experience**: {profile.get('years_experience', 'N/A')} years
-- **Key Skills**: {', '.join(profile.get('skills', [])[:10])}
+- **Key Skills**: {', '.join(compiled.skills[:10])}
 - **Preferred Locations**: {', '.join(profile.get('preferred_locations', []))}
 - **Expected Salary**: ${profile.get('expected_salary', 'N/A'):,}
 
@@ -569,7 +946,7 @@ Generated on: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
 
 """
     
-    for i, job in enumerate(jobs[:10], 1):  # Top 10 jobs
+    for i, job in enumerate(jobs[:REPORT_TOP_K], 1):  # Top 10 jobs
         report += f"""### {i}. {job.get('title', 'N/A')} at {job.get('company', 'N/A')}
 **Match Score**: {job.get('match_score', 0):.1f}/100
 
@@ -0,0 +1,224 @@
+"""
+Token, latency and cost accounting per task and per agent
+"""
+import json
+import os
+import time
+import uuid
+from datetime import datetime
+from typing import Dict, List
+
+from . import metrics
+from .db import connect
+
+# USD per 1M tokens as (prompt, completion). Override or extend with
+# JOB_SEEKER_LLM_PRICES='{"my-model": [1.0, 2.0]}'. Unknown models cost 0.
+DEFAULT_LLM_PRICES = {
+    "gpt-4o": (2.50, 10.00),
+    "gpt-4o-mini": (0.15, 0.60),
+    "gpt-4.1": (2.00, 8.00),
+    "gpt-4.1-mini": (0.40, 1.60),
+    "gpt-4.1-nano": (0.10, 0.40),
+    "gpt-4-turbo": (10.00, 30.00),
+    "gpt-4": (30.00, 60.00),
+    "gpt-3.5-turbo": (0.50, 1.50),
+    "claude-3-5-sonnet": (3.00, 15.00),
+    "claude-3-5-haiku": (0.80, 4.00),
+}
+
+_USAGE_FIELDS = ("prompt_tokens", "cached_prompt_tokens", "completion_tokens", "total_tokens", "successful_requests")
+
+
+def _llm_prices() -> Dict:
+    prices = dict(DEFAULT_LLM_PRICES)
+    override = os.environ.get("JOB_SEEKER_LLM_PRICES")
+    if override:
+        try:
+            prices.update({model: tuple(price) for model, price in json.loads(override).items()})
+        except (json.JSONDecodeError, TypeError, ValueError) as e:
+            print(f"Ignoring invalid JOB_SEEKER_LLM_PRICES: {e}")
+    return prices
+
+
+def estimate_cost(model: str, prompt_tokens: int, completion_tokens: int) -> float:
+    """Estimate the USD cost of a usage record, matching the longest known model prefix"""
+    if not model:
+        return 0.0
+    prices = _llm_prices()
+    name = model.split("/")[-1]
+    matches = [known for known in prices if name == known or name.startswith(known + "-")]
+    if not matches:
+        return 0.0
+    prompt_price, completion_price = prices[max(matches, key=len)]
+    return (prompt_tokens * prompt_price + completion_tokens * completion_price) / 1_000_000
+
+
+def _token_summary(agent) -> Dict:
+    """Read an agent's cumulative token counters"""
+    process = getattr(agent, "_token_process", None)
+    if process is None:
+        return {field: 0 for field in _USAGE_FIELDS}
+    summary = process.get_summary()
+    return {field: getattr(summary, field, 0) or 0 for field in _USAGE_FIELDS}
+
+
+def _init_run_metrics(conn):
+    """Initialize the run_metrics table"""
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS run_metrics (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            run_id TEXT NOT NULL,
+            run_started_at TEXT NOT NULL,
+            task_name TEXT,
+            agent TEXT,
+            model TEXT,
+            prompt_tokens INTEGER DEFAULT 0,
+            cached_prompt_tokens INTEGER DEFAULT 0,
+            completion_tokens INTEGER DEFAULT 0,
+            total_tokens INTEGER DEFAULT 0,
+            llm_requests INTEGER DEFAULT 0,
+            duration_seconds REAL,
+            cost_usd REAL,
+            status TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_run_metrics_run ON run_metrics (run_id)")
+
+
+class UsageTracker:
+    """
+    Attribute token usage and wall time to each task of one crew run.
+
+    crewai only keeps cumulative token counters per agent, so the tracker
+    snapshots them when the run starts and after every task, and records the
+    difference against the agent that executed the task.
+    """
+
+    def __init__(self, agents: List, run_id: str = None):
+        self.run_id = run_id or uuid.uuid4().hex[:12]
+        self.run_started_at = datetime.now().isoformat()
+        self.agents = {agent.role.strip(): agent for agent in agents}
+        self.records: List[Dict] = []
+        self._snapshots = {role: _token_summary(agent) for role, agent in self.agents.items()}
+        self._last_task_end = time.perf_counter()
+
+    def on_task_complete(self, output):
+        """Crew task_callback: record the usage of the task that just finished"""
+        now = time.perf_counter()
+        role = (output.agent or "").strip()
+        agent = self.agents.get(role)
+        current = _token_summary(agent) if agent else {field: 0 for field in _USAGE_FIELDS}
+        previous = self._snapshots.get(role, {field: 0 for field in _USAGE_FIELDS})
+        delta = {field: current[field] - previous[field] for field in _USAGE_FIELDS}
+        self._snapshots[role] = current
+
+        model = getattr(getattr(agent, "llm", None), "model", None) if agent else None
+        self.records.append({
+            "task_name": output.name,
+            "agent": role,
+            "model": model,
+            **delta,
+            "duration_seconds": now - self._last_task_end,
+            "cost_usd": estimate_cost(model, delta["prompt_tokens"], delta["completion_tokens"]),
+        })
+        self._last_task_end = now
+        metrics.inc("llm_tokens_total", delta["prompt_tokens"], agent=role, kind="prompt")
+        metrics.inc("llm_tokens_total", delta["completion_tokens"], agent=role, kind="completion")
+        metrics.observe("task_seconds", self.records[-1]["duration_seconds"], task=output.name or "")
+
+    def totals(self) -> Dict:
+        totals = {field: sum(record[field] for record in self.records) for field in _USAGE_FIELDS}
+        totals["cost_usd"] = sum(record["cost_usd"] for record in self.records)
+        totals["duration_seconds"] = sum(record["duration_seconds"] for record in self.records)
+        return totals
+
+    def save(self, status: str = "success") -> int:
+        """Write the collected records to run_metrics; returns the number of rows written"""
+        if not self.records:
+            return 0
+        conn = connect()
+        _init_run_metrics(conn)
+        conn.executemany('''
+            INSERT INTO run_metrics
+            (run_id, run_started_at, task_name, agent, model, prompt_tokens, cached_prompt_tokens,
+             completion_tokens, total_tokens, llm_requests, duration_seconds, cost_usd, status)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ''', [
+            (self.run_id, self.run_started_at, r["task_name"], r["agent"], r["model"],
+             r["prompt_tokens"], r["cached_prompt_tokens"], r["completion_tokens"], r["total_tokens"],
+             r["successful_requests"], r["duration_seconds"], r["cost_usd"], status)
+            for r in self.records
+        ])
+        conn.commit()
+        conn.close()
+        return len(self.records)
+
+
+def summarize_runs(last_runs: int = 10) -> Dict:
+    """
+    Summarize the most recent runs from run_metrics.
+
+    Returns per-run totals, per-agent averages, and per-agent prompt token
+    growth comparing the newer half of the window with the older half.
+    """
+    conn = connect()
+    _init_run_metrics(conn)
+    cursor = conn.cursor()
+
+    cursor.execute('''
+        SELECT run_id, MIN(run_started_at), SUM(prompt_tokens), SUM(completion_tokens),
+               SUM(total_tokens), SUM(llm_requests), SUM(duration_seconds), SUM(cost_usd),
+               COUNT(*), MAX(status)
+        FROM run_metrics
+        GROUP BY run_id
+        ORDER BY MIN(run_started_at) DESC
+        LIMIT ?
+    ''', (last_runs,))
+    runs = [
+        {
+            "run_id": row[0], "started_at": row[1], "prompt_tokens": row[2], "completion_tokens": row[3],
+            "total_tokens": row[4], "llm_requests": row[5], "duration_seconds": row[6],
+            "cost_usd": row[7], "tasks": row[8], "status": row[9],
+        }
+        for row in cursor.fetchall()
+    ]
+    run_ids = [run["run_id"] for run in runs]
+
+    agents = []
+    if run_ids:
+        placeholders = ", ".join("?" for _ in run_ids)
+        cursor.execute(f'''
+            SELECT agent, model, COUNT(DISTINCT run_id), AVG(prompt_tokens), AVG(completion_tokens),
+                   AVG(duration_seconds), SUM(cost_usd)
+            FROM run_metrics
+            WHERE run_id IN ({placeholders})
+            GROUP BY agent, model
+            ORDER BY SUM(cost_usd) DESC, AVG(prompt_tokens) DESC
+        ''', run_ids)
+        agents = [
+            {
+                "agent": row[0], "model": row[1], "runs": row[2], "avg_prompt_tokens": row[3],
+                "avg_completion_tokens": row[4], "avg_duration_seconds": row[5], "total_cost_usd": row[6],
+            }
+            for row in cursor.fetchall()
+        ]
+
+        # Prompt growth: newer half of the window vs older half
+        half = len(run_ids) // 2
+        if half:
+            newer, older = run_ids[:half], run_ids[half:]
+            for agent in agents:
+                averages = []
+                for ids in (newer, older):
+                    marks = ", ".join("?" for _ in ids)
+                    cursor.execute(
+                        f"SELECT AVG(prompt_tokens) FROM run_metrics WHERE agent = ? AND run_id IN ({marks})",
+                        [agent["agent"], *ids]
+                    )
+                    averages.append(cursor.fetchone()[0])
+                if averages[0] is not None and averages[1]:
+                    agent["prompt_growth"] = (averages[0] - averages[1]) / averages[1]
+
+    conn.close()
+    return {"runs": runs, "agents": agents}